@@ -0,0 +1,88 @@
+"""Latency percentiles for GET /questions under many concurrent clients.
+
+Compares the native async storage layer against the previous behaviour, where
+async handlers called the synchronous pymongo client and blocked the event loop.
+Requires a local mongod (``docker-compose up -d mongodb``).
+
+    uv run python benchmarks/api_concurrency.py --clients 200 --requests-per-client 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from common import percentile, seed_questions
+from quizling.api.app import app
+from quizling.api.router import get_db
+from quizling.storage.db import MongoDBClient
+
+
+class BlockingDB:
+    """Expose the sync client through awaitables that block the loop while running."""
+
+    def __init__(self, db: MongoDBClient):
+        self._db = db
+
+    def __getattr__(self, name: str):
+        method = getattr(self._db, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+async def drive(clients: int, requests_per_client: int) -> list[float]:
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async def client_loop(client: httpx.AsyncClient, offset: int) -> None:
+        for i in range(requests_per_client):
+            start = time.perf_counter()
+            response = await client.get(f"/questions?limit=20&cursor={offset + i}")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        await asyncio.gather(*(client_loop(client, n) for n in range(clients)))
+
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    p50 = percentile(latencies, 50) * 1000
+    p99 = percentile(latencies, 99) * 1000
+    print(f"{label:<10} p50={p50:8.1f}ms  p99={p99:8.1f}ms  n={len(latencies)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests-per-client", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=10_000)
+    parser.add_argument("--database", type=str, default="quizling_bench")
+    args = parser.parse_args()
+
+    os.environ["MONGO_DATABASE"] = args.database
+    with MongoDBClient(database_name=args.database) as sync_client:
+        seed_questions(sync_client, args.questions)
+
+        app.dependency_overrides[get_db] = lambda: BlockingDB(sync_client)
+        blocking = asyncio.run(drive(args.clients, args.requests_per_client))
+        app.dependency_overrides.clear()
+
+    native = asyncio.run(drive(args.clients, args.requests_per_client))
+
+    print(f"{args.clients} concurrent clients")
+    report("blocking", blocking)
+    report("async", native)
+
+
+if __name__ == "__main__":
+    main()
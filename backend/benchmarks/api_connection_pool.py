@@ -0,0 +1,78 @@
+"""Requests/sec for GET /questions with a per-request vs. app-wide MongoDB client.
+
+Requires a local mongod (``docker-compose up -d mongodb``). Seeds a throwaway
+database, then drives the ASGI app in-process with concurrent httpx clients.
+
+    uv run python benchmarks/api_connection_pool.py --requests 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from common import seed_questions
+from quizling.api.app import app
+from quizling.api.router import get_db
+from quizling.storage.async_db import AsyncMongoDBClient
+from quizling.storage.db import MongoDBClient
+
+
+async def per_request_db():
+    """The pre-pooling dependency: a fresh client (and handshake) per request."""
+    db = AsyncMongoDBClient()
+    await db.connect()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def drive(total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            response = await client.get("/questions?limit=20")
+            response.raise_for_status()
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+
+    return total / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--database", type=str, default="quizling_bench")
+    args = parser.parse_args()
+
+    os.environ["MONGO_DATABASE"] = args.database
+    with MongoDBClient(database_name=args.database) as db_client:
+        seed_questions(db_client, args.questions)
+
+    app.dependency_overrides[get_db] = per_request_db
+    before = asyncio.run(drive(args.requests, args.concurrency))
+    app.dependency_overrides.clear()
+    after = asyncio.run(drive(args.requests, args.concurrency))
+
+    print(f"per-request client: {before:8.1f} req/s")
+    print(f"pooled client:      {after:8.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
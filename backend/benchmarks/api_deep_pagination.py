@@ -0,0 +1,66 @@
+"""Page latency at increasing depth: skip/limit offsets vs. keyset on ``_id``.
+
+Seeds ``page_size * max_page`` questions into a local mongod, then times fetching
+single pages at depths 1, 10, 100, 1,000 and 10,000 through both strategies.
+
+    uv run python benchmarks/api_deep_pagination.py --max-page 10000
+"""
+
+import argparse
+import statistics
+import time
+
+from common import seed_questions
+from quizling.storage.db import MongoDBClient
+
+
+def time_page(fetch, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fetch()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--max-page", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--database", type=str, default="quizling_bench")
+    parser.add_argument(
+        "--skip-seed", action="store_true", help="Reuse the existing collection"
+    )
+    args = parser.parse_args()
+
+    pages = [p for p in (1, 10, 100, 1_000, 10_000) if p <= args.max_page]
+
+    with MongoDBClient(database_name=args.database) as db:
+        if not args.skip_seed:
+            seed_questions(db, args.page_size * (args.max_page + 1))
+
+        print(f"{'page':>8} {'offset ms':>12} {'keyset ms':>12}")
+        for page in pages:
+            skip = (page - 1) * args.page_size
+
+            # Resolve the keyset position once, untimed, as a client holding
+            # the previous page's cursor would already have it.
+            boundary = (
+                db.find_questions(skip=skip - 1, limit=1, sort="id") if skip else []
+            )
+            after = (None, boundary[0].id) if boundary else None
+
+            offset_ms = time_page(
+                lambda: db.find_questions(skip=skip, limit=args.page_size, sort="id"),
+                args.repeats,
+            )
+            keyset_ms = time_page(
+                lambda: db.find_questions(limit=args.page_size, sort="id", after=after),
+                args.repeats,
+            )
+            print(f"{page:>8} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
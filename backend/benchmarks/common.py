@@ -0,0 +1,51 @@
+"""Shared helpers for the benchmark scripts."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from quizling.base.models import AnswerOption, DifficultyLevel, MultipleChoiceQuestion
+from quizling.storage.db import MongoDBClient
+
+DIFFICULTIES = [DifficultyLevel.EASY, DifficultyLevel.MEDIUM, DifficultyLevel.HARD]
+
+
+def make_question(index: int) -> MultipleChoiceQuestion:
+    return MultipleChoiceQuestion(
+        question=f"Benchmark question {index}: what is {index} + 1?",
+        options=[
+            AnswerOption(label="A", text=str(index)),
+            AnswerOption(label="B", text=str(index + 1)),
+            AnswerOption(label="C", text=str(index + 2)),
+            AnswerOption(label="D", text=str(index + 3)),
+        ],
+        correct_answer="B",
+        explanation=f"{index} + 1 = {index + 1}",
+        difficulty=DIFFICULTIES[index % len(DIFFICULTIES)],
+    )
+
+
+def seed_questions(
+    db_client: MongoDBClient, count: int, batch_size: int = 10_000
+) -> None:
+    """Replace the benchmark collection with ``count`` generated questions."""
+    db_client.delete_all_questions()
+    for start in range(0, count, batch_size):
+        stop = min(start + batch_size, count)
+        db_client.insert_questions([make_question(i) for i in range(start, stop)])
+    db_client.create_indexes()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+@contextmanager
+def timed(label: str) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    print(f"{label}: {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,172 @@
+"""End-to-end generation throughput at increasing document concurrency.
+
+Runs read -> chunk -> generate -> validate -> write over a set of generated
+documents, with the offline model standing in for Azure so that scheduler and
+pipeline changes can be measured without network access or quota. Model
+latency, jitter, throttling and error rates are configurable.
+
+    uv run python benchmarks/generation_throughput.py --documents 64 --concurrency 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import offline_env  # noqa: F401  (placeholder Azure settings; import first)
+from common import percentile
+from quizling.base.generator import QuizGenerator
+from quizling.base.models import (
+    AzureDeployment,
+    GenerationMetrics,
+    QuizConfig,
+    QuizResult,
+)
+from quizling.base.offline import OfflineBackend
+from quizling.base.quiz_writer import QuizWriter
+
+PARAGRAPH = (
+    "Section {section} of document {document} describes how the water cycle "
+    "moves water between the oceans, the atmosphere and the land. Evaporation "
+    "lifts water vapour from warm surfaces, condensation forms clouds as the "
+    "air cools, and precipitation returns the water as rain or snow. "
+)
+
+
+def write_documents(directory: Path, count: int, words: int) -> list[Path]:
+    paths = []
+    for document in range(count):
+        paragraphs = []
+        while sum(len(p.split()) for p in paragraphs) < words:
+            paragraphs.append(
+                PARAGRAPH.format(section=len(paragraphs) + 1, document=document)
+            )
+        path = directory / f"document-{document:04d}.txt"
+        path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+async def run_level(
+    generator: QuizGenerator, documents: list[Path], output: Path, concurrency: int
+) -> None:
+    config = generator.config.model_copy(
+        update={"output_directory": str(output / f"concurrency-{concurrency}")}
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    first_question: list[float] = []
+    runs: list[GenerationMetrics] = []
+
+    async def process(path: Path) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            writer = QuizWriter(
+                QuizResult(questions=[], source_file=str(path), config=config)
+            )
+            metrics = writer.quiz_result.metrics
+
+            async def questions():
+                async for question in generator.stream_from_file(
+                    path, config=config, metrics=metrics
+                ):
+                    if not writer.quiz_result.questions:
+                        first_question.append(time.perf_counter() - start)
+                    yield question
+
+            await writer.write_stream(questions())
+            latencies.append(time.perf_counter() - start)
+            runs.append(metrics)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(process(path) for path in documents))
+    elapsed = time.perf_counter() - start
+
+    totals = GenerationMetrics.combine(runs)
+    print(
+        f"{concurrency:>11}  {len(documents) / elapsed:8.2f}  "
+        f"{totals.questions / elapsed:8.1f}  "
+        f"{percentile(first_question, 50):7.2f}s  "
+        f"{percentile(latencies, 50):7.2f}s  {percentile(latencies, 95):7.2f}s  "
+        f"{totals.requests:>8}  {totals.retries:>7}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=32)
+    parser.add_argument("--words", type=int, default=4000, help="words per document")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--chunk-tokens", type=int, default=6000)
+    parser.add_argument(
+        "--chunk-concurrency",
+        type=int,
+        default=4,
+        help="generation calls in flight per document",
+    )
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--deployments", type=int, default=1)
+    parser.add_argument("--rpm", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--seconds-per-question", type=float, default=0.05)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = QuizConfig(
+        num_questions=args.questions,
+        chunk_token_budget=args.chunk_tokens,
+        max_concurrency=args.chunk_concurrency,
+        requests_per_minute=args.rpm,
+        output_format=args.format,
+        cache_directory=None,
+    )
+    backend = OfflineBackend(
+        latency=args.latency,
+        jitter=args.jitter,
+        seconds_per_question=args.seconds_per_question,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="quizling-bench-") as tmp:
+        root = Path(tmp)
+        (root / "documents").mkdir()
+        documents = write_documents(root / "documents", args.documents, args.words)
+
+        print(
+            f"{args.documents} documents of ~{args.words} words, "
+            f"model latency {args.latency}s ± {args.jitter}s"
+        )
+        print(
+            "concurrency    docs/s   qs/s    first q   doc p50   doc p95  "
+            "requests  retries"
+        )
+        for concurrency in args.concurrency:
+            # Rate limiters are shared process-wide per endpoint and deployment,
+            # so each level gets endpoints of its own and starts with full
+            # token buckets rather than those the previous level drained.
+            level_config = config.model_copy(
+                update={
+                    "deployments": [
+                        AzureDeployment(
+                            endpoint=f"offline-{concurrency}",
+                            deployment_name=f"offline-{n}",
+                        )
+                        for n in range(args.deployments)
+                    ]
+                }
+            )
+            generator = QuizGenerator(level_config, model_factory=backend)
+            asyncio.run(run_level(generator, documents, root / "output", concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""Placeholder Azure settings for benchmarks that run against the offline model.
+
+The configuration module reads these at import time, so import this module
+before anything from quizling. Values already set in the environment win.
+"""
+
+import os
+
+for name, value in {
+    "AZURE_OPENAI_ENDPOINT": "https://offline.invalid",
+    "AZURE_OPENAI_KEY": "offline",
+    "AZURE_OPENAI_VERSION": "2024-12-01-preview",
+    "AZURE_OPENAI_DEPLOYMENT": "offline",
+}.items():
+    os.environ.setdefault(name, value)
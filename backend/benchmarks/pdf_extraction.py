@@ -0,0 +1,78 @@
+"""PDF text extraction throughput at different worker process counts.
+
+Builds a text-heavy PDF and extracts it with PDFFileReader, serially and split
+into page ranges across worker processes, reporting pages per second. Worker
+processes are started by the first read and reused by later ones, so both are
+reported.
+
+    uv run python benchmarks/pdf_extraction.py --pages 1000 --workers 1 2 4 8
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from quizling.base.file_reader import PDFFileReader
+
+LINE = "Line {line} of page {page}: the quick brown fox jumps over the lazy dog."
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int) -> None:
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for page_number in range(pages):
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        lines = " ".join(
+            f"({LINE.format(line=line, page=page_number)}) Tj T*"
+            for line in range(lines_per_page)
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 10 Tf 12 TL 36 756 Td {lines} ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    writer.write(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--lines-per-page", type=int, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="quizling-bench-") as tmp:
+        path = Path(tmp) / "document.pdf"
+        write_pdf(path, args.pages, args.lines_per_page)
+        print(f"{args.pages} pages, {path.stat().st_size / 1e6:.1f} MB")
+
+        print("workers  first read pages/s   warm pages/s")
+        expected = None
+        for workers in args.workers:
+            reader = PDFFileReader(max_workers=workers)
+            rates = []
+            for _ in range(2):
+                start = time.perf_counter()
+                text = reader.read(path)
+                rates.append(args.pages / (time.perf_counter() - start))
+
+                expected = expected or text
+                assert text == expected, "extracted text differs between runs"
+            print(f"{workers:>7}  {rates[0]:18.1f}  {rates[1]:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Files/sec for loading a directory of question files into MongoDB.
+
+Compares the old load-everything-then-insert path with the streaming loader.
+Requires a local mongod (``docker-compose up -d mongodb``); the question files
+are generated into a temporary directory.
+
+    uv run python benchmarks/storage_bulk_load.py --files 100000 --workers 8
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import make_question
+from quizling.storage.db import MongoDBClient
+from quizling.storage.loader import (
+    load_questions_from_directory,
+    stream_questions_to_db,
+)
+
+
+def write_files(directory: Path, count: int) -> None:
+    for i in range(count):
+        (directory / f"{i:08d}.json").write_text(
+            json.dumps(make_question(i).model_dump())
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--database", type=str, default="quizling_bench")
+    args = parser.parse_args()
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        MongoDBClient(database_name=args.database) as db_client,
+    ):
+        directory = Path(tmp)
+        write_files(directory, args.files)
+
+        db_client.delete_all_questions()
+        tracemalloc.start()
+        start = time.perf_counter()
+        db_client.insert_questions(load_questions_from_directory(directory))
+        before = args.files / (time.perf_counter() - start)
+        _, before_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        db_client.delete_all_questions()
+        tracemalloc.start()
+        stats = stream_questions_to_db(
+            db_client,
+            directory,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            progress=False,
+        )
+        _, after_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"list + insert_many : {before:>9,.0f} files/s  peak {before_peak / 2**20:.1f} MiB"
+    )
+    print(
+        f"streaming          : {stats.files_per_second:>9,.0f} files/s  "
+        f"peak {after_peak / 2**20:.1f} MiB"
+    )
+    for line in stats.summary_lines():
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
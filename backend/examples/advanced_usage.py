@@ -57,21 +57,24 @@ async def generate_multiple_difficulty_levels() -> None:
     these gases, intensifying the greenhouse effect and causing global warming.
     """
 
+    config = QuizConfig(
+        api_version="2024-12-01-preview",
+        num_questions=2,
+        include_explanations=False,
+    )
+    # One generator serves every variation; only the per-run config changes,
+    # so the HTTP connection is reused.
+    generator = QuizGenerator(config)
+
     for difficulty in [
         DifficultyLevel.EASY,
         DifficultyLevel.MEDIUM,
         DifficultyLevel.HARD,
     ]:
-        config = QuizConfig(
-            api_version="2024-12-01-preview",
-            num_questions=2,
-            difficulty=difficulty,
-            include_explanations=False,
+        result = await generator.generate_from_text(
+            content, config.model_copy(update={"difficulty": difficulty})
         )
 
-        generator = QuizGenerator(config)
-        result = await generator.generate_from_text(content)
-
         print(f"\n{difficulty.value.upper()} DIFFICULTY QUESTIONS:")
         print("=" * 60)
         for question in result.questions:
@@ -94,24 +97,61 @@ async def batch_process_files() -> None:
     )
 
     generator = QuizGenerator(config)
+    semaphore = asyncio.Semaphore(2)
 
-    results = []
+    async def process(file_path: str):
+        async with semaphore:
+            print(f"Processing {file_path}...")
+            result = await generator.generate_from_file(file_path)
+            print(f"  Generated {result.num_questions} questions from {file_path}")
+            return result
+
+    existing = []
     for file_path in files_to_process:
         if not Path(file_path).exists():
             print(f"Skipping {file_path} (file not found)")
-            continue
+        else:
+            existing.append(file_path)
 
-        print(f"Processing {file_path}...")
-        try:
-            result = await generator.generate_from_file(file_path)
-            results.append(result)
-            print(f"  Generated {result.num_questions} questions")
-        except Exception as e:
-            print(f"  Error: {e}")
+    # One shared generator, up to two documents in flight at a time
+    outcomes = await asyncio.gather(
+        *(process(file_path) for file_path in existing), return_exceptions=True
+    )
+
+    results = []
+    for file_path, outcome in zip(existing, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"  Error processing {file_path}: {outcome}")
+        else:
+            results.append(outcome)
 
     print(f"\nSuccessfully processed {len(results)} files")
 
 
+async def stream_quiz() -> None:
+    config = QuizConfig(
+        api_version="2024-12-01-preview",
+        num_questions=5,
+        difficulty=DifficultyLevel.EASY,
+    )
+
+    generator = QuizGenerator(config)
+
+    content = """
+    The water cycle describes how water moves between the oceans, the
+    atmosphere and the land. Heat from the sun evaporates surface water, which
+    condenses into clouds as it rises and cools. Precipitation returns the
+    water to the surface, where it collects in rivers, lakes and groundwater
+    before eventually flowing back to the sea.
+    """
+
+    # Each question is printed as soon as the model has finished writing it.
+    count = 0
+    async for question in generator.stream_from_text(content):
+        count += 1
+        print(f"Question {count}: {question.question}")
+
+
 async def main() -> None:
     """Run all advanced examples."""
     print("EXAMPLE 1: Focused Quiz Generation")
@@ -126,6 +166,10 @@ async def main() -> None:
     print("=" * 80)
     print("(Skipping batch processing - add your own files to test)")
 
+    print("\n\nEXAMPLE 4: Streaming Questions")
+    print("=" * 80)
+    await stream_quiz()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -2,19 +2,55 @@
 
 import argparse
 import asyncio
+import glob
 import sys
+import time
 from pathlib import Path
 
-from quizling.base import DifficultyLevel, QuizConfig, QuizGenerator
+from pydantic import TypeAdapter
+
+from quizling.base import DifficultyLevel, QuizConfig, QuizGenerator, QuizResult
+from quizling.base import clients
+from quizling.base.file_reader import FileReaderFactory
+from quizling.base.models import AzureDeployment, GenerationMetrics
+from quizling.base.offline import OfflineBackend
 from quizling.base.quiz_writer import QuizWriter
 
+DEFAULT_JOBS = 4
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Generate multiple choice questions from documents using Azure OpenAI"
     )
 
-    parser.add_argument("file", type=str, help="Path to the document file to process")
+    parser.add_argument(
+        "files",
+        type=str,
+        nargs="+",
+        help="Document files, directories or glob patterns to process",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Documents to process concurrently (default: {DEFAULT_JOBS})",
+    )
+
+    parser.add_argument(
+        "--extraction-workers",
+        type=int,
+        help="Processes used to extract text from large PDFs (default: one per CPU)",
+    )
+
+    parser.add_argument(
+        "--docx-streaming",
+        action="store_true",
+        help="Parse DOCX files a paragraph at a time in constant memory, "
+        "including table cells and text boxes",
+    )
 
     parser.add_argument(
         "-n",
@@ -54,6 +90,84 @@ def parse_args() -> argparse.Namespace:
         help="Directory to output questions (default: out)",
     )
 
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["json", "jsonl"],
+        default="json",
+        help="Write one JSON file per question, or append to rotating "
+        "JSON Lines files (default: json)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        type=str,
+        choices=["none", "gzip", "zstd"],
+        default="none",
+        help="Compression for --format jsonl (default: none)",
+    )
+
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        help="Requests per minute allowed for the deployment (default: unlimited)",
+    )
+
+    parser.add_argument(
+        "--tpm",
+        type=int,
+        help="Tokens per minute allowed for the deployment (default: unlimited)",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print timings, token usage and retries per document and for the batch",
+    )
+
+    parser.add_argument(
+        "--prompt-layout",
+        type=str,
+        choices=["inline", "cacheable"],
+        default="inline",
+        help="'cacheable' puts the document before the per-run options so "
+        "repeated runs over it hit the provider's prompt cache (default: inline)",
+    )
+
+    parser.add_argument(
+        "--deployments",
+        type=str,
+        help="JSON file listing deployments to balance across, each with "
+        "endpoint, deployment_name and optional weight, api_key, "
+        "requests_per_minute and tokens_per_minute",
+    )
+
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Answer with a local stand-in model instead of Azure OpenAI, "
+        "e.g. to try out the pipeline without network access",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Cache model responses and extracted document text in this "
+        "directory (default: QUIZLING_CACHE_DIR, or no cache)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the response or extraction caches",
+    )
+
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate instead of reading cached responses, and update the cache",
+    )
+
     parser.add_argument(
         "-a",
         "--api-version",
@@ -65,12 +179,63 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def print_batch_metrics(runs: list[GenerationMetrics], elapsed: float) -> None:
+    """Summarise a batch for capacity planning: totals and sustained rates."""
+    total = GenerationMetrics.combine(runs)
+    # Documents overlap, so the batch took its wall-clock time, not the sum.
+    total.total_seconds = elapsed
+    minutes = elapsed / 60 if elapsed else float("inf")
+
+    print("\nBatch metrics:")
+    for line in total.summary_lines():
+        print(f"  {line}")
+    print(
+        f"  Throughput: {total.questions / minutes:,.1f} questions/min, "
+        f"{total.requests / minutes:,.1f} requests/min, "
+        f"{(total.input_tokens + total.output_tokens) / minutes:,.0f} tokens/min"
+    )
+
+
+def resolve_input_files(inputs: list[str]) -> list[Path]:
+    """Expand directories and glob patterns into supported document files.
+
+    Directories are searched recursively. Explicitly named files are kept even
+    if missing so the caller can report them; duplicates are dropped.
+
+    Raises:
+        FileNotFoundError: If an explicitly named file or directory does not exist
+    """
+    files: dict[Path, None] = {}
+
+    for item in inputs:
+        if glob.has_magic(item):
+            candidates = [Path(p) for p in sorted(glob.glob(item, recursive=True))]
+        elif Path(item).is_dir():
+            candidates = sorted(p for p in Path(item).rglob("*"))
+        elif Path(item).exists():
+            files[Path(item)] = None
+            continue
+        else:
+            raise FileNotFoundError(f"File not found: {item}")
+
+        for path in candidates:
+            if path.is_file() and path.suffix.lower() in FileReaderFactory.READERS:
+                files[path] = None
+
+    return list(files)
+
+
 async def main() -> None:
     args = parse_args()
 
-    file_path = Path(args.file)
-    if not file_path.exists():
-        print(f"Error: File not found: {file_path}", file=sys.stderr)
+    try:
+        files = resolve_input_files(args.files)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not files:
+        print("Error: No supported documents found", file=sys.stderr)
         sys.exit(1)
 
     difficulty_map = {
@@ -86,25 +251,120 @@ async def main() -> None:
         include_explanations=not args.no_explanations,
         topic_focus=args.topic,
         output_directory=args.output,
+        output_format=args.format,
+        output_compression=args.compress,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        cache_refresh=args.refresh,
+        prompt_layout=args.prompt_layout,
+        extraction_workers=args.extraction_workers,
+        docx_streaming=args.docx_streaming,
     )
+    if args.no_cache:
+        config.cache_directory = None
+    elif args.cache_dir:
+        config.cache_directory = args.cache_dir
+
+    if args.deployments:
+        try:
+            config.deployments = TypeAdapter(list[AzureDeployment]).validate_json(
+                Path(args.deployments).read_bytes()
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error: Invalid deployments file: {e}", file=sys.stderr)
+            sys.exit(1)
 
-    print(f"Processing: {file_path}")
     print(f"Generating {args.num_questions} {args.difficulty} questions...")
+    print(f"Writing questions to: {config.output_directory}")
 
     try:
-        generator = QuizGenerator(config)
-        quiz_result = await generator.generate_from_file(file_path)
+        # One generator (and so one HTTP client) is shared by every document.
+        if args.offline:
+            generator = QuizGenerator(config, model_factory=OfflineBackend())
+        else:
+            generator = QuizGenerator(config)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-        print(f"Writing questions to: {config.output_directory}")
-        writer = QuizWriter(quiz_result)
-        written_files = writer.write()
+    semaphore = asyncio.Semaphore(max(1, args.jobs))
 
-        print(f"Successfully wrote {len(written_files)} questions")
+    async def generate(file_path: Path) -> tuple[QuizResult, list[Path]]:
+        async with semaphore:
+            print(f"Processing: {file_path}")
+            # Questions are written as the model produces them, so a long
+            # document's first questions land on disk well before its last.
+            writer = QuizWriter(
+                QuizResult(
+                    questions=[],
+                    source_file=str(file_path.absolute()),
+                    config=config,
+                )
+            )
+            try:
+                written_files = await writer.write_stream(
+                    generator.stream_from_file(
+                        file_path, metrics=writer.quiz_result.metrics
+                    )
+                )
+            except Exception as e:
+                raise Exception(f"{file_path}: {e}") from e
+            return writer.quiz_result, written_files
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(generate(file_path)) for file_path in files]
+    failed = 0
+    total_questions = 0
+    run_metrics: list[GenerationMetrics] = []
+
+    # Results are reported as each document finishes, not in input order.
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            quiz_result, written_files = await next_done
+        except Exception as e:
+            failed += 1
+            print(f"Error: {e}", file=sys.stderr)
+            continue
+
+        total_questions += quiz_result.num_questions
+        print(
+            f"Successfully wrote {quiz_result.num_questions} questions "
+            f"from {Path(quiz_result.source_file).name}"
+        )
         for file_path in written_files:
             print(f"  - {file_path}")
+        if args.metrics:
+            for line in quiz_result.metrics.summary_lines():
+                print(f"  {line}")
+        run_metrics.append(quiz_result.metrics)
 
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
+    await clients.aclose()
+
+    if len(files) > 1:
+        print(
+            f"\nProcessed {len(files) - failed}/{len(files)} documents, "
+            f"{total_questions} questions"
+        )
+
+    if generator.cache is not None:
+        print(f"Cache: {generator.cache.hits} hits, {generator.cache.misses} misses")
+
+    if (extraction_cache := generator.extraction_cache) is not None:
+        print(
+            f"Extraction cache: {extraction_cache.hit_rate:.0%} hit rate, "
+            f"{extraction_cache.seconds_saved:.1f}s of parsing saved"
+        )
+
+    if generator.usage.input_tokens:
+        print(
+            f"Prompt cache: {generator.usage.cache_read_tokens} of "
+            f"{generator.usage.input_tokens} input tokens cached"
+        )
+
+    if args.metrics and len(run_metrics) > 1:
+        print_batch_metrics(run_metrics, time.perf_counter() - started)
+
+    if failed:
         sys.exit(1)
 
 
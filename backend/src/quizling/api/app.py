@@ -1,7 +1,32 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from quizling.api.error_handlers import register_error_handlers
-from quizling.api.router import router
+from quizling.api.router import open_database, router
+from quizling.storage.db import MongoDBConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Own a single pooled MongoDB client for the lifetime of the app."""
+    app.state.db = None
+    try:
+        app.state.db = await open_database()
+    except MongoDBConnectionError as e:
+        # Requests retry the connection lazily and surface a 503 until it succeeds
+        logger.warning(f"MongoDB unavailable at startup: {e}")
+
+    yield
+
+    if app.state.db is not None:
+        await app.state.db.close()
+        app.state.db = None
+
 
 app = FastAPI(
     title="Quizling API",
@@ -9,6 +34,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 register_error_handlers(app)
@@ -56,3 +56,12 @@ class ValidationError(QuizlingAPIException):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             details={"field": field} if field else {},
         )
+
+
+class InvalidCursorError(QuizlingAPIException):
+    def __init__(self, reason: str):
+        super().__init__(
+            message="Invalid pagination cursor",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            details={"reason": reason},
+        )
@@ -14,6 +14,14 @@ class PaginatedResponse(BaseModel):
     total: int | None = Field(default=None, description="Total number of questions")
 
 
+class FacetsResponse(BaseModel):
+    field: str = Field(description="The field the questions were grouped by")
+    counts: dict[str, int] = Field(
+        description="Number of matching questions for each value of the field"
+    )
+    total: int = Field(description="Total number of matching questions")
+
+
 class QuestionResponse(BaseModel):
     data: MultipleChoiceQuestion = Field(description="The question")
 
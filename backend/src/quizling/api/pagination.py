@@ -0,0 +1,76 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+from functools import lru_cache
+from typing import Any
+
+from quizling.api.exceptions import InvalidCursorError
+
+logger = logging.getLogger(__name__)
+
+CURSOR_VERSION = 1
+SIGNATURE_BYTES = 16
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class CursorCodec:
+    """Encodes pagination state into opaque, HMAC-signed cursor tokens.
+
+    Tokens are ``<base64url JSON payload>.<base64url signature>``. The payload is
+    readable by anyone but cannot be altered without invalidating the signature.
+    """
+
+    def __init__(self, secret: bytes):
+        self._secret = secret
+
+    def _sign(self, body: str) -> str:
+        digest = hmac.new(self._secret, body.encode("ascii"), hashlib.sha256).digest()
+        return _b64encode(digest[:SIGNATURE_BYTES])
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        data = json.dumps({"v": CURSOR_VERSION, **payload}, separators=(",", ":"))
+        body = _b64encode(data.encode("utf-8"))
+        return f"{body}.{self._sign(body)}"
+
+    def decode(self, token: str) -> dict[str, Any]:
+        body, _, signature = token.partition(".")
+        if not body or not signature:
+            raise InvalidCursorError("malformed cursor")
+
+        if not hmac.compare_digest(signature, self._sign(body)):
+            raise InvalidCursorError("cursor signature mismatch")
+
+        try:
+            payload = json.loads(_b64decode(body))
+        except (binascii.Error, ValueError) as e:
+            raise InvalidCursorError("malformed cursor") from e
+
+        if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION:
+            raise InvalidCursorError("unsupported cursor version")
+
+        return payload
+
+
+@lru_cache(maxsize=1)
+def default_cursor_codec() -> CursorCodec:
+    """Codec keyed by QUIZLING_CURSOR_SECRET, or a per-process random secret."""
+    secret = os.environ.get("QUIZLING_CURSOR_SECRET")
+    if not secret:
+        logger.warning(
+            "QUIZLING_CURSOR_SECRET is not set; pagination cursors will not "
+            "survive a restart or work across multiple workers"
+        )
+        return CursorCodec(secrets.token_bytes(32))
+    return CursorCodec(secret.encode("utf-8"))
@@ -1,24 +1,59 @@
-from typing import Annotated
+import asyncio
+import logging
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from pymongo.errors import PyMongoError
 
-from quizling.api.models import ErrorResponse, PaginatedResponse, QuestionResponse
+from quizling.api.models import (
+    ErrorResponse,
+    FacetsResponse,
+    PaginatedResponse,
+    QuestionResponse,
+)
 from quizling.api.services import QuestionQueryParams, QuestionService
-from quizling.storage.db import MongoDBClient
+from quizling.storage.async_db import AsyncMongoDBClient
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
 
-def get_db() -> MongoDBClient:
-    db = MongoDBClient()
+logger = logging.getLogger(__name__)
+
+_db_lock = asyncio.Lock()
+
+
+async def open_database() -> AsyncMongoDBClient:
+    """Connect the shared client and make sure the indexes queries rely on exist."""
+    db = AsyncMongoDBClient()
     try:
-        yield db
-    finally:
-        db.close()
+        await db.connect()
+    except Exception:
+        await db.close()
+        raise
+
+    try:
+        # Text search depends on the question text index
+        await db.create_indexes()
+    except PyMongoError as e:
+        logger.warning(f"Could not create MongoDB indexes: {e}")
+
+    return db
+
+
+async def get_db(request: Request) -> AsyncMongoDBClient:
+    """Hand out the app-wide pooled client, connecting lazily if startup could not."""
+    db = getattr(request.app.state, "db", None)
+    if db is None:
+        async with _db_lock:
+            db = getattr(request.app.state, "db", None)
+            if db is None:
+                db = await open_database()
+                request.app.state.db = db
+    return db
 
 
 def get_question_service(
-    db: Annotated[MongoDBClient, Depends(get_db)],
+    db: Annotated[AsyncMongoDBClient, Depends(get_db)],
 ) -> QuestionService:
     return QuestionService(db)
 
@@ -31,33 +66,60 @@ def get_question_service(
     description="Retrieve questions with optional filtering by difficulty or search text. Supports cursor-based pagination.",
 )
 async def get_questions(
+    response: Response,
     service: Annotated[QuestionService, Depends(get_question_service)],
     difficulty: Annotated[
         str | None, Query(description="Filter by difficulty level (easy, medium, hard)")
     ] = None,
     search: Annotated[str | None, Query(description="Search in question text")] = None,
+    search_mode: Annotated[
+        Literal["text", "substring"],
+        Query(
+            description=(
+                "text: indexed word search ranked by relevance; "
+                "substring: literal case-insensitive match (slow, unindexed)"
+            )
+        ),
+    ] = "text",
     cursor: Annotated[
-        int | None, Query(description="Pagination cursor (skip offset)", ge=0)
+        str | None,
+        Query(
+            description=(
+                "Opaque next_cursor token from a previous page. Plain skip "
+                "offsets are still accepted but deprecated."
+            )
+        ),
     ] = None,
     limit: Annotated[
         int, Query(description="Number of results per page", ge=1, le=100)
     ] = 20,
+    sort: Annotated[
+        Literal["id", "question", "difficulty"],
+        Query(description="Sort key (ties are broken by id)"),
+    ] = "id",
 ) -> PaginatedResponse:
     """
     Get all questions with optional filtering and pagination.
 
     - **difficulty**: Filter by difficulty level
     - **search**: Search for text in questions
-    - **cursor**: Pagination cursor (number of items to skip)
+    - **search_mode**: text (default, indexed, by relevance) or substring
+    - **cursor**: Opaque pagination token (deprecated: number of items to skip)
     - **limit**: Maximum number of results (1-100, default 20)
+    - **sort**: Sort key: id, question or difficulty (default id)
     """
     params = QuestionQueryParams(
         difficulty=difficulty,
         search=search,
-        cursor=cursor or 0,
+        cursor=cursor,
         limit=limit,
+        sort=sort,
+        search_mode=search_mode,
     )
-    result = service.get_questions(params)
+    result = await service.get_questions(params)
+
+    if result.deprecated_cursor:
+        response.headers["Deprecation"] = "true"
 
     return PaginatedResponse(
         data=result.questions,
@@ -67,6 +129,41 @@ async def get_questions(
     )
 
 
+@router.get(
+    "/facets",
+    response_model=FacetsResponse,
+    responses={500: {"model": ErrorResponse}},
+    summary="Count questions per field value",
+    description="Count matching questions grouped by a field in a single aggregation.",
+)
+async def get_question_facets(
+    service: Annotated[QuestionService, Depends(get_question_service)],
+    field: Annotated[
+        Literal["difficulty", "correct_answer"],
+        Query(description="Field to group the counts by"),
+    ] = "difficulty",
+    difficulty: Annotated[
+        str | None, Query(description="Filter by difficulty level (easy, medium, hard)")
+    ] = None,
+    search: Annotated[str | None, Query(description="Search in question text")] = None,
+    search_mode: Annotated[
+        Literal["text", "substring"], Query(description="Search mode")
+    ] = "text",
+) -> FacetsResponse:
+    """
+    Get question counts grouped by a field, e.g. to label filter options.
+
+    - **field**: difficulty (default) or correct_answer
+    - **difficulty**, **search**, **search_mode**: Same filters as GET /questions
+    """
+    params = QuestionQueryParams(
+        difficulty=difficulty, search=search, search_mode=search_mode
+    )
+    counts = await service.get_facets(field, params)
+
+    return FacetsResponse(field=field, counts=counts, total=sum(counts.values()))
+
+
 @router.get(
     "/{question_id}",
     response_model=QuestionResponse,
@@ -83,5 +180,5 @@ async def get_question(
 
     - **question_id**: MongoDB ObjectId of the question
     """
-    question = service.get_question_by_id(question_id)
+    question = await service.get_question_by_id(question_id)
     return QuestionResponse(data=question)
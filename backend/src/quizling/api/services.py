@@ -1,12 +1,23 @@
+import asyncio
+import re
+from typing import Any
+
 from bson.errors import InvalidId
 
 from quizling.api.exceptions import (
     DatabaseError,
+    InvalidCursorError,
     InvalidObjectIdError,
     ResourceNotFoundError,
+    ValidationError,
 )
+from quizling.api.pagination import CursorCodec, default_cursor_codec
 from quizling.base.models import MultipleChoiceQuestion
-from quizling.storage.db import MongoDBClient
+from quizling.storage.async_db import AsyncMongoDBClient
+from quizling.storage.db import SearchMode, difficulty_counts
+
+
+LEGACY_OFFSET_CURSOR = re.compile(r"-?\d+")
 
 
 class QuestionQueryParams:
@@ -16,18 +27,42 @@ class QuestionQueryParams:
         self,
         difficulty: str | None = None,
         search: str | None = None,
-        cursor: int = 0,
+        cursor: str | None = None,
         limit: int = 20,
+        sort: str = "id",
+        search_mode: SearchMode = "text",
     ):
         self.difficulty = difficulty
         self.search = search
         self.cursor = cursor
         self.limit = limit
+        self.sort = sort
+        self.search_mode = search_mode
 
     @property
     def has_filters(self) -> bool:
         return self.difficulty is not None or self.search is not None
 
+    @property
+    def filters(self) -> dict[str, str | None]:
+        return {
+            "difficulty": self.difficulty,
+            "search": self.search,
+            "search_mode": self.search_mode,
+        }
+
+    @property
+    def ranks_by_relevance(self) -> bool:
+        """Text searches are ordered by score, which cannot be used as a seek key."""
+        return bool(self.search) and self.search_mode == "text"
+
+    @property
+    def uses_offset_cursor(self) -> bool:
+        """Whether the cursor is a deprecated plain skip offset."""
+        return self.cursor is not None and bool(
+            LEGACY_OFFSET_CURSOR.fullmatch(self.cursor)
+        )
+
 
 class PaginationResult:
     """Value object for pagination results."""
@@ -35,33 +70,44 @@ class PaginationResult:
     def __init__(
         self,
         questions: list[MultipleChoiceQuestion],
-        cursor: int,
-        limit: int,
+        has_more: bool,
+        next_cursor: str | None,
         total_results: int,
+        deprecated_cursor: bool = False,
     ):
-        self.has_more = len(questions) > limit
-        self.questions = questions[:limit] if self.has_more else questions
-        self.next_cursor = str(cursor + limit) if self.has_more else None
+        self.questions = questions
+        self.has_more = has_more
+        self.next_cursor = next_cursor
         self.total = total_results
+        self.deprecated_cursor = deprecated_cursor
 
 
 class QuestionService:
     """Service for handling question operations."""
 
-    def __init__(self, db: MongoDBClient):
+    def __init__(self, db: AsyncMongoDBClient, cursor_codec: CursorCodec | None = None):
         self._db = db
+        self._cursor_codec = cursor_codec or default_cursor_codec()
+
+    async def get_questions(self, params: QuestionQueryParams) -> PaginationResult:
+        skip, after = self._resolve_cursor(params)
 
-    def get_questions(self, params: QuestionQueryParams) -> PaginationResult:
         try:
-            fetch_limit = params.limit + 1
-            questions = self._fetch_filtered_questions(params, fetch_limit)
-            total_results = self._calculate_total(params, questions)
-
-            return PaginationResult(
-                questions=questions,
-                cursor=params.cursor,
-                limit=params.limit,
-                total_results=total_results,
+            questions, total_results = await asyncio.gather(
+                self._db.find_questions(
+                    difficulty=params.difficulty,
+                    search=params.search,
+                    skip=skip,
+                    limit=params.limit + 1,
+                    sort=params.sort,
+                    after=after,
+                    search_mode=params.search_mode,
+                ),
+                self._db.count_questions(
+                    difficulty=params.difficulty,
+                    search=params.search,
+                    search_mode=params.search_mode,
+                ),
             )
         except (DatabaseError, ResourceNotFoundError, InvalidObjectIdError):
             raise  # re-raises with our custom exceptions
@@ -70,51 +116,95 @@ class QuestionService:
                 f"Failed to retrieve questions: {str(e)}", operation="get_questions"
             )
 
-    def _fetch_filtered_questions(
-        self, params: QuestionQueryParams, fetch_limit: int
-    ) -> list[MultipleChoiceQuestion]:
-        if params.difficulty and params.search:
-            return self._search_with_difficulty(params, fetch_limit)
-        elif params.difficulty:
-            return self._paginate_filtered_results(
-                self._db.get_questions_by_difficulty(params.difficulty),
-                params.cursor,
-                fetch_limit,
-            )
-        elif params.search:
-            return self._paginate_filtered_results(
-                self._db.search_questions(params.search),
-                params.cursor,
-                fetch_limit,
+        has_more = len(questions) > params.limit
+        page = questions[: params.limit]
+
+        return PaginationResult(
+            questions=page,
+            has_more=has_more,
+            next_cursor=self._next_cursor(params, skip, page) if has_more else None,
+            total_results=total_results,
+            deprecated_cursor=params.uses_offset_cursor,
+        )
+
+    def _resolve_cursor(
+        self, params: QuestionQueryParams
+    ) -> tuple[int, tuple[Any, str] | None]:
+        """Translate the request cursor into a (skip, keyset position) pair."""
+        if params.cursor is None:
+            return 0, None
+
+        if params.uses_offset_cursor:
+            offset = int(params.cursor)
+            if offset < 0:
+                raise ValidationError(
+                    "Cursor must be a next_cursor token or a non-negative offset",
+                    field="cursor",
+                )
+            return offset, None
+
+        payload = self._cursor_codec.decode(params.cursor)
+        if payload.get("f") != params.filters or payload.get("s") != params.sort:
+            raise InvalidCursorError("cursor does not match the current query")
+
+        if "o" in payload:
+            return int(payload["o"]), None
+        return 0, (payload["k"], payload["id"])
+
+    def _next_cursor(
+        self,
+        params: QuestionQueryParams,
+        skip: int,
+        page: list[MultipleChoiceQuestion],
+    ) -> str:
+        if params.uses_offset_cursor:
+            return str(skip + params.limit)
+
+        if params.ranks_by_relevance:
+            return self._cursor_codec.encode(
+                {"s": params.sort, "f": params.filters, "o": skip + params.limit}
             )
-        else:
-            return self._db.get_all_questions(limit=fetch_limit, skip=params.cursor)
-
-    def _search_with_difficulty(
-        self, params: QuestionQueryParams, fetch_limit: int
-    ) -> list[MultipleChoiceQuestion]:
-        questions = self._db.search_questions(params.search)
-        filtered = [q for q in questions if q.difficulty.value == params.difficulty]
 
-        return self._paginate_filtered_results(filtered, params.cursor, fetch_limit)
+        last = page[-1]
+        return self._cursor_codec.encode(
+            {
+                "s": params.sort,
+                "f": params.filters,
+                "k": self._sort_value(last, params.sort),
+                "id": last.id,
+            }
+        )
 
     @staticmethod
-    def _paginate_filtered_results(
-        questions: list[MultipleChoiceQuestion], cursor: int, limit: int
-    ) -> list[MultipleChoiceQuestion]:
-        return questions[cursor : cursor + limit]
-
-    def _calculate_total(
-        self, params: QuestionQueryParams, questions: list[MultipleChoiceQuestion]
-    ) -> int:
-        if params.has_filters:
-            return len(questions)
-        else:
-            return self._db.count_questions()
-
-    def get_question_by_id(self, question_id: str) -> MultipleChoiceQuestion:
+    def _sort_value(question: MultipleChoiceQuestion, sort: str) -> Any:
+        if sort == "question":
+            return question.question
+        if sort == "difficulty":
+            return question.difficulty.value
+        return None
+
+    async def get_facets(
+        self, field: str, params: QuestionQueryParams
+    ) -> dict[str, int]:
+        try:
+            counts = await self._db.facet_counts(
+                field,
+                difficulty=params.difficulty,
+                search=params.search,
+                search_mode=params.search_mode,
+            )
+        except Exception as e:
+            raise DatabaseError(
+                f"Failed to count questions: {str(e)}", operation="get_facets"
+            )
+
+        if field == "difficulty":
+            return difficulty_counts(counts)
+        return counts
+
+    async def get_question_by_id(self, question_id: str) -> MultipleChoiceQuestion:
         try:
-            question = self._db.get_question(question_id)
+            question = await self._db.get_question(question_id)
             if question is None:
                 raise ResourceNotFoundError("Question", question_id)
             return question
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from quizling.base.models import MultipleChoiceQuestion
+
+CACHE_FILENAME = "responses.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+# Evict down to this fraction of max_bytes so eviction does not run on every put.
+EVICTION_TARGET = 0.9
+
+_questions = TypeAdapter(list[MultipleChoiceQuestion])
+
+
+def cache_key(
+    content: str, system_prompt: str, deployment: str, parameters: dict[str, Any]
+) -> str:
+    """Hash everything that determines a generation's output."""
+    digest = hashlib.sha256()
+    for part in (
+        content,
+        system_prompt,
+        deployment,
+        json.dumps(parameters, sort_keys=True, default=str),
+    ):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so different splits cannot collide.
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class LRUStore:
+    """SQLite table of byte values, evicted least recently used first.
+
+    Entries older than ``max_age_seconds`` are ignored and purged on open.
+    Once the stored size passes ``max_bytes`` the least recently used entries
+    are evicted down to ``EVICTION_TARGET`` of it. The size is kept as a
+    running total, summed again only when another connection has written to
+    the file since.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        table: str,
+        max_bytes: int,
+        max_age_seconds: float | None = None,
+    ):
+        self.table = table
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        # Lookups run in worker threads; the connection is shared between them.
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)"
+        )
+        with self._db:
+            self._db.execute(
+                f"DELETE FROM {table} WHERE created < ?", (self._expiry(),)
+            )
+        self.size = self._stored_size()
+        self._version = self._data_version()
+
+    def _expiry(self) -> float:
+        if self.max_age_seconds is None:
+            return float("-inf")
+        return time.time() - self.max_age_seconds
+
+    def _data_version(self) -> int:
+        # Changes whenever another connection commits to the database.
+        return self._db.execute("PRAGMA data_version").fetchone()[0]
+
+    def _stored_size(self) -> int:
+        return self._db.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()[0]
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """The store's connection, for tables of its own kept alongside."""
+        with self._lock:
+            yield self._db
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT value FROM {self.table} WHERE key = ? AND created >= ?",
+                (key, self._expiry()),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            with self._db:
+                self._db.execute(
+                    f"UPDATE {self.table} SET accessed = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            if (version := self._data_version()) != self._version:
+                self.size = self._stored_size()
+                self._version = version
+            with self._db:
+                replaced = self._db.execute(
+                    f"SELECT size FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now),
+                )
+            self.size += len(value) - (replaced[0] if replaced else 0)
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        excess = self.size - int(self.max_bytes * EVICTION_TARGET)
+        with self._db:
+            for key, size in self._db.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY accessed"
+            ).fetchall():
+                if excess <= 0:
+                    break
+                self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                excess -= size
+                self.size -= size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    """Cache of generated questions, stored zlib-compressed in an ``LRUStore``.
+
+    Entries older than ``max_age_seconds`` are ignored and purged; when the
+    stored size passes ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float | None = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.directory = Path(directory)
+        self.store = LRUStore(
+            self.directory / CACHE_FILENAME, "responses", max_bytes, max_age_seconds
+        )
+
+    @property
+    def hits(self) -> int:
+        return self.store.hits
+
+    @property
+    def misses(self) -> int:
+        return self.store.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.store.hit_rate
+
+    def get(self, key: str) -> list[MultipleChoiceQuestion] | None:
+        value = self.store.get(key)
+        if value is None:
+            return None
+        return _questions.validate_json(zlib.decompress(value))
+
+    def put(self, key: str, questions: list[MultipleChoiceQuestion]) -> None:
+        self.store.put(key, zlib.compress(_questions.dump_json(questions)))
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def close(self) -> None:
+        self.store.close()
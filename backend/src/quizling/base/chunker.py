@@ -0,0 +1,265 @@
+import heapq
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import groupby
+
+# Rough average for English prose with OpenAI tokenizers; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+HEADING = re.compile(r"#{1,6}\s|\f")
+# Chunks' worth of text iter_chunks holds, at most, when it has nowhere to cut
+# the text that chunking could restart from unchanged.
+MAX_BUFFERED_CHUNKS = 16
+
+
+@dataclass(frozen=True)
+class Chunk:
+    text: str
+    start: int
+    end: int
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _paragraph_spans(text: str) -> list[tuple[int, int]]:
+    spans = []
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        if text[start : match.start()].strip():
+            spans.append((start, match.start()))
+        start = match.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+
+def _sentence_pieces(
+    text: str, start: int, end: int, max_chars: int
+) -> list[tuple[int, int]]:
+    """Break a paragraph on sentence ends into pieces of at most ``max_chars``
+    where its sentences allow."""
+    pieces = []
+    piece_start = start
+    cut = start
+    for match in SENTENCE_END.finditer(text, start, end):
+        if match.start() - piece_start > max_chars and cut > piece_start:
+            pieces.append((piece_start, cut))
+            piece_start = cut
+        cut = match.end()
+    if end - piece_start > max_chars and cut > piece_start:
+        pieces.append((piece_start, cut))
+        piece_start = cut
+    pieces.append((piece_start, end))
+    return pieces
+
+
+def _split_span(
+    text: str, start: int, end: int, max_chars: int, starts: set[int] | None = None
+) -> list[tuple[int, int]]:
+    """Break an oversized paragraph on sentence ends, then hard-wrap what remains."""
+    spans = []
+    for piece_start, piece_end in _sentence_pieces(text, start, end, max_chars):
+        if starts is not None:
+            starts.add(piece_start)
+        for offset in range(piece_start, piece_end, max_chars):
+            spans.append((offset, min(offset + max_chars, piece_end)))
+    return spans
+
+
+def split_into_chunks(
+    text: str, token_budget: int, overlap_tokens: int = 0
+) -> list[Chunk]:
+    """Split ``text`` into chunks of at most ``token_budget`` estimated tokens.
+
+    Chunks are built from whole paragraphs where possible and prefer to start at
+    a heading once they are half full. Consecutive chunks share up to
+    ``overlap_tokens`` worth of trailing paragraphs so that context spanning a
+    boundary is not lost.
+    """
+    max_chars = token_budget * CHARS_PER_TOKEN
+
+    if len(text) <= max_chars:
+        return [Chunk(text, 0, len(text))] if text.strip() else []
+
+    return _chunk_paragraphs(text, max_chars, overlap_tokens * CHARS_PER_TOKEN)
+
+
+def _chunk_paragraphs(
+    text: str, max_chars: int, overlap_chars: int, starts: set[int] | None = None
+) -> list[Chunk]:
+    """Chunk ``text``; ``starts`` collects the offsets of paragraphs and of the
+    sentence pieces of long paragraphs, where chunking can restart unchanged."""
+    spans = []
+    for start, end in _paragraph_spans(text):
+        if end - start > max_chars:
+            spans.extend(_split_span(text, start, end, max_chars, starts))
+        else:
+            spans.append((start, end))
+            if starts is not None:
+                starts.add(start)
+
+    chunks = []
+    first = 0
+    while first < len(spans):
+        start = spans[first][0]
+        last = first + 1
+        while last < len(spans) and spans[last][1] - start <= max_chars:
+            at_heading = HEADING.match(text, spans[last][0])
+            if at_heading and spans[last - 1][1] - start >= max_chars // 2:
+                break
+            last += 1
+
+        end = spans[last - 1][1]
+        chunks.append(Chunk(text[start:end], start, end))
+        if last == len(spans):
+            break
+
+        # Step back over trailing paragraphs that fit in the overlap, as long as
+        # the next chunk still has room for the first paragraph it has not seen.
+        next_first = last
+        while next_first - 1 > first:
+            overlap_start = spans[next_first - 1][0]
+            if end - overlap_start > overlap_chars:
+                break
+            if spans[last][1] - overlap_start > max_chars:
+                break
+            next_first -= 1
+        first = next_first
+
+    return chunks
+
+
+def iter_chunks(
+    pieces: Iterable[str], token_budget: int, overlap_tokens: int = 0
+) -> Iterator[Chunk]:
+    """Chunk text that arrives in pieces, as ``split_into_chunks`` would chunk
+    the pieces joined together.
+
+    Chunks are yielded as soon as the text after them has been seen, and text
+    is dropped once it is chunked, up to a paragraph or sentence start where
+    chunking can resume unchanged. A long stretch with neither, such as
+    unpunctuated lines with no blank line between them, is dropped anyway once
+    ``MAX_BUFFERED_CHUNKS`` chunks of it are held, so memory stays bounded;
+    chunks after such a stretch may then differ from ``split_into_chunks``.
+    """
+    max_chars = token_budget * CHARS_PER_TOKEN
+    overlap_chars = overlap_tokens * CHARS_PER_TOKEN
+    buffer = ""
+    # Position of the buffer in the joined text, and how many of the buffer's
+    # chunks have been yielded.
+    offset = 0
+    emitted = 0
+    # Paragraph breaks before scan_from have been found; the last found spans
+    # last_break. Buffer length when it was last chunked.
+    scan_from = 0
+    last_break: tuple[int, int] | None = None
+    chunked_at = 0
+
+    for piece in pieces:
+        buffer += piece
+        # Chunking the buffer costs its length, so wait until a few more
+        # chunks are ready, and until there is more text than last time.
+        if len(buffer) < max((emitted + 4) * max_chars, chunked_at + max_chars):
+            continue
+        chunked_at = len(buffer)
+
+        for match in PARAGRAPH_BREAK.finditer(buffer, scan_from):
+            last_break = match.span()
+        # A break can only continue into the next piece through the trailing
+        # whitespace, so that is where the next scan starts.
+        scan_from = len(buffer)
+        while scan_from > 0 and buffer[scan_from - 1].isspace():
+            scan_from -= 1
+
+        # Paragraphs that start before the last break are complete. So are the
+        # sentence pieces of the paragraph after it, bar the last two, which
+        # further sentences may still change. A chunk is complete once the
+        # chunk after it ends there.
+        starts: set[int] = set()
+        chunks = _chunk_paragraphs(buffer, max_chars, overlap_chars, starts)
+        settled, paragraph = last_break or (0, 0)
+        if len(buffer) - paragraph > max_chars:
+            # The paragraph was split, so the starts from it are its pieces'.
+            pieces_started = heapq.nlargest(2, (s for s in starts if s >= paragraph))
+            if len(pieces_started) > 1:
+                settled = pieces_started[1]
+        while emitted + 1 < len(chunks) and chunks[emitted + 1].end <= settled:
+            chunk = chunks[emitted]
+            yield Chunk(chunk.text, offset + chunk.start, offset + chunk.end)
+            emitted += 1
+
+        # Drop the text before the last chunk still to be yielded that starts
+        # where chunking can restart: chunking from there is chunking from the
+        # start of the text.
+        for keep in range(emitted, 0, -1):
+            if chunks[keep].start in starts:
+                break
+        else:
+            if len(buffer) <= MAX_BUFFERED_CHUNKS * max_chars or len(chunks) < 2:
+                continue
+            # Nowhere to restart exactly; settle all but the last chunk.
+            while emitted + 1 < len(chunks):
+                chunk = chunks[emitted]
+                yield Chunk(chunk.text, offset + chunk.start, offset + chunk.end)
+                emitted += 1
+            keep = emitted
+
+        cut = chunks[keep].start
+        buffer = buffer[cut:]
+        offset += cut
+        emitted -= keep
+        scan_from = max(0, scan_from - cut)
+        chunked_at -= cut
+        if last_break is not None and last_break[0] >= cut:
+            last_break = (last_break[0] - cut, last_break[1] - cut)
+        else:
+            last_break = None
+
+    if offset == 0:
+        chunks = split_into_chunks(buffer, token_budget, overlap_tokens)
+    elif buffer.strip():
+        chunks = _chunk_paragraphs(buffer, max_chars, overlap_chars)
+    else:
+        chunks = []
+    for chunk in chunks[emitted:]:
+        yield Chunk(chunk.text, offset + chunk.start, offset + chunk.end)
+
+
+def allocate_questions(weights: list[int], total: int) -> list[int]:
+    """Split ``total`` questions across chunks in proportion to ``weights``.
+
+    Uses the largest-remainder method, so the result always sums to ``total``
+    and no chunk is more than one question away from its exact share. When
+    more chunks tie on their remainder than there are questions left, the
+    questions are spread evenly across the tied chunks rather than given to
+    the first of them, so a long document is covered end to end.
+    """
+    weight_sum = sum(weights)
+    if not weight_sum:
+        return [0] * len(weights)
+
+    shares = [total * weight / weight_sum for weight in weights]
+    counts = [int(share) for share in shares]
+    left = total - sum(counts)
+    by_remainder = sorted(
+        range(len(weights)), key=lambda i: shares[i] - counts[i], reverse=True
+    )
+    for _, group in groupby(by_remainder, key=lambda i: shares[i] - counts[i]):
+        if left <= 0:
+            break
+        tied = sorted(group)
+        picks = min(left, len(tied))
+        # The middle of each of ``picks`` equal stretches of the tied chunks.
+        for j in range(picks):
+            counts[tied[(2 * j + 1) * len(tied) // (2 * picks)]] += 1
+        left -= picks
+    return counts
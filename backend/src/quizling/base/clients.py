@@ -0,0 +1,60 @@
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+from pydantic_ai.models.openai import OpenAIChatModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from quizling.base.models import AzureDeployment
+
+ClientKey = tuple[str, str | None, str | None]
+
+_clients: dict[ClientKey, AsyncAzureOpenAI] = {}
+_models: dict[tuple[ClientKey, str], OpenAIChatModel] = {}
+
+
+def shared_client(
+    endpoint: str, api_key: str | None, api_version: str | None
+) -> AsyncAzureOpenAI:
+    """Process-wide client for an endpoint and credentials.
+
+    Every generator using the same endpoint shares its connection pool, so
+    keep-alive connections (and TLS sessions) outlive any one configuration.
+    """
+    key = (endpoint, api_key, api_version)
+    if (client := _clients.get(key)) is None:
+        # Retries are handled by the deployment pool so that throttling backs
+        # off every caller, or moves them to another deployment.
+        client = AsyncAzureOpenAI(
+            api_key=api_key,
+            api_version=api_version,
+            azure_endpoint=endpoint,
+            max_retries=0,
+            # HTTP/2 multiplexes concurrent calls over one connection per
+            # endpoint (needs httpx[http2], a declared dependency).
+            http_client=DefaultAsyncHttpxClient(http2=True),
+        )
+        _clients[key] = client
+    return client
+
+
+def shared_model(deployment: AzureDeployment) -> OpenAIChatModel:
+    client_key = (deployment.endpoint, deployment.api_key, deployment.api_version)
+    key = (client_key, deployment.deployment_name)
+    if (model := _models.get(key)) is None:
+        model = OpenAIChatModel(
+            deployment.deployment_name,
+            provider=OpenAIProvider(openai_client=shared_client(*client_key)),
+        )
+        _models[key] = model
+    return model
+
+
+async def aclose() -> None:
+    """Close every shared client; later calls open new ones.
+
+    Connections belong to the event loop they were opened on, so call this
+    before that loop ends.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    _models.clear()
+    for client in clients:
+        await client.close()
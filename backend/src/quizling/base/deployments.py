@@ -0,0 +1,189 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Literal
+
+from pydantic_ai.exceptions import ModelHTTPError
+
+from quizling.base.rate_limiter import RateLimiter, is_retryable, retry_after
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+# Consecutive failures before a deployment is taken out of rotation.
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30.0
+MAX_RESET_TIMEOUT = 300.0
+
+
+class CircuitBreaker:
+    """Tracks the health of one deployment.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and the
+    deployment receives no traffic. Once the timeout has passed a single probe
+    request is let through: success closes the breaker, failure reopens it with
+    a doubled timeout, up to ``max_reset_timeout``. A throttled deployment is
+    opened straight away for as long as the server asked us to wait.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        max_reset_timeout: float = MAX_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self.state: BreakerState = "closed"
+        self.failures = 0
+        self.opened_until = 0.0
+        self._timeout = reset_timeout
+        self._probing = False
+
+    def available(self) -> bool:
+        if self.state == "open" and self.clock() >= self.opened_until:
+            self.state = "half_open"
+            self._probing = False
+        if self.state == "half_open":
+            return not self._probing
+        return self.state == "closed"
+
+    def acquire(self) -> None:
+        if self.state == "half_open":
+            self._probing = True
+
+    def release(self) -> None:
+        """Free the probe slot if a probe ended without a recorded outcome."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._timeout = self.reset_timeout
+        self._probing = False
+
+    def record_failure(self, cooldown: float | None = None) -> None:
+        """Count a failure; ``cooldown`` opens the breaker for exactly that long."""
+        self.failures += 1
+        if cooldown is not None:
+            self._open(cooldown)
+        elif self.state == "half_open":
+            self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+            self._open(self._timeout)
+        elif self.failures >= self.failure_threshold:
+            self._open(self._timeout)
+
+    def _open(self, duration: float) -> None:
+        self.opened_until = self.clock() + duration
+        self.state = "open"
+        self._probing = False
+
+
+@dataclass(eq=False)
+class DeploymentSlot[M]:
+    name: str
+    model: M
+    limiter: RateLimiter
+    weight: float = 1.0
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    outstanding: int = 0
+
+
+class DeploymentPool[M]:
+    """Routes model calls across deployments with separate quotas.
+
+    Each call goes to the available deployment with the fewest outstanding
+    requests relative to its weight. Throttled or failing calls are retried on
+    another deployment where possible, otherwise after a jittered backoff, and
+    deployments that keep failing are ejected by their circuit breaker until a
+    probe succeeds.
+    """
+
+    def __init__(
+        self,
+        slots: list[DeploymentSlot[M]],
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        if not slots:
+            raise ValueError("A deployment pool needs at least one deployment")
+        self.slots = slots
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def _choose(self) -> DeploymentSlot[M] | None:
+        available = [slot for slot in self.slots if slot.breaker.available()]
+        if not available:
+            return None
+        return min(
+            available,
+            key=lambda slot: ((slot.outstanding + 1) / slot.weight, -slot.weight),
+        )
+
+    async def _acquire(self) -> DeploymentSlot[M]:
+        while (slot := self._choose()) is None:
+            reopen_at = min(other.breaker.opened_until for other in self.slots)
+            # Probes still in flight keep every breaker unavailable for a moment.
+            await asyncio.sleep(max(reopen_at - time.monotonic(), 0.05))
+        slot.breaker.acquire()
+        return slot
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        if (delay := retry_after(error)) is not None:
+            return min(delay, self.max_delay) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def run[T](
+        self,
+        call: Callable[[M], Awaitable[T]],
+        estimated_tokens: int = 0,
+        actual_tokens: Callable[[T], int] | None = None,
+    ) -> T:
+        """Run ``call`` with a deployment's model, failing over on errors.
+
+        ``actual_tokens`` reads the real usage from a result so that the chosen
+        deployment's token budget can be corrected.
+        """
+        attempt = 0
+        while True:
+            slot = await self._acquire()
+            slot.outstanding += 1
+            try:
+                result = await slot.limiter.run(
+                    partial(call, slot.model), estimated_tokens
+                )
+            except Exception as e:
+                if not is_retryable(e):
+                    # The deployment answered; the request itself is at fault.
+                    slot.breaker.record_success()
+                    raise
+                delay = self._backoff(attempt, e)
+                throttled = isinstance(e, ModelHTTPError) and e.status_code == 429
+                slot.breaker.record_failure(delay if throttled else None)
+                if throttled:
+                    # Other pools may share this deployment's limiter.
+                    slot.limiter.pause(delay)
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                slot.breaker.record_success()
+                if actual_tokens is not None and slot.limiter.tokens:
+                    slot.limiter.record_usage(estimated_tokens, actual_tokens(result))
+                return result
+            finally:
+                slot.outstanding -= 1
+                slot.breaker.release()
+
+            attempt += 1
+            # Fail over straight away when another deployment can take the call.
+            if not any(
+                other.breaker.available() for other in self.slots if other is not slot
+            ):
+                await asyncio.sleep(delay)
@@ -1,16 +1,264 @@
+import atexit
+import codecs
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
 from pathlib import Path
 from typing import Protocol
+from xml.etree import ElementTree
+
+from quizling.base.cache import LRUStore
+
+# pypdf extraction is pure Python and CPU-bound. Below this many pages it is
+# cheaper to extract serially than to hand pages to worker processes.
+PARALLEL_MIN_PAGES = 32
+
+# Bytes of a text file decoded at a time.
+TEXT_BLOCK_SIZE = 1024 * 1024
+
+EXTRACTION_CACHE_FILENAME = "extractions.sqlite3"
+DEFAULT_EXTRACTION_CACHE_BYTES = 1024 * 1024 * 1024
+# Part of every extraction cache key; bump it when a reader's output changes.
+EXTRACTION_VERSION = 5
+# Prefixes each stored extraction with the seconds it took.
+SECONDS = struct.Struct("<d")
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A piece of a document's text and where it came from.
+
+    ``start`` and ``end`` are byte offsets for text files, page numbers for
+    PDFs and paragraph numbers for DOCX files, end exclusive.
+    """
+
+    text: str
+    start: int
+    end: int
 
 
 class FileReader(Protocol):
     """Protocol for file readers."""
 
+    # Joins consecutive segments into the text ``read`` returns.
+    separator: str
+    # Set when the reader's options change its output, so that the extraction
+    # cache keeps each variant's text apart.
+    variant: str
+
+    def iter_segments(self, file_path: Path) -> Iterator[Segment]:
+        """Yield the file's text in document order, a piece at a time."""
+        ...
+
     def read(self, file_path: Path) -> str:
         """Read content from a file."""
         ...
 
 
+# Byte order marks, longest first: the UTF-32 LE mark starts with UTF-16 LE's.
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+# Bytes from the start of a file used to guess an encoding without a BOM.
+ENCODING_SAMPLE_SIZE = 64 * 1024
+CODE_UNIT_SIZES = {"utf-16-le": 2, "utf-16-be": 2, "utf-32-le": 4, "utf-32-be": 4}
+
+
+def detect_encoding(sample: bytes) -> tuple[str, int]:
+    """Guess the encoding of text starting with ``sample``.
+
+    Returns the encoding and the length of its byte order mark, if any.
+    Without a BOM, text that is valid UTF-8 is UTF-8, text with a NUL in most
+    other byte is UTF-16, and anything else is latin-1, which never fails.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+
+    try:
+        # Not final: the sample may end partway through a character.
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+    except UnicodeDecodeError:
+        pass
+    else:
+        if b"\x00" not in sample:
+            return "utf-8", 0
+
+    pairs = len(sample) // 2
+    if pairs:
+        # ASCII-range text in UTF-16 has a zero high byte.
+        even_zeros = sample[: pairs * 2 : 2].count(0)
+        odd_zeros = sample[1 : pairs * 2 : 2].count(0)
+        if odd_zeros > pairs * 0.3 and even_zeros < pairs * 0.05:
+            return "utf-16-le", 0
+        if even_zeros > pairs * 0.3 and odd_zeros < pairs * 0.05:
+            return "utf-16-be", 0
+
+    if b"\x00" not in sample:
+        return "latin-1", 0
+    return "utf-8", 0
+
+
+class MappedText:
+    """A text file mapped into memory and decoded on demand.
+
+    The operating system pages the file in and out as it is read, so memory
+    use does not grow with its size. ``segments`` decodes it a block at a
+    time and ``text`` decodes any byte range, such as a segment's offsets,
+    without touching the rest of the file. Both translate ``\\r\\n`` and
+    ``\\r`` line endings to ``\\n``, as reading the file in text mode would.
+    """
+
+    def __init__(self, file_path: Path):
+        self._file = open(file_path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped.
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.size
+            else None
+        )
+        if self._map is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        self._view = memoryview(self._map if self._map is not None else b"")
+
+        self.encoding, self.bom_length = detect_encoding(
+            bytes(self._view[:ENCODING_SAMPLE_SIZE])
+        )
+        # UTF-8 that turns out to be invalid past the sample is decoded as
+        # latin-1 from the first invalid byte on.
+        self.fallback_offset: int | None = None
+
+    def __enter__(self) -> "MappedText":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def _errors(self) -> str:
+        # Invalid UTF-8 falls back to latin-1; other encodings were detected
+        # with a BOM or a strong signal, so stray bad bytes are replaced.
+        return "strict" if self.encoding == "utf-8" else "replace"
+
+    def segments(self, block_size: int | None = None) -> Iterator[Segment]:
+        """Yield the text in blocks of about ``block_size`` bytes, with their
+        byte offsets in the file."""
+        block_size = block_size or TEXT_BLOCK_SIZE
+        decoder = codecs.getincrementaldecoder(self.encoding)(self._errors())
+        offset = self.bom_length
+        # A block ending in "\r" may be followed by the "\n" of the same CRLF.
+        after_cr = False
+        while True:
+            with self._view[offset : offset + block_size] as block:
+                final = not block
+                # Bytes of a character split across blocks are held over.
+                pending = decoder.getstate()[0]
+                start = offset - len(pending)
+                try:
+                    text = decoder.decode(block, final=final)
+                except UnicodeDecodeError as e:
+                    combined = pending + bytes(block)
+                    text = combined[: e.start].decode("utf-8") + combined[
+                        e.start :
+                    ].decode("latin-1")
+                    self.fallback_offset = start + e.start
+                    decoder = codecs.getincrementaldecoder("latin-1")()
+                offset += len(block)
+            if after_cr and text.startswith("\n"):
+                text = text[1:]
+            if text:
+                after_cr = text.endswith("\r")
+                yield Segment(
+                    _translate_newlines(text),
+                    start,
+                    offset - len(decoder.getstate()[0]),
+                )
+            if final:
+                return
+
+    def text(self, start: int, end: int) -> str:
+        """Decode bytes ``start`` to ``end``, widened to whole characters."""
+        start = self._character_start(max(start, self.bom_length))
+        end = self._character_start(min(end, self.size))
+        if start >= end:
+            return ""
+
+        split = self.fallback_offset
+        if split is None or end <= split:
+            text = self._decode(start, end, self.encoding)
+        elif start >= split:
+            text = self._decode(start, end, "latin-1")
+        else:
+            text = self._decode(start, split, self.encoding) + self._decode(
+                split, end, "latin-1"
+            )
+        # The "\n" of a CRLF split from its "\r" was read with the "\r".
+        if text.startswith("\n") and self._follows_cr(start):
+            text = text[1:]
+        return _translate_newlines(text)
+
+    def _follows_cr(self, offset: int) -> bool:
+        # "\r" is one byte in latin-1, so after a fallback too.
+        cr = "\r".encode(self.encoding)
+        if offset - len(cr) < self.bom_length:
+            return False
+        with self._view[offset - len(cr) : offset] as before:
+            return before == cr
+
+    def _decode(self, start: int, end: int, encoding: str) -> str:
+        with self._view[start:end] as data:
+            return str(data, encoding, "replace")
+
+    def _character_start(self, offset: int) -> int:
+        """Move ``offset`` back to the first byte of the character it falls in."""
+        if self.fallback_offset is not None and offset >= self.fallback_offset:
+            return offset
+        if self.encoding == "utf-8":
+            # UTF-8 continuation bytes look like 0b10xxxxxx.
+            floor = max(self.bom_length, offset - 3)
+            while offset > floor and offset < self.size:
+                if self._view[offset] & 0xC0 != 0x80:
+                    break
+                offset -= 1
+            return offset
+        if unit := CODE_UNIT_SIZES.get(self.encoding):
+            offset -= (offset - self.bom_length) % unit
+            if unit == 2 and self.bom_length < offset < self.size - 1:
+                # Don't split a surrogate pair.
+                high = self._view[offset + (1 if self.encoding == "utf-16-le" else 0)]
+                if 0xDC <= high <= 0xDF:
+                    offset -= 2
+        return offset
+
+
+def _translate_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 class TextFileReader:
+    separator = ""
+    variant = ""
+
     def read(self, file_path: Path) -> str:
         """Read content from a text file.
 
@@ -24,18 +272,87 @@ class TextFileReader:
             FileNotFoundError: If the file does not exist
             IOError: If there is an error reading the file
         """
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
-        except UnicodeDecodeError:
-            with open(file_path, "r", encoding="latin-1") as f:
-                return f.read()
+        return "".join(segment.text for segment in self.iter_segments(file_path))
+
+    def iter_segments(self, file_path: Path) -> Iterator[Segment]:
+        """Yield the file in blocks of about ``TEXT_BLOCK_SIZE`` bytes.
+
+        The encoding comes from a byte order mark, or else from a sample of
+        the start of the file (see ``detect_encoding``). Offsets are in bytes,
+        and ``MappedText.text`` turns them back into text.
+        """
+        with MappedText(file_path) as mapped:
+            yield from mapped.segments()
+
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+# Reads run in threads (asyncio.to_thread), so two can ask for a pool at once.
+_pools_lock = threading.Lock()
+
+
+def _shared_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool reused by every read with the same worker count.
+
+    Workers are spawned, which is safe from threads where fork is not, and
+    each one pays for importing quizling once rather than once per PDF.
+    """
+    with _pools_lock:
+        if (pool := _pools.get(workers)) is None:
+            pool = ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+            _pools[workers] = pool
+    return pool
+
+
+def _discard_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    with _pools_lock:
+        # Another read may already have replaced it.
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(cancel_futures=True)
+
+
+def _extract_pages(file_path: Path, start: int, stop: int) -> list[str]:
+    """Extract the text of pages ``start`` to ``stop``; runs in a worker process."""
+    from pypdf import PdfReader
+
+    # Opening is cheap: pypdf only parses the pages it is asked for.
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
 
 
 class PDFFileReader:
+    separator = "\n\n"
+    variant = ""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        min_parallel_pages: int = PARALLEL_MIN_PAGES,
+    ):
+        """
+        Args:
+            max_workers: Processes to extract large PDFs with (default: one
+                per CPU). 1 always extracts in this process.
+            min_parallel_pages: Smaller PDFs are always extracted serially
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_pages = min_parallel_pages
+
     def read(self, file_path: Path) -> str:
         """Read content from a PDF file.
 
+        Large PDFs are split into page ranges that are extracted in parallel
+        across worker processes, keeping page order.
+
         Args:
             file_path: Path to the PDF file
 
@@ -47,6 +364,10 @@ class PDFFileReader:
             ImportError: If pypdf is not installed
             IOError: If there is an error reading the file
         """
+        return "\n\n".join(segment.text for segment in self.iter_segments(file_path))
+
+    def iter_segments(self, file_path: Path) -> Iterator[Segment]:
+        """Yield the text of each page that has any, in page order."""
         try:
             from pypdf import PdfReader
         except ImportError as e:
@@ -55,17 +376,112 @@ class PDFFileReader:
             ) from e
 
         reader = PdfReader(file_path)
-        text_parts = []
+        num_pages = len(reader.pages)
 
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
+        if self.max_workers > 1 and num_pages >= self.min_parallel_pages:
+            pages = self._extract_parallel(file_path, num_pages)
+        else:
+            pages = (page.extract_text() for page in reader.pages)
 
-        return "\n\n".join(text_parts)
+        for number, text in enumerate(pages):
+            if text:
+                yield Segment(text, number, number + 1)
+
+    def _extract_parallel(self, file_path: Path, num_pages: int) -> Iterator[str]:
+        workers = min(self.max_workers, num_pages)
+        # A few ranges per worker even out pages that are slow to extract.
+        step = -(-num_pages // (workers * 4))
+        starts = range(0, num_pages, step)
+        pool = _shared_pool(workers)
+        try:
+            ranges = pool.map(
+                _extract_pages,
+                [file_path] * len(starts),
+                starts,
+                [min(start + step, num_pages) for start in starts],
+            )
+            # Ranges arrive in order, each as soon as it and those before it
+            # are done.
+            for page_texts in ranges:
+                yield from page_texts
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next read.
+            _discard_pool(workers, pool)
+            raise
+
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Alternative content for older readers, duplicating e.g. text boxes.
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Run content and its text, as python-docx renders it.
+RUN_TEXT = {
+    W + "tab": "\t",
+    W + "ptab": "\t",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+}
+
+
+def _iter_docx_paragraphs(file_path: Path) -> Iterator[str]:
+    """Yield the text of every paragraph in word/document.xml, table cells
+    included, parsing it incrementally and discarding what has been read."""
+    with (
+        zipfile.ZipFile(file_path) as archive,
+        archive.open("word/document.xml") as xml,
+    ):
+        # Paragraphs in text boxes are nested inside another paragraph.
+        paragraphs: list[list[str]] = []
+        tags: list[str] = []
+        fallback_depth = 0
+        body = None
+
+        for event, element in ElementTree.iterparse(xml, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                tags.append(tag)
+                if tag == MC_FALLBACK:
+                    fallback_depth += 1
+                elif tag == W + "p" and not fallback_depth:
+                    paragraphs.append([])
+                elif tag == W + "body":
+                    body = element
+                continue
+
+            tags.pop()
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+            elif fallback_depth:
+                pass
+            elif tag == W + "p":
+                yield "".join(paragraphs.pop())
+            elif paragraphs and tags and tags[-1] == W + "r":
+                if tag == W + "t":
+                    paragraphs[-1].append(element.text or "")
+                elif tag == W + "br":
+                    # Page and column breaks have no text.
+                    if element.get(W + "type", "textWrapping") == "textWrapping":
+                        paragraphs[-1].append("\n")
+                elif tag in RUN_TEXT:
+                    paragraphs[-1].append(RUN_TEXT[tag])
+
+            # Drop each paragraph or table once read, so memory stays constant.
+            if body is not None and len(tags) == 2:
+                body.clear()
 
 
 class DOCXFileReader:
+    separator = "\n\n"
+
+    def __init__(self, streaming: bool = False):
+        """
+        Args:
+            streaming: Parse word/document.xml directly, a paragraph at a time,
+                in constant memory. Unlike the default python-docx path, this
+                also includes table cells and text boxes.
+        """
+        self.streaming = streaming
+        self.variant = "streaming" if streaming else ""
+
     def read(self, file_path: Path) -> str:
         """Read content from a DOCX file.
 
@@ -77,9 +493,19 @@ class DOCXFileReader:
 
         Raises:
             FileNotFoundError: If the file does not exist
-            ImportError: If python-docx is not installed
+            ImportError: If python-docx is needed and not installed
             IOError: If there is an error reading the file
         """
+        return "\n\n".join(segment.text for segment in self.iter_segments(file_path))
+
+    def iter_segments(self, file_path: Path) -> Iterator[Segment]:
+        """Yield each paragraph with text, in document order."""
+        if self.streaming:
+            for number, text in enumerate(_iter_docx_paragraphs(file_path)):
+                if text.strip():
+                    yield Segment(text, number, number + 1)
+            return
+
         try:
             from docx import Document
         except ImportError as e:
@@ -89,13 +515,120 @@ class DOCXFileReader:
             ) from e
 
         doc = Document(file_path)
-        text_parts = []
 
-        for paragraph in doc.paragraphs:
+        for number, paragraph in enumerate(doc.paragraphs):
             if paragraph.text.strip():
-                text_parts.append(paragraph.text)
+                yield Segment(paragraph.text, number, number + 1)
+
+
+class ExtractionCache:
+    """Cache of extracted document text, stored zlib-compressed in an ``LRUStore``.
+
+    Entries are keyed by a hash of the file's contents, so a copied or renamed
+    file still hits and an edited one misses. The hash is remembered against
+    each path's size and modification time, so unchanged files are not read
+    again to compute it. When the stored size passes ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = DEFAULT_EXTRACTION_CACHE_BYTES
+    ):
+        self.directory = Path(directory)
+        self.store = LRUStore(
+            self.directory / EXTRACTION_CACHE_FILENAME, "extracted_text", max_bytes
+        )
+        # Extraction time that hits did not have to spend again.
+        self.seconds_saved = 0.0
+        self._saved_lock = threading.Lock()
+
+        with self.store.connection() as db:
+            # Superseded by the store's table.
+            db.execute("DROP TABLE IF EXISTS extractions")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    key TEXT NOT NULL
+                )
+                """
+            )
+
+    @property
+    def hits(self) -> int:
+        return self.store.hits
 
-        return "\n\n".join(text_parts)
+    @property
+    def misses(self) -> int:
+        return self.store.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.store.hit_rate
+
+    def key(self, file_path: Path, variant: str = "") -> str:
+        """Cache key for a file's extracted text, hashing it only if it changed.
+
+        ``variant`` names the reader options the text was extracted with.
+        """
+        path = str(file_path.resolve())
+        stat = file_path.stat()
+        with self.store.connection() as db:
+            row = db.execute(
+                "SELECT key FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row is not None:
+            key = row[0]
+        else:
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as f:
+                while block := f.read(TEXT_BLOCK_SIZE):
+                    digest.update(block)
+            # The same bytes can read differently by type, e.g. .txt and .pdf.
+            key = f"{digest.hexdigest()}{file_path.suffix.lower()}:{EXTRACTION_VERSION}"
+            with self.store.connection() as db, db:
+                db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns, key),
+                )
+        return f"{key}+{variant}" if variant else key
+
+    def get(self, key: str) -> str | None:
+        value = self.store.get(key)
+        if value is None:
+            return None
+        # Values are the extraction time followed by the compressed text.
+        (seconds,) = SECONDS.unpack_from(value)
+        with self._saved_lock:
+            self.seconds_saved += seconds
+        return zlib.decompress(value[SECONDS.size :]).decode("utf-8")
+
+    def put(self, key: str, text: str, seconds: float) -> None:
+        self.store.put(key, SECONDS.pack(seconds) + zlib.compress(text.encode("utf-8")))
+
+    def record(self, key: str, pieces: Iterator[str]) -> Iterator[str]:
+        """Pass ``pieces`` through, storing their text once all have been read.
+
+        Pieces are compressed as they go by, so the whole text is never held.
+        """
+        started = time.perf_counter()
+        compressor = zlib.compressobj()
+        parts = []
+        for piece in pieces:
+            parts.append(compressor.compress(piece.encode("utf-8")))
+            yield piece
+        parts.append(compressor.flush())
+        seconds = time.perf_counter() - started
+        self.store.put(key, SECONDS.pack(seconds) + b"".join(parts))
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def close(self) -> None:
+        self.store.close()
 
 
 class FileReaderFactory:
@@ -109,11 +642,20 @@ class FileReaderFactory:
     }
 
     @classmethod
-    def get_reader(cls, file_path: Path) -> FileReader:
+    def get_reader(
+        cls,
+        file_path: Path,
+        max_workers: int | None = None,
+        docx_streaming: bool = False,
+    ) -> FileReader:
         """Get the appropriate file reader for the given file.
 
         Args:
             file_path: Path to the file
+            max_workers: Processes used to extract large PDFs (default: one
+                per CPU)
+            docx_streaming: Read DOCX files with the streaming parser, which
+                also includes table cells and text boxes
 
         Returns:
             An instance of the appropriate FileReader
@@ -130,14 +672,29 @@ class FileReaderFactory:
                 f"Unsupported file type: {extension}. Supported types: {supported}"
             )
 
+        if issubclass(reader_class, PDFFileReader):
+            return reader_class(max_workers=max_workers)
+        if issubclass(reader_class, DOCXFileReader):
+            return reader_class(streaming=docx_streaming)
         return reader_class()
 
     @classmethod
-    def read_file(cls, file_path: str | Path) -> str:
+    def read_file(
+        cls,
+        file_path: str | Path,
+        max_workers: int | None = None,
+        cache: ExtractionCache | None = None,
+        docx_streaming: bool = False,
+    ) -> str:
         """Read content from a file, automatically detecting the file type.
 
         Args:
             file_path: Path to the file (string or Path object)
+            max_workers: Processes used to extract large PDFs (default: one
+                per CPU)
+            cache: Returns the file's text from here if it was read before,
+                and stores it otherwise
+            docx_streaming: Read DOCX files with the streaming parser
 
         Returns:
             The file content as a string
@@ -147,6 +704,46 @@ class FileReaderFactory:
             ValueError: If the file type is not supported
             IOError: If there is an error reading the file
         """
+        if cache is not None:
+            return "".join(cls.iter_text(file_path, max_workers, cache, docx_streaming))
+
+        path = cls._check_file(file_path)
+        reader = cls.get_reader(path, max_workers, docx_streaming)
+        return reader.read(path)
+
+    @classmethod
+    def iter_text(
+        cls,
+        file_path: str | Path,
+        max_workers: int | None = None,
+        cache: ExtractionCache | None = None,
+        docx_streaming: bool = False,
+    ) -> Iterator[str]:
+        """Read a file a piece at a time; the pieces join up to ``read_file``.
+
+        Raises the same errors as ``read_file``, the path checks straight away
+        and read errors once iteration reaches them. A cache hit is returned
+        as a single piece.
+        """
+        path = cls._check_file(file_path)
+        reader = cls.get_reader(path, max_workers, docx_streaming)
+
+        def pieces() -> Iterator[str]:
+            for i, segment in enumerate(reader.iter_segments(path)):
+                if i:
+                    yield reader.separator
+                yield segment.text
+
+        if cache is None:
+            return pieces()
+
+        key = cache.key(path, reader.variant)
+        if (text := cache.get(key)) is not None:
+            return iter((text,))
+        return cache.record(key, pieces())
+
+    @staticmethod
+    def _check_file(file_path: str | Path) -> Path:
         path = Path(file_path)
 
         if not path.exists():
@@ -155,5 +752,4 @@ class FileReaderFactory:
         if not path.is_file():
             raise ValueError(f"Path is not a file: {path}")
 
-        reader = cls.get_reader(path)
-        return reader.read(path)
+        return path
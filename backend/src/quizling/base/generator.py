@@ -1,67 +1,196 @@
-from openai import AsyncAzureOpenAI
+import asyncio
+import time
+
+from collections.abc import AsyncIterator, Awaitable, Callable
 from pathlib import Path
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIChatModel
-from pydantic_ai.providers.openai import OpenAIProvider
-from quizling.base.file_reader import FileReaderFactory
+from pydantic_ai import Agent, RunContext
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from pydantic_ai.models import Model
+from pydantic_ai.usage import RunUsage
+from quizling.base.cache import ResponseCache, cache_key
+from quizling.base.clients import shared_model
+from quizling.base.chunker import (
+    Chunk,
+    allocate_questions,
+    estimate_tokens,
+    iter_chunks,
+    split_into_chunks,
+)
+from quizling.base.deployments import DeploymentPool, DeploymentSlot
+from quizling.base.file_reader import ExtractionCache, FileReaderFactory
+from quizling.base.metrics import MetricsHook, RequestEvent
 from quizling.base.models import (
+    AzureDeployment,
+    GenerationMetrics,
     MultipleChoiceQuestion,
     QuizConfig,
     QuizResult,
 )
+from quizling.base.rate_limiter import shared_rate_limiter
 from textwrap import dedent
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Kept free of per-run values so that it, followed by the document, forms a
+# byte-identical prefix the provider can cache across quiz variants.
+CACHEABLE_SYSTEM_PROMPT = dedent("""
+    You are an expert educator and question writer. Your task is to create
+    high-quality multiple choice questions based on provided content.
+
+    The user message contains the content, followed by the requirements for
+    this quiz: how many questions to write, their difficulty, whether to
+    include explanations and which topics to focus on.
+
+    Requirements for every quiz:
+    - Each question must have exactly 4 answer options (A, B, C, D)
+    - Ensure questions test understanding, not just memorization
+    - Make incorrect options plausible but clearly wrong
+
+    Format each question as a JSON object with:
+    - question: Clear, specific question text
+    - options: Array of 4 objects with label (A/B/C/D) and text
+    - correct_answer: The label of the correct option (A/B/C/D)
+    - explanation: Why the correct answer is right (if requested)
+    - difficulty: The difficulty level of the question
+
+    Ensure questions are well-distributed across the content and avoid overlap.
+""")
+
+_DONE = object()
+
+
+async def _iterate(
+    produce: Callable[[Callable[[T], None]], Awaitable[None]],
+) -> AsyncIterator[T]:
+    """Run ``produce`` in a task and yield each item as soon as it is emitted.
+
+    The producer's exception, if any, is raised once its items are consumed;
+    closing the iterator early cancels the producer.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> None:
+        try:
+            await produce(queue.put_nowait)
+        finally:
+            queue.put_nowait(_DONE)
+
+    task = asyncio.create_task(run())
+    try:
+        while (item := await queue.get()) is not _DONE:
+            yield item
+        await task
+    finally:
+        task.cancel()
 
 
 class QuizGenerator:
     MIN_CONTENT_LENGTH = (
         100  # Minimum characters needed for meaningful question generation
     )
+    OUTPUT_TOKENS_PER_QUESTION = 250  # Budgeted before a call, corrected after
 
-    def __init__(self, config: QuizConfig):
+    def __init__(
+        self,
+        config: QuizConfig,
+        metrics_hook: MetricsHook | None = None,
+        model_factory: Callable[[AzureDeployment], Model] = shared_model,
+    ):
         self.config = config
+        self.metrics_hook = metrics_hook
+        # Builds the model behind each deployment; swap it out to run against
+        # something other than Azure, e.g. quizling.base.offline.OfflineBackend.
+        self.model_factory = model_factory
+        self._pool = self._create_pool()
+        # Any deployment in the pool may serve a request, so cached responses
+        # are keyed by all of them rather than by the one that happened to.
+        self._deployments_key = ",".join(
+            sorted(d.deployment_name for d in config.deployment_pool())
+        )
         self._agent = self._create_agent()
-
-    def _create_agent(self) -> Agent[None, list[MultipleChoiceQuestion]]:
-        client = AsyncAzureOpenAI(
-            api_key=self.config.azure_api_key,
-            api_version=self.config.api_version,
-            azure_endpoint=self.config.azure_endpoint,
+        # Token usage of every model call made by this generator, including
+        # input tokens served from the provider's prompt cache.
+        self.usage = RunUsage()
+        self.cache = (
+            ResponseCache(
+                config.cache_directory,
+                max_bytes=config.cache_max_bytes,
+                max_age_seconds=config.cache_max_age_days * 24 * 60 * 60,
+            )
+            if config.cache_directory
+            else None
         )
-
-        model = OpenAIChatModel(
-            self.config.azure_deployment_name,
-            provider=OpenAIProvider(openai_client=client),
+        # Parsed document text, so the same sources are not parsed again.
+        self.extraction_cache = (
+            ExtractionCache(
+                config.cache_directory, max_bytes=config.extraction_cache_max_bytes
+            )
+            if config.cache_directory
+            else None
         )
 
-        system_prompt = self._build_system_prompt()
+    def _create_pool(self) -> DeploymentPool[Model]:
+        slots = [
+            DeploymentSlot(
+                name=f"{deployment.endpoint}/{deployment.deployment_name}",
+                model=self.model_factory(deployment),
+                # Quotas belong to the deployment, so generators share limiters.
+                limiter=shared_rate_limiter(
+                    (deployment.endpoint, deployment.deployment_name),
+                    requests_per_minute=deployment.requests_per_minute,
+                    tokens_per_minute=deployment.tokens_per_minute,
+                ),
+                weight=deployment.weight,
+            )
+            for deployment in self.config.deployment_pool()
+        ]
+        return DeploymentPool(slots, max_retries=self.config.max_retries)
 
-        return Agent(
-            model,
-            system_prompt=system_prompt,
+    def _create_agent(self) -> Agent[QuizConfig, list[MultipleChoiceQuestion]]:
+        # The system prompt is rendered per run from the config passed as deps,
+        # so chunked runs can ask for their own share of the questions. The
+        # model is chosen per run by the deployment pool.
+        agent = Agent(
+            self._pool.slots[0].model,
+            deps_type=QuizConfig,
             output_type=list[MultipleChoiceQuestion],
         )
+        agent.system_prompt(self._system_prompt)
+        return agent
 
-    def _build_system_prompt(self) -> str:
+    def _system_prompt(self, ctx: RunContext[QuizConfig]) -> str:
+        return self._build_system_prompt(ctx.deps)
+
+    def _instructions(self, config: QuizConfig) -> tuple[str, str]:
         explanation_instruction = (
             "Include a detailed explanation for each correct answer."
-            if self.config.include_explanations
+            if config.include_explanations
             else "Do not include explanations."
         )
 
         topic_instruction = (
-            f"Focus specifically on topics related to: {self.config.topic_focus}"
-            if self.config.topic_focus
+            f"Focus specifically on topics related to: {config.topic_focus}"
+            if config.topic_focus
             else "Cover various important topics from the content."
         )
+        return explanation_instruction, topic_instruction
+
+    def _build_system_prompt(self, config: QuizConfig | None = None) -> str:
+        config = config or self.config
+        if config.prompt_layout == "cacheable":
+            return CACHEABLE_SYSTEM_PROMPT
+
+        explanation_instruction, topic_instruction = self._instructions(config)
 
         return dedent(f"""
             You are an expert educator and question writer. Your task is to create
             high-quality multiple choice questions based on provided content.
 
             Requirements:
-            - Generate exactly {self.config.num_questions} multiple choice questions
+            - Generate exactly {config.num_questions} multiple choice questions
             - Each question must have exactly 4 answer options (A, B, C, D)
-            - Questions should be at {self.config.difficulty.value} difficulty level
+            - Questions should be at {config.difficulty.value} difficulty level
             - Ensure questions test understanding, not just memorization
             - Make incorrect options plausible but clearly wrong
             - {explanation_instruction}
@@ -77,10 +206,25 @@ class QuizGenerator:
             Ensure questions are well-distributed across the content and avoid overlap.
         """)
 
-    def _build_agent_prompt(self, content: str) -> str:
+    def _build_agent_prompt(
+        self, content: str, config: QuizConfig | None = None
+    ) -> str:
+        config = config or self.config
+        if config.prompt_layout == "cacheable":
+            # Only the content may precede the per-run requirements, so that
+            # every variant of a document shares the same prompt prefix.
+            explanation_instruction, topic_instruction = self._instructions(config)
+            return f"Content:\n{content}\n\n" + dedent(f"""\
+                Quiz requirements:
+                - Generate exactly {config.num_questions} multiple choice questions
+                - Questions should be at {config.difficulty.value} difficulty level
+                - {explanation_instruction}
+                - {topic_instruction}
+            """)
+
         return dedent(f"""
-            Based on the following content, generate {self.config.num_questions}
-            multiple choice questions at {self.config.difficulty.value} difficulty level.
+            Based on the following content, generate {config.num_questions}
+            multiple choice questions at {config.difficulty.value} difficulty level.
 
             Content:
             {content}
@@ -97,36 +241,515 @@ class QuizGenerator:
                 f"got {len(stripped_content)}"
             )
 
-    async def generate_from_file(self, file_path: str | Path) -> QuizResult:
+    async def generate_from_file(
+        self, file_path: str | Path, config: QuizConfig | None = None
+    ) -> QuizResult:
+        """Generate a quiz for a file.
+
+        ``config`` overrides the generation options (count, difficulty, topic,
+        chunking) for this run only; clients, deployments and the cache are
+        those the generator was created with.
+        """
+        config = config or self.config
         path = Path(file_path)
+        metrics = GenerationMetrics()
+        started = time.perf_counter()
 
-        content = FileReaderFactory.read_file(path)
-        self._validate_content_length(content)
+        chunks = await self._read_chunks(path, config, metrics)
+        questions = await self._generate_runs(
+            self._plan_runs(chunks, config), config, metrics
+        )
+
+        return self._complete(
+            QuizResult(
+                questions=questions,
+                source_file=str(path.absolute()),
+                config=config,
+                metrics=metrics,
+            ),
+            started,
+        )
 
-        questions = await self._generate_questions(content)
+    async def generate_from_text(
+        self, text: str, config: QuizConfig | None = None
+    ) -> QuizResult:
+        config = config or self.config
+        metrics = GenerationMetrics()
+        started = time.perf_counter()
+        self._validate_content_length(text)
+
+        questions = await self._generate_questions(text, config, metrics)
+
+        return self._complete(
+            QuizResult(
+                questions=questions,
+                source_file="<text input>",
+                config=config,
+                metrics=metrics,
+            ),
+            started,
+        )
 
-        return QuizResult(
-            questions=questions,
-            source_file=str(path.absolute()),
-            config=self.config,
+    async def _read_file(self, path: Path, metrics: GenerationMetrics) -> str:
+        started = time.perf_counter()
+        # Parsing PDFs and DOCX is CPU- and IO-bound; keep the event loop free
+        # for other documents' in-flight generation calls.
+        content = await asyncio.to_thread(
+            FileReaderFactory.read_file,
+            path,
+            self.config.extraction_workers,
+            self.extraction_cache,
+            self.config.docx_streaming,
         )
+        metrics.read_seconds += time.perf_counter() - started
+        return content
+
+    async def _read_chunks(
+        self, path: Path, config: QuizConfig, metrics: GenerationMetrics
+    ) -> list[Chunk]:
+        """Read and chunk a file as it is read.
+
+        The text is never joined into one string, but every chunk is kept:
+        questions are allocated from all chunk sizes before any run starts.
+        """
+        started = time.perf_counter()
+
+        def read() -> list[Chunk]:
+            pieces = FileReaderFactory.iter_text(
+                path,
+                self.config.extraction_workers,
+                self.extraction_cache,
+                self.config.docx_streaming,
+            )
+            return list(
+                iter_chunks(
+                    pieces, config.chunk_token_budget, config.chunk_overlap_tokens
+                )
+            )
+
+        chunks = await asyncio.to_thread(read)
+        metrics.read_seconds += time.perf_counter() - started
+        # Content spanning several chunks is far longer than the minimum.
+        if len(chunks) <= 1:
+            self._validate_content_length(chunks[0].text if chunks else "")
+        return chunks
+
+    def _complete(self, result: QuizResult, started: float) -> QuizResult:
+        result.metrics.questions = result.num_questions
+        result.metrics.total_seconds = time.perf_counter() - started
+        if self.metrics_hook is not None:
+            self.metrics_hook.on_complete(result.source_file, result.metrics)
+        return result
 
-    async def generate_from_text(self, text: str) -> QuizResult:
+    async def generate_variants(
+        self, text: str, configs: list[QuizConfig]
+    ) -> list[QuizResult]:
+        """Generate one quiz per config from the same text.
+
+        Every variant uses the cacheable prompt layout, so they share a prompt
+        prefix. The first variant runs alone to let the provider cache that
+        prefix; the rest then run concurrently. Results follow ``configs``.
+        """
         self._validate_content_length(text)
+        return await self._generate_variants(
+            text, configs, "<text input>", GenerationMetrics()
+        )
+
+    async def generate_variants_from_file(
+        self, file_path: str | Path, configs: list[QuizConfig]
+    ) -> list[QuizResult]:
+        """Like ``generate_variants``, reading the file once for every variant."""
+        path = Path(file_path)
+        metrics = GenerationMetrics()
+        content = await self._read_file(path, metrics)
+        self._validate_content_length(content)
+        return await self._generate_variants(
+            content, configs, str(path.absolute()), metrics
+        )
+
+    async def _generate_variants(
+        self,
+        content: str,
+        configs: list[QuizConfig],
+        source_file: str,
+        first_metrics: GenerationMetrics,
+    ) -> list[QuizResult]:
+        configs = [
+            config.model_copy(update={"prompt_layout": "cacheable"})
+            for config in configs
+        ]
+        if not configs:
+            return []
 
-        questions = await self._generate_questions(text)
+        # The document was read once; its read time is charged to the first run.
+        metrics = [first_metrics] + [GenerationMetrics() for _ in configs[1:]]
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def generate(config: QuizConfig, run: GenerationMetrics) -> QuizResult:
+            started = time.perf_counter()
+            questions = await self._generate_questions(content, config, run)
+            return self._complete(
+                QuizResult(
+                    questions=questions,
+                    source_file=source_file,
+                    config=config,
+                    metrics=run,
+                ),
+                started,
+            )
+
+        results = [await generate(configs[0], metrics[0])]
+
+        async def generate_limited(
+            config: QuizConfig, run: GenerationMetrics
+        ) -> QuizResult:
+            async with semaphore:
+                return await generate(config, run)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(generate_limited(config, run))
+                    for config, run in zip(configs[1:], metrics[1:])
+                ]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
 
-        return QuizResult(
-            questions=questions,
-            source_file="<text input>",
-            config=self.config,
+        return results + [task.result() for task in tasks]
+
+    async def stream_from_file(
+        self,
+        file_path: str | Path,
+        config: QuizConfig | None = None,
+        metrics: GenerationMetrics | None = None,
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        """Yield questions for a file as soon as each one has been validated.
+
+        Pass ``metrics`` to collect the run's telemetry; it is complete once the
+        stream is exhausted.
+        """
+        path = Path(file_path)
+        metrics = metrics if metrics is not None else GenerationMetrics()
+        started = time.perf_counter()
+
+        config = config or self.config
+        chunks = await self._read_chunks(path, config, metrics)
+
+        async for question in self._stream_runs(
+            self._plan_runs(chunks, config), config, metrics
+        ):
+            yield question
+        self._complete_stream(str(path.absolute()), metrics, started)
+
+    async def stream_from_text(
+        self,
+        text: str,
+        config: QuizConfig | None = None,
+        metrics: GenerationMetrics | None = None,
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        """Yield questions for ``text`` as soon as each one has been validated."""
+        metrics = metrics if metrics is not None else GenerationMetrics()
+        started = time.perf_counter()
+        self._validate_content_length(text)
+
+        async for question in self._stream_questions(text, config, metrics):
+            yield question
+        self._complete_stream("<text input>", metrics, started)
+
+    def _complete_stream(
+        self, source_file: str, metrics: GenerationMetrics, started: float
+    ) -> None:
+        metrics.total_seconds = time.perf_counter() - started
+        if self.metrics_hook is not None:
+            self.metrics_hook.on_complete(source_file, metrics)
+
+    def _plan_chunks(
+        self, content: str, config: QuizConfig
+    ) -> list[tuple[str, QuizConfig]]:
+        """Split content over ``chunk_token_budget`` into per-chunk generation runs.
+
+        Chunks break on paragraph boundaries and each is asked for its
+        proportional share of ``num_questions``.
+        """
+        chunks = split_into_chunks(
+            content, config.chunk_token_budget, config.chunk_overlap_tokens
+        )
+        if len(chunks) <= 1:
+            return [(content, config)]
+        return self._plan_runs(chunks, config)
+
+    def _plan_runs(
+        self, chunks: list[Chunk], config: QuizConfig
+    ) -> list[tuple[str, QuizConfig]]:
+        """Ask each chunk for its proportional share of ``num_questions``."""
+        if len(chunks) == 1:
+            return [(chunks[0].text, config)]
+
+        counts = allocate_questions(
+            [chunk.tokens for chunk in chunks], config.num_questions
         )
+        return [
+            (chunk.text, config.model_copy(update={"num_questions": count}))
+            for chunk, count in zip(chunks, counts)
+            if count
+        ]
 
-    async def _generate_questions(self, content: str) -> list[MultipleChoiceQuestion]:
-        prompt = self._build_agent_prompt(content)
+    async def _generate_questions(
+        self,
+        content: str,
+        config: QuizConfig | None = None,
+        metrics: GenerationMetrics | None = None,
+    ) -> list[MultipleChoiceQuestion]:
+        """Generate questions, fanning large content out across chunks.
+
+        At most ``max_concurrency`` calls are in flight. Results keep document
+        order.
+        """
+        config = config or self.config
+        metrics = metrics if metrics is not None else GenerationMetrics()
+        return await self._generate_runs(
+            self._plan_chunks(content, config), config, metrics
+        )
+
+    async def _generate_runs(
+        self,
+        runs: list[tuple[str, QuizConfig]],
+        config: QuizConfig,
+        metrics: GenerationMetrics,
+    ) -> list[MultipleChoiceQuestion]:
+        if len(runs) == 1:
+            return await self._generate_chunk(*runs[0], metrics)
+
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+
+        async def generate(
+            text: str, chunk_config: QuizConfig
+        ) -> list[MultipleChoiceQuestion]:
+            async with semaphore:
+                return await self._generate_chunk(text, chunk_config, metrics)
 
         try:
-            result = await self._agent.run(prompt)
-            return result.output
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(generate(*run)) for run in runs]
+        except ExceptionGroup as eg:
+            # Surface the first failure; the TaskGroup has cancelled the rest.
+            raise eg.exceptions[0]
+
+        return [question for task in tasks for question in task.result()]
+
+    async def _stream_questions(
+        self,
+        content: str,
+        config: QuizConfig | None = None,
+        metrics: GenerationMetrics | None = None,
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        """Stream questions from every chunk, in the order they are completed."""
+        config = config or self.config
+        metrics = metrics if metrics is not None else GenerationMetrics()
+        async for question in self._stream_runs(
+            self._plan_chunks(content, config), config, metrics
+        ):
+            yield question
+
+    async def _stream_runs(
+        self,
+        runs: list[tuple[str, QuizConfig]],
+        config: QuizConfig,
+        metrics: GenerationMetrics,
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        if len(runs) == 1:
+            async for question in self._stream_chunk(*runs[0], metrics):
+                metrics.questions += 1
+                yield question
+            return
+
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+
+        async def produce(emit: Callable[[MultipleChoiceQuestion], None]) -> None:
+            async def pump(text: str, chunk_config: QuizConfig) -> None:
+                async with semaphore:
+                    async for question in self._stream_chunk(
+                        text, chunk_config, metrics
+                    ):
+                        metrics.questions += 1
+                        emit(question)
+
+            try:
+                async with asyncio.TaskGroup() as group:
+                    for run in runs:
+                        group.create_task(pump(*run))
+            except ExceptionGroup as eg:
+                raise eg.exceptions[0]
+
+        async for question in _iterate(produce):
+            yield question
+
+    def _cache_key(self, content: str, config: QuizConfig) -> str:
+        return cache_key(
+            content,
+            self._build_system_prompt(config),
+            self._deployments_key,
+            config.model_dump(
+                include={
+                    "num_questions",
+                    "difficulty",
+                    "include_explanations",
+                    "topic_focus",
+                }
+            ),
+        )
+
+    async def _generate_chunk(
+        self, content: str, config: QuizConfig, metrics: GenerationMetrics
+    ) -> list[MultipleChoiceQuestion]:
+        if self.cache is None:
+            return await self._call_model(content, config, metrics)
+
+        # SQLite I/O runs off the event loop so other requests keep moving.
+        key = self._cache_key(content, config)
+        cached = (
+            None
+            if config.cache_refresh
+            else await asyncio.to_thread(self.cache.get, key)
+        )
+        if cached is not None:
+            metrics.cached_responses += 1
+            return cached
+
+        questions = await self._call_model(content, config, metrics)
+        await asyncio.to_thread(self.cache.put, key, questions)
+        return questions
+
+    async def _stream_chunk(
+        self, content: str, config: QuizConfig, metrics: GenerationMetrics
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(content, config)
+            cached = (
+                None
+                if config.cache_refresh
+                else await asyncio.to_thread(self.cache.get, key)
+            )
+            if cached is not None:
+                metrics.cached_responses += 1
+                for question in cached:
+                    yield question
+                return
+
+        questions = []
+        async for question in self._stream_model(content, config, metrics):
+            questions.append(question)
+            yield question
+
+        if key is not None:
+            await asyncio.to_thread(self.cache.put, key, questions)
+
+    def _estimate_tokens(self, prompt: str, config: QuizConfig) -> int:
+        return (
+            estimate_tokens(self._build_system_prompt(config) + prompt)
+            + config.num_questions * self.OUTPUT_TOKENS_PER_QUESTION
+        )
+
+    async def _run_model(
+        self,
+        call: Callable[[Model], Awaitable[T]],
+        prompt: str,
+        config: QuizConfig,
+        metrics: GenerationMetrics,
+    ) -> T:
+        """Send ``call`` through the deployment pool, recording each attempt."""
+        metrics.prompt_chars += len(self._build_system_prompt(config)) + len(prompt)
+        attempts = 0
+
+        async def measured(model: Model) -> T:
+            nonlocal attempts
+            attempts += 1
+            started = time.perf_counter()
+            error = None
+            try:
+                return await call(model)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                metrics.requests += 1
+                metrics.request_seconds.append(seconds)
+                if self.metrics_hook is not None:
+                    self.metrics_hook.on_request(
+                        RequestEvent(model.model_name, seconds, error)
+                    )
+
+        try:
+            result = await self._pool.run(
+                measured,
+                self._estimate_tokens(prompt, config),
+                actual_tokens=lambda result: result.usage().total_tokens,
+            )
         except Exception as e:
+            if isinstance(e, UnexpectedModelBehavior):
+                metrics.validation_failures += 1
             raise Exception(f"Error generating questions: {str(e)}") from e
+        finally:
+            metrics.retries += max(0, attempts - 1)
+
+        usage = result.usage()
+        self.usage.incr(usage)
+        metrics.record_usage(usage)
+        return result
+
+    async def _stream_model(
+        self, content: str, config: QuizConfig, metrics: GenerationMetrics
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        prompt = self._build_agent_prompt(content, config)
+
+        async def produce(emit: Callable[[MultipleChoiceQuestion], None]) -> None:
+            # Content hashes of the questions already yielded, across attempts.
+            emitted: set[str] = set()
+
+            async def call(model):
+                # A retried call generates a fresh set of questions, so it only
+                # tops the ones already yielded up to the requested count, and
+                # skips any it repeats.
+                limit = config.num_questions if emitted else None
+                taken = 0
+
+                def take(questions: list[MultipleChoiceQuestion]) -> None:
+                    nonlocal taken
+                    for question in questions:
+                        taken += 1
+                        key = question.content_hash()
+                        if key in emitted or (limit and len(emitted) >= limit):
+                            continue
+                        emitted.add(key)
+                        emit(question)
+
+                async with self._agent.run_stream(
+                    prompt, deps=config, model=model
+                ) as result:
+                    questions: list[MultipleChoiceQuestion] = []
+                    async for questions in result.stream_output():
+                        # The last question may still be arriving; earlier ones
+                        # are complete.
+                        take(questions[taken:-1])
+                    # The final output is validated in full.
+                    take(questions[taken:])
+                return result
+
+            await self._run_model(call, prompt, config, metrics)
+
+        async for question in _iterate(produce):
+            yield question
+
+    async def _call_model(
+        self, content: str, config: QuizConfig, metrics: GenerationMetrics
+    ) -> list[MultipleChoiceQuestion]:
+        prompt = self._build_agent_prompt(content, config)
+        result = await self._run_model(
+            lambda model: self._agent.run(prompt, deps=config, model=model),
+            prompt,
+            config,
+            metrics,
+        )
+        return result.output
@@ -0,0 +1,53 @@
+import gzip
+import io
+from pathlib import Path
+from typing import Literal, TextIO
+
+Compression = Literal["none", "gzip", "zstd"]
+
+JSONL_SUFFIXES: dict[Compression, str] = {
+    "none": ".jsonl",
+    "gzip": ".jsonl.gz",
+    "zstd": ".jsonl.zst",
+}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstandard is required for .jsonl.zst files. "
+            "Install it with: pip install 'quizling[zstd]'"
+        ) from e
+    return zstandard
+
+
+def is_jsonl(path: Path) -> bool:
+    return any(path.name.endswith(suffix) for suffix in JSONL_SUFFIXES.values())
+
+
+def compress(data: bytes, compression: Compression) -> bytes:
+    """Compress ``data`` as one self-contained gzip member or zstd frame.
+
+    Both formats decode a concatenation of members/frames as a single stream,
+    so each batch can be appended to an existing file independently.
+    """
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def open_jsonl(path: Path) -> TextIO:
+    """Open a JSON Lines file for streaming reads, decompressing by suffix."""
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.name.endswith(".zst"):
+        decompressor = _zstandard().ZstdDecompressor()
+        reader = decompressor.stream_reader(
+            open(path, "rb"), read_across_frames=True, closefd=True
+        )
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(path, encoding="utf-8")
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+from quizling.base.models import GenerationMetrics
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """One model call, successful or not."""
+
+    model: str
+    seconds: float
+    error: BaseException | None = None
+
+
+class MetricsHook(Protocol):
+    """Receives generation telemetry, e.g. to export it to a metrics backend."""
+
+    def on_request(self, event: RequestEvent) -> None: ...
+
+    def on_complete(self, source_file: str, metrics: GenerationMetrics) -> None: ...
@@ -1,8 +1,12 @@
+import hashlib
+import json
 import os
+import unicodedata
 from enum import Enum
 from typing import ClassVar, Literal
 
 from pydantic import BaseModel, Field, field_validator
+from pydantic_ai.usage import RunUsage
 
 
 class DifficultyLevel(str, Enum):
@@ -68,6 +72,53 @@ class MultipleChoiceQuestion(BaseModel):
             )
         return correct_answer
 
+    def content_hash(self) -> str:
+        """Stable identity of the question's content, used to deduplicate loads.
+
+        Covers the question text, options and correct answer after Unicode,
+        whitespace and case normalisation. The explanation and difficulty are
+        treated as mutable attributes of the same question.
+        """
+        content = {
+            "question": _normalize_text(self.question),
+            "options": [[o.label, _normalize_text(o.text)] for o in self.options],
+            "correct_answer": self.correct_answer,
+        }
+        data = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).split()).casefold()
+
+
+class AzureDeployment(BaseModel):
+    endpoint: str = Field(description="Azure OpenAI endpoint URL")
+
+    deployment_name: str = Field(description="Azure OpenAI deployment name")
+
+    api_key: str | None = Field(
+        default=None, description="API key; defaults to the config's azure_api_key"
+    )
+
+    api_version: str | None = Field(
+        default=None, description="API version; defaults to the config's api_version"
+    )
+
+    weight: float = Field(
+        default=1.0,
+        gt=0,
+        description="Relative share of traffic, e.g. in proportion to quota",
+    )
+
+    requests_per_minute: int | None = Field(
+        default=None, ge=1, description="Client-side request rate limit"
+    )
+
+    tokens_per_minute: int | None = Field(
+        default=None, ge=1, description="Client-side token rate limit"
+    )
+
 
 class QuizConfig(BaseModel):
     num_questions: int = Field(
@@ -88,11 +139,115 @@ class QuizConfig(BaseModel):
         description="Optional specific topic to focus on within the content",
     )
 
+    chunk_token_budget: int = Field(
+        default=6000,
+        ge=256,
+        description="Approximate tokens of content sent per generation call",
+    )
+
+    chunk_overlap_tokens: int = Field(
+        default=200,
+        ge=0,
+        description="Approximate tokens shared between consecutive chunks",
+    )
+
+    max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum generation calls in flight for one document",
+    )
+
+    extraction_workers: int | None = Field(
+        default=None,
+        ge=1,
+        description="Processes used to extract text from large PDFs "
+        "(default: one per CPU)",
+    )
+
+    docx_streaming: bool = Field(
+        default=False,
+        description="Parse DOCX files a paragraph at a time in constant memory, "
+        "including table cells and text boxes that python-docx leaves out",
+    )
+
+    requests_per_minute: int | None = Field(
+        default=None,
+        ge=1,
+        description="Client-side request rate limit for each deployment",
+    )
+
+    tokens_per_minute: int | None = Field(
+        default=None,
+        ge=1,
+        description="Client-side token rate limit for each deployment",
+    )
+
+    max_retries: int = Field(
+        default=5,
+        ge=0,
+        description="Retries for throttled or transiently failing model calls",
+    )
+
+    prompt_layout: Literal["inline", "cacheable"] = Field(
+        default="inline",
+        description="'cacheable' keeps the system prompt and content as a stable "
+        "prefix and puts per-run options last, for provider prompt caching",
+    )
+
+    cache_directory: str | None = Field(
+        default=os.environ.get("QUIZLING_CACHE_DIR") or None,
+        description="Directory for the on-disk response and extraction caches; "
+        "disabled when unset",
+    )
+
+    cache_refresh: bool = Field(
+        default=False,
+        description="Ignore cached responses but store the new ones",
+    )
+
+    cache_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=1,
+        description="Compressed size at which least recently used entries are evicted",
+    )
+
+    cache_max_age_days: float = Field(
+        default=30, gt=0, description="Age after which cached responses expire"
+    )
+
+    extraction_cache_max_bytes: int = Field(
+        default=1024 * 1024 * 1024,
+        ge=1,
+        description="Compressed size at which the least recently used extracted "
+        "documents are evicted",
+    )
+
     output_directory: str = Field(
         default="out",
         description="Directory where quiz JSON files will be written",
     )
 
+    output_format: Literal["json", "jsonl"] = Field(
+        default="json",
+        description="One JSON file per question, or rotating JSON Lines files",
+    )
+
+    output_compression: Literal["none", "gzip", "zstd"] = Field(
+        default="none", description="Compression for JSON Lines output"
+    )
+
+    output_rotate_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        ge=1,
+        description="Start a new JSON Lines file once the current one reaches this size",
+    )
+
+    output_batch_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Questions buffered per JSON Lines append and fsync",
+    )
+
     azure_endpoint: str = Field(
         default=os.environ["AZURE_OPENAI_ENDPOINT"],
         description="Azure OpenAI endpoint URL",
@@ -112,6 +267,102 @@ class QuizConfig(BaseModel):
         description="Azure OpenAI API version",
     )
 
+    deployments: list[AzureDeployment] = Field(
+        default_factory=list,
+        description="Pool of deployments to balance calls across; "
+        "uses the single azure_* deployment when empty",
+    )
+
+    def deployment_pool(self) -> list[AzureDeployment]:
+        """The configured deployments with credentials and limits filled in."""
+        if not self.deployments:
+            return [
+                AzureDeployment(
+                    endpoint=self.azure_endpoint,
+                    deployment_name=self.azure_deployment_name,
+                    api_key=self.azure_api_key,
+                    api_version=self.api_version,
+                    requests_per_minute=self.requests_per_minute,
+                    tokens_per_minute=self.tokens_per_minute,
+                )
+            ]
+        return [
+            deployment.model_copy(
+                update={
+                    "api_key": deployment.api_key or self.azure_api_key,
+                    "api_version": deployment.api_version or self.api_version,
+                    "requests_per_minute": deployment.requests_per_minute
+                    or self.requests_per_minute,
+                    "tokens_per_minute": deployment.tokens_per_minute
+                    or self.tokens_per_minute,
+                }
+            )
+            for deployment in self.deployments
+        ]
+
+
+class GenerationMetrics(BaseModel):
+    """Where the time and tokens of one generation run went.
+
+    Durations are in seconds. ``requests`` counts calls made through the
+    deployment pool, retries included, and ``request_seconds`` times each one.
+    Within a call pydantic-ai may ask the model again for output that did not
+    validate; those re-requests are counted in ``validation_failures`` only.
+    """
+
+    questions: int = 0
+    read_seconds: float = 0.0
+    total_seconds: float = 0.0
+    prompt_chars: int = 0
+    requests: int = 0
+    retries: int = 0
+    request_seconds: list[float] = Field(default_factory=list)
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    validation_failures: int = 0
+    cached_responses: int = 0
+
+    def record_usage(self, usage: RunUsage) -> None:
+        self.input_tokens += usage.input_tokens
+        self.cached_input_tokens += usage.cache_read_tokens
+        self.output_tokens += usage.output_tokens
+        # Each request after the first within a run is pydantic-ai asking the
+        # model to fix output that failed validation.
+        self.validation_failures += usage.requests - 1
+
+    @classmethod
+    def combine(cls, runs: list["GenerationMetrics"]) -> "GenerationMetrics":
+        """Sum several runs, e.g. every document in a batch."""
+        total = cls()
+        for run in runs:
+            for name in cls.model_fields:
+                setattr(total, name, getattr(total, name) + getattr(run, name))
+        return total
+
+    def latency(self, fraction: float) -> float:
+        """Request latency at ``fraction`` (0.5 for the median) of requests."""
+        if not self.request_seconds:
+            return 0.0
+        ordered = sorted(self.request_seconds)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary_lines(self) -> list[str]:
+        cached_share = (
+            self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+        )
+        return [
+            f"Questions: {self.questions} in {self.total_seconds:.2f}s "
+            f"(reading {self.read_seconds:.2f}s)",
+            f"Requests: {self.requests} ({self.retries} retries, "
+            f"{self.validation_failures} validation failures, "
+            f"{self.cached_responses} served from cache)",
+            f"Latency: p50 {self.latency(0.5):.2f}s, p95 {self.latency(0.95):.2f}s, "
+            f"max {max(self.request_seconds, default=0.0):.2f}s",
+            f"Tokens: {self.input_tokens:,} input ({cached_share:.0%} cached), "
+            f"{self.output_tokens:,} output; prompts {self.prompt_chars:,} chars",
+        ]
+
 
 class QuizResult(BaseModel):
     questions: list[MultipleChoiceQuestion] = Field(
@@ -122,6 +373,11 @@ class QuizResult(BaseModel):
 
     config: QuizConfig = Field(description="Configuration used for generation")
 
+    metrics: GenerationMetrics = Field(
+        default_factory=GenerationMetrics,
+        description="Timings, token usage and retries of the generation run",
+    )
+
     @property
     def num_questions(self) -> int:
         return len(self.questions)
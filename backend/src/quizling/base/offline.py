@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+import httpx
+import openai
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import (
+    AgentInfo,
+    DeltaToolCall,
+    DeltaToolCalls,
+    FunctionModel,
+)
+
+from quizling.base.models import AzureDeployment
+
+NUM_QUESTIONS = re.compile(r"exactly (\d+) multiple choice questions")
+DIFFICULTY = re.compile(r"at (easy|medium|hard) difficulty")
+CONTENT = re.compile(r"Content:\s*(.+?)\s*$", re.MULTILINE)
+DEFAULT_NUM_QUESTIONS = 5
+
+
+@dataclass
+class OfflineBackend:
+    """Model factory for ``QuizGenerator`` that never leaves the process.
+
+    Each model answers with valid questions derived from the prompt, after
+    ``latency`` seconds (plus or minus up to ``jitter``) and a further
+    ``seconds_per_question`` per question, streamed one question at a time
+    when the caller streams. A ``throttle_rate`` share of requests fail with a
+    429 carrying ``retry_after``, and an ``error_rate`` share with a 500. The
+    same ``seed`` gives the same sequence of delays and failures.
+    """
+
+    latency: float = 0.5
+    jitter: float = 0.1
+    seconds_per_question: float = 0.05
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    retry_after: float = 1.0
+    seed: int | None = None
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+
+    def __call__(self, deployment: AzureDeployment) -> FunctionModel:
+        model_name = f"offline:{deployment.deployment_name}"
+
+        async def respond(
+            messages: list[ModelMessage], info: AgentInfo
+        ) -> ModelResponse:
+            questions = await self._start(messages, model_name)
+            await asyncio.sleep(len(questions) * self.seconds_per_question)
+            return ModelResponse(
+                parts=[ToolCallPart(info.output_tools[0].name, {"response": questions})]
+            )
+
+        async def stream(
+            messages: list[ModelMessage], info: AgentInfo
+        ) -> AsyncIterator[DeltaToolCalls]:
+            questions = await self._start(messages, model_name)
+            yield {
+                0: DeltaToolCall(
+                    name=info.output_tools[0].name, json_args='{"response": ['
+                )
+            }
+            for i, question in enumerate(questions):
+                await asyncio.sleep(self.seconds_per_question)
+                separator = ", " if i else ""
+                yield {0: DeltaToolCall(json_args=separator + json.dumps(question))}
+            yield {0: DeltaToolCall(json_args="]}")}
+
+        return FunctionModel(respond, stream_function=stream, model_name=model_name)
+
+    async def _start(self, messages: list[ModelMessage], model_name: str) -> list[dict]:
+        """Wait out the time to first token, then fail or plan the questions."""
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        roll = self._random.random()
+        await asyncio.sleep(max(0.0, delay))
+
+        if roll < self.throttle_rate:
+            raise _http_error(429, model_name, {"retry-after": str(self.retry_after)})
+        if roll < self.throttle_rate + self.error_rate:
+            raise _http_error(500, model_name)
+        return make_questions(_prompt_text(messages))
+
+
+def _prompt_text(messages: list[ModelMessage]) -> str:
+    return "\n".join(
+        part.content
+        for message in messages
+        for part in message.parts
+        if isinstance(getattr(part, "content", None), str)
+    )
+
+
+def _http_error(
+    status_code: int, model_name: str, headers: dict[str, str] | None = None
+) -> ModelHTTPError:
+    """A ModelHTTPError chained to an OpenAI status error, as pydantic-ai raises it."""
+    response = httpx.Response(
+        status_code,
+        headers=headers,
+        request=httpx.Request("POST", "https://offline.invalid/chat/completions"),
+    )
+    cause = openai.APIStatusError(
+        f"Offline model returned {status_code}", response=response, body=None
+    )
+    error = ModelHTTPError(status_code=status_code, model_name=model_name)
+    error.__cause__ = cause
+    return error
+
+
+def make_questions(prompt: str) -> list[dict]:
+    """Valid questions for ``prompt``, in the count and difficulty it asks for."""
+    count = (
+        int(match.group(1))
+        if (match := NUM_QUESTIONS.search(prompt))
+        else DEFAULT_NUM_QUESTIONS
+    )
+    difficulty = match.group(1) if (match := DIFFICULTY.search(prompt)) else "medium"
+    topic = match.group(1)[:60] if (match := CONTENT.search(prompt)) else "the text"
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+
+    questions = []
+    for i in range(count):
+        answer = "ABCD"[i % 4]
+        questions.append(
+            {
+                "question": f"Question {i + 1} ({digest}) about: {topic}",
+                "options": [
+                    {"label": label, "text": f"Option {label} for question {i + 1}"}
+                    for label in "ABCD"
+                ],
+                "correct_answer": answer,
+                "explanation": f"Option {answer} is correct.",
+                "difficulty": difficulty,
+            }
+        )
+    return questions
@@ -1,10 +1,26 @@
+import asyncio
 import json
+import os
+import re
+import threading
 import uuid
+from collections.abc import AsyncIterable
+from itertools import batched
 
 
 from pathlib import Path
+from quizling.base.jsonl import JSONL_SUFFIXES, compress
 from quizling.base.models import MultipleChoiceQuestion, QuizResult
 
+JSONL_PREFIX = "questions-"
+
+# Documents processed concurrently each have a writer, usually for the same
+# directory. Appends go through one lock, so batches never interleave within a
+# part, and the part being appended to is remembered per directory and suffix
+# rather than found by listing the directory on every batch.
+_jsonl_lock = threading.Lock()
+_jsonl_parts: dict[tuple[Path, str], int] = {}
+
 
 class QuizWriterError(Exception):
     pass
@@ -18,10 +34,7 @@ class QuizWriter:
         self.quiz_result: QuizResult = quiz_result
         self.output_path: Path = Path(quiz_result.config.output_directory)
 
-    def write(self) -> list[Path]:
-        if not self.quiz_result.questions:
-            return []
-
+    def _create_output_directory(self) -> None:
         try:
             self.output_path.mkdir(parents=True, exist_ok=True)
         except OSError as e:
@@ -29,6 +42,15 @@ class QuizWriter:
                 f"Failed to create output directory '{self.output_path}': {e}"
             ) from e
 
+    def write(self) -> list[Path]:
+        if not self.quiz_result.questions:
+            return []
+
+        self._create_output_directory()
+
+        if self.quiz_result.config.output_format == "jsonl":
+            return self._write_jsonl(self.quiz_result.questions)
+
         written_files: list[Path] = []
 
         for idx, question in enumerate(self.quiz_result.questions, start=1):
@@ -42,6 +64,50 @@ class QuizWriter:
 
         return written_files
 
+    async def write_stream(
+        self, questions: AsyncIterable[MultipleChoiceQuestion]
+    ) -> list[Path]:
+        """Write questions as they arrive, appending them to ``quiz_result``.
+
+        JSON output writes each question's file as soon as it is received.
+        JSON Lines output appends every ``output_batch_size`` questions and
+        whatever remains when the stream ends.
+        """
+        config = self.quiz_result.config
+        written_files: list[Path] = []
+        batch: list[MultipleChoiceQuestion] = []
+
+        async def flush() -> None:
+            for file_path in await asyncio.to_thread(self._write_jsonl, batch):
+                if file_path not in written_files:
+                    written_files.append(file_path)
+            batch.clear()
+
+        async for question in questions:
+            if not self.quiz_result.questions:
+                self._create_output_directory()
+            self.quiz_result.questions.append(question)
+
+            if config.output_format == "jsonl":
+                batch.append(question)
+                if len(batch) >= config.output_batch_size:
+                    await flush()
+                continue
+
+            try:
+                file_path = await asyncio.to_thread(self._write_question, question)
+            except Exception as e:
+                raise QuizWriterError(
+                    f"Failed to write question {len(self.quiz_result.questions)} "
+                    f"to file: {e}"
+                ) from e
+            written_files.append(file_path)
+
+        if batch:
+            await flush()
+
+        return written_files
+
     def _write_question(self, question: MultipleChoiceQuestion) -> Path:
         filename = f"{uuid.uuid4()}.json"
         file_path = self.output_path / filename
@@ -60,3 +126,72 @@ class QuizWriter:
             raise QuizWriterError(
                 f"Unexpected error writing question to '{file_path}': {e}"
             ) from e
+
+    def _write_jsonl(self, questions: list[MultipleChoiceQuestion]) -> list[Path]:
+        """Append questions to rotating JSON Lines files; returns the files touched.
+
+        Each batch is encoded, compressed as a standalone gzip member or zstd
+        frame, appended and fsync'd, so a crash loses at most the batch in
+        flight and earlier batches stay readable.
+        """
+        config = self.quiz_result.config
+        suffix = JSONL_SUFFIXES[config.output_compression]
+        written_files: list[Path] = []
+
+        for batch in batched(questions, config.output_batch_size):
+            lines = "".join(
+                json.dumps(q.model_dump(mode="json"), ensure_ascii=False) + "\n"
+                for q in batch
+            )
+            try:
+                data = compress(lines.encode("utf-8"), config.output_compression)
+            except ImportError as e:
+                raise QuizWriterError(f"Failed to compress questions: {e}") from e
+
+            file_path = self._append_jsonl(data, suffix)
+            if file_path not in written_files:
+                written_files.append(file_path)
+
+        return written_files
+
+    def _append_jsonl(self, data: bytes, suffix: str) -> Path:
+        """Append one encoded batch to the current part, rotating once it is full."""
+        key = (self.output_path.absolute(), suffix)
+        with _jsonl_lock:
+            part = _jsonl_parts.get(key) or self._latest_jsonl_part(suffix)
+            file_path = self.output_path / f"{JSONL_PREFIX}{part:06d}{suffix}"
+            try:
+                fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    view = memoryview(data)
+                    while view:
+                        view = view[os.write(fd, view) :]
+                    os.fsync(fd)
+                    size = os.fstat(fd).st_size
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                raise QuizWriterError(
+                    f"Failed to append to file '{file_path}': {e}"
+                ) from e
+
+            rotate = size >= self.quiz_result.config.output_rotate_bytes
+            _jsonl_parts[key] = part + 1 if rotate else part
+        return file_path
+
+    def _latest_jsonl_part(self, suffix: str) -> int:
+        """Number of the part to append to, rotating past one that is full."""
+        pattern = re.compile(rf"{JSONL_PREFIX}(\d+){re.escape(suffix)}")
+        parts = [
+            int(match.group(1))
+            for path in self.output_path.glob(f"{JSONL_PREFIX}*{suffix}")
+            if (match := pattern.fullmatch(path.name))
+        ]
+        if not parts:
+            return 1
+
+        part = max(parts)
+        latest = self.output_path / f"{JSONL_PREFIX}{part:06d}{suffix}"
+        if latest.stat().st_size >= self.quiz_result.config.output_rotate_bytes:
+            part += 1
+        return part
@@ -0,0 +1,143 @@
+import asyncio
+import email.utils
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from openai import APIConnectionError
+from pydantic_ai.exceptions import ModelHTTPError
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# Azure enforces per-minute quotas over short windows, so only allow a burst of
+# roughly ten seconds' worth of quota at once.
+BURST_SECONDS = 10.0
+
+
+class TokenBucket:
+    """Continuously refilling budget of ``per_minute`` units.
+
+    ``reserve`` deducts immediately and returns how long the caller must wait,
+    so concurrent callers are served in arrival order without holding a lock.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        burst_seconds: float = BURST_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        self._refill()
+        # A request larger than the bucket would otherwise never be admitted.
+        self.tokens -= min(amount, self.capacity)
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self, amount: float) -> None:
+        """Return (or, if negative, charge) units once the real cost is known."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds the server asked us to wait, from ``retry-after(-ms)`` headers."""
+    response = getattr(error, "response", None) or getattr(
+        error.__cause__, "response", None
+    )
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    if value := headers.get("retry-after-ms"):
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    if value := headers.get("retry-after"):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, ModelHTTPError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, APIConnectionError)
+
+
+class RateLimiter:
+    """Client-side RPM/TPM scheduler for one deployment's quota.
+
+    Each call waits for one request and its estimated tokens from the buckets.
+    Retries are left to ``DeploymentPool``, which calls ``pause`` on a 429 so
+    that every caller sharing the limiter waits, not just the throttled one.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+    ):
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every call through this limiter for ``seconds``."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def _acquire(self, estimated_tokens: int) -> None:
+        delay = max(0.0, self._paused_until - time.monotonic())
+        if self.requests:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens:
+            delay = max(delay, self.tokens.reserve(estimated_tokens))
+        if delay:
+            await asyncio.sleep(delay)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        if self.tokens:
+            self.tokens.refund(estimated_tokens - actual_tokens)
+
+    async def run(
+        self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0
+    ) -> T:
+        await self._acquire(estimated_tokens)
+        return await call()
+
+
+_limiters: dict[tuple, RateLimiter] = {}
+
+
+def shared_rate_limiter(
+    key: tuple,
+    requests_per_minute: int | None = None,
+    tokens_per_minute: int | None = None,
+) -> RateLimiter:
+    """Process-wide limiter for ``key`` so every generator shares one quota."""
+    key = (*key, requests_per_minute, tokens_per_minute)
+    if key not in _limiters:
+        _limiters[key] = RateLimiter(requests_per_minute, tokens_per_minute)
+    return _limiters[key]
@@ -3,10 +3,16 @@
 Loads questions into MongoDB. Includes methods for search and retrieval.
 """
 
+from quizling.storage.async_db import AsyncMongoDBClient
 from quizling.storage.db import MongoDBClient
 from quizling.storage.loader import (
     load_question_from_file,
     load_questions_from_directory,
 )
 
-__all__ = ["MongoDBClient", "load_question_from_file", "load_questions_from_directory"]
+__all__ = [
+    "AsyncMongoDBClient",
+    "MongoDBClient",
+    "load_question_from_file",
+    "load_questions_from_directory",
+]
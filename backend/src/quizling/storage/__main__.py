@@ -6,7 +6,7 @@ from pathlib import Path
 
 from quizling.storage import MongoDBClient
 from quizling.storage.db import MongoDBConnectionError
-from quizling.storage.loader import load_questions_from_directory
+from quizling.storage.loader import DEFAULT_BATCH_SIZE, stream_questions_to_db
 
 
 def main() -> None:
@@ -25,8 +25,7 @@ def main() -> None:
     parser.add_argument(
         "--pattern",
         type=str,
-        default="*.json",
-        help="Glob pattern for JSON files (default: *.json)",
+        help="Glob pattern for question files (default: *.json and *.jsonl[.gz|.zst])",
     )
 
     parser.add_argument(
@@ -53,6 +52,36 @@ def main() -> None:
         help="Create database indexes for better performance",
     )
 
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Questions per insert_many call (default: {DEFAULT_BATCH_SIZE})",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parser processes (default: CPU count; 0 parses in-process)",
+    )
+
+    parser.add_argument(
+        "--mode",
+        choices=["insert", "upsert"],
+        default="upsert",
+        help="upsert refreshes questions already stored (matched by content "
+        "hash); insert only adds new ones and skips duplicates. Either way, "
+        "questions stored without a content hash are hashed first "
+        "(default: upsert)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files already loaded with the same size and mtime, and "
+        "resume an interrupted load",
+    )
+
     args = parser.parse_args()
 
     directory = Path(args.directory)
@@ -64,15 +93,6 @@ def main() -> None:
         print(f"Error: Not a directory: {directory}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"\nLoading questions from: {directory.absolute()}")
-    questions = load_questions_from_directory(directory, args.pattern)
-
-    if not questions:
-        print("\nNo questions loaded. Exiting.")
-        sys.exit(1)
-
-    print(f"\nSuccessfully loaded {len(questions)} questions from JSON files")
-
     print("\nConnecting to MongoDB...")
     try:
         with MongoDBClient(
@@ -82,11 +102,33 @@ def main() -> None:
 
             if args.clear:
                 count = db_client.delete_all_questions()
+                db_client.clear_ingested_files()
                 print(f"\n  Cleared {count} existing questions")
 
-            print(f"\nInserting {len(questions)} questions into MongoDB...")
-            inserted_ids = db_client.insert_questions(questions)
-            print(f"  ✓ Successfully inserted {len(inserted_ids)} questions")
+            # Upserts match on content_hash, and inserts rely on its uniqueness to
+            # reject questions that are already loaded. Questions loaded before
+            # hashing are hashed first, or both modes would load them again.
+            db_client.create_content_hash_index()
+            backfilled = db_client.backfill_content_hashes()
+            if backfilled:
+                print(f"  Added content hashes to {backfilled} stored questions")
+
+            print(f"\nLoading questions from: {directory.absolute()}")
+            stats = stream_questions_to_db(
+                db_client,
+                directory,
+                args.pattern,
+                batch_size=args.batch_size,
+                workers=args.workers,
+                mode=args.mode,
+                incremental=args.incremental,
+            )
+            for line in stats.summary_lines():
+                print(f"  {line}")
+
+            if not stats.parsed and not stats.skipped:
+                print("\nNo questions loaded. Exiting.")
+                sys.exit(1)
 
             if args.create_indexes:
                 print("\nCreating database indexes...")
@@ -97,8 +139,7 @@ def main() -> None:
             print("\nSummary:")
             print(f"  Total questions in database: {total_count}")
 
-            for difficulty in ["easy", "medium", "hard"]:
-                count = len(db_client.get_questions_by_difficulty(difficulty))
+            for difficulty, count in db_client.count_by_difficulty().items():
                 print(f"  {difficulty.capitalize()}: {count}")
 
     except MongoDBConnectionError as e:
@@ -0,0 +1,163 @@
+import os
+from typing import Any
+
+from pymongo import ASCENDING, AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+
+from quizling.base.models import MultipleChoiceQuestion
+from quizling.storage.db import (
+    CONNECTION_ERRORS,
+    CONTENT_HASH_INDEX,
+    SearchMode,
+    build_facet_pipeline,
+    build_find_spec,
+    build_question_filter,
+    connection_error,
+    difficulty_counts,
+    document_to_question,
+    pool_options,
+)
+
+
+class AsyncMongoDBClient:
+    """Asyncio counterpart of MongoDBClient for use inside the event loop.
+
+    Construction does no I/O; call ``connect()`` (or use ``async with``) to verify
+    the server is reachable before serving requests.
+    """
+
+    def __init__(
+        self,
+        mongodb_uri: str | None = None,
+        database_name: str | None = None,
+        max_pool_size: int | None = None,
+        min_pool_size: int | None = None,
+        max_idle_time_ms: int | None = None,
+        wait_queue_timeout_ms: int | None = None,
+    ):
+        self.mongodb_uri = mongodb_uri or os.environ["MONGODB_URI"]
+        self.database_name = database_name or os.environ["MONGO_DATABASE"]
+        self.pool_options = pool_options(
+            max_pool_size=max_pool_size,
+            min_pool_size=min_pool_size,
+            max_idle_time_ms=max_idle_time_ms,
+            wait_queue_timeout_ms=wait_queue_timeout_ms,
+        )
+
+        try:
+            self.client: AsyncMongoClient = AsyncMongoClient(
+                self.mongodb_uri, serverSelectionTimeoutMS=5000, **self.pool_options
+            )
+        except CONNECTION_ERRORS as e:
+            raise connection_error(self.mongodb_uri, e) from e
+
+        self.db: AsyncDatabase = self.client[self.database_name]
+        self.questions: AsyncCollection = self.db["questions"]
+
+    async def connect(self) -> None:
+        try:
+            await self.client.server_info()
+        except CONNECTION_ERRORS as e:
+            raise connection_error(self.mongodb_uri, e) from e
+
+    async def close(self) -> None:
+        if hasattr(self, "client"):
+            await self.client.close()
+
+    async def __aenter__(self) -> "AsyncMongoDBClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def get_question(self, question_id: str) -> MultipleChoiceQuestion | None:
+        from bson import ObjectId
+
+        try:
+            doc = await self.questions.find_one({"_id": ObjectId(question_id)})
+            if doc:
+                return document_to_question(doc)
+            return None
+        except Exception:
+            return None
+
+    async def find_questions(
+        self,
+        difficulty: str | None = None,
+        search: str | None = None,
+        skip: int = 0,
+        limit: int | None = None,
+        sort: str | None = None,
+        after: tuple[Any, str] | None = None,
+        search_mode: SearchMode = "text",
+    ) -> list[MultipleChoiceQuestion]:
+        query, projection, sort_spec = build_find_spec(
+            difficulty, search, search_mode, sort, after
+        )
+        if projection:
+            cursor = self.questions.find(query, projection)
+        else:
+            cursor = self.questions.find(query)
+        if sort_spec:
+            cursor = cursor.sort(sort_spec)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+
+        return [document_to_question(doc) for doc in await cursor.to_list()]
+
+    async def get_questions_by_difficulty(
+        self, difficulty: str
+    ) -> list[MultipleChoiceQuestion]:
+        return await self.find_questions(difficulty=difficulty)
+
+    async def get_all_questions(
+        self, limit: int | None = None, skip: int = 0
+    ) -> list[MultipleChoiceQuestion]:
+        return await self.find_questions(skip=skip, limit=limit)
+
+    async def search_questions(
+        self, search_text: str, search_mode: SearchMode = "text"
+    ) -> list[MultipleChoiceQuestion]:
+        return await self.find_questions(search=search_text, search_mode=search_mode)
+
+    async def count_questions(
+        self,
+        difficulty: str | None = None,
+        search: str | None = None,
+        search_mode: SearchMode = "text",
+    ) -> int:
+        return await self.questions.count_documents(
+            build_question_filter(difficulty, search, search_mode)
+        )
+
+    async def facet_counts(
+        self,
+        field: str,
+        difficulty: str | None = None,
+        search: str | None = None,
+        search_mode: SearchMode = "text",
+    ) -> dict[str, int]:
+        query = build_question_filter(difficulty, search, search_mode)
+        cursor = await self.questions.aggregate(build_facet_pipeline(field, query))
+        return {str(doc["_id"]): doc["count"] for doc in await cursor.to_list()}
+
+    async def count_by_difficulty(
+        self, search: str | None = None, search_mode: SearchMode = "text"
+    ) -> dict[str, int]:
+        return difficulty_counts(
+            await self.facet_counts(
+                "difficulty", search=search, search_mode=search_mode
+            )
+        )
+
+    async def create_indexes(self) -> None:
+        await self.questions.create_index(
+            [("difficulty", ASCENDING), ("_id", ASCENDING)]
+        )
+        await self.questions.create_index([("question", ASCENDING), ("_id", ASCENDING)])
+        await self.questions.create_index([("question", "text")])
+        await self.questions.create_index(**CONTENT_HASH_INDEX)
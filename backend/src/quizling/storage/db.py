@@ -1,42 +1,285 @@
 import os
+import re
+from dataclasses import dataclass
+from typing import Any, Literal
 
-from pymongo import MongoClient, errors
+from pydantic import ValidationError
+from pymongo import ASCENDING, MongoClient, ReplaceOne, UpdateOne, errors
 from pymongo.collection import Collection
 from pymongo.database import Database
 
-from quizling.base.models import MultipleChoiceQuestion
+from quizling.base.models import DifficultyLevel, MultipleChoiceQuestion
+
+DEFAULT_MAX_POOL_SIZE = 100
+DEFAULT_MIN_POOL_SIZE = 0
+DEFAULT_MAX_IDLE_TIME_MS = 300_000
+DEFAULT_WAIT_QUEUE_TIMEOUT_MS = 10_000
+BACKFILL_BATCH_SIZE = 1000
 
 
 class MongoDBConnectionError(Exception):
     pass
 
 
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def pool_options(
+    max_pool_size: int | None = None,
+    min_pool_size: int | None = None,
+    max_idle_time_ms: int | None = None,
+    wait_queue_timeout_ms: int | None = None,
+) -> dict[str, int]:
+    """Resolve connection pool settings, falling back to MONGO_* env vars."""
+    return {
+        "maxPoolSize": (
+            max_pool_size
+            if max_pool_size is not None
+            else _env_int("MONGO_MAX_POOL_SIZE", DEFAULT_MAX_POOL_SIZE)
+        ),
+        "minPoolSize": (
+            min_pool_size
+            if min_pool_size is not None
+            else _env_int("MONGO_MIN_POOL_SIZE", DEFAULT_MIN_POOL_SIZE)
+        ),
+        "maxIdleTimeMS": (
+            max_idle_time_ms
+            if max_idle_time_ms is not None
+            else _env_int("MONGO_MAX_IDLE_TIME_MS", DEFAULT_MAX_IDLE_TIME_MS)
+        ),
+        "waitQueueTimeoutMS": (
+            wait_queue_timeout_ms
+            if wait_queue_timeout_ms is not None
+            else _env_int("MONGO_WAIT_QUEUE_TIMEOUT_MS", DEFAULT_WAIT_QUEUE_TIMEOUT_MS)
+        ),
+    }
+
+
+CONNECTION_ERRORS = (
+    errors.ServerSelectionTimeoutError,
+    errors.ConfigurationError,
+    errors.OperationFailure,
+)
+
+
+def connection_error(
+    mongodb_uri: str, error: errors.PyMongoError
+) -> MongoDBConnectionError:
+    """Translate a pymongo connection failure into MongoDBConnectionError."""
+    if isinstance(error, errors.ConfigurationError):
+        return MongoDBConnectionError(f"Invalid MongoDB configuration: {error}")
+    if isinstance(error, errors.OperationFailure):
+        return MongoDBConnectionError(
+            f"Authentication failed for MongoDB at {mongodb_uri}: {error}"
+        )
+    return MongoDBConnectionError(
+        f"Failed to connect to MongoDB at {mongodb_uri}: {error}"
+    )
+
+
+SearchMode = Literal["text", "substring"]
+
+TEXT_SCORE = {"$meta": "textScore"}
+
+
+def build_question_filter(
+    difficulty: str | None = None,
+    search: str | None = None,
+    search_mode: SearchMode = "text",
+) -> dict[str, Any]:
+    """Combine the supported question filters into a single MongoDB query.
+
+    ``text`` search uses the ``question`` text index. ``substring`` search is a
+    case-insensitive match on the literal input and cannot use an index.
+    """
+    query: dict[str, Any] = {}
+    if difficulty:
+        query["difficulty"] = difficulty
+    if search:
+        if search_mode == "text":
+            query["$text"] = {"$search": search}
+        else:
+            query["question"] = {"$regex": re.escape(search), "$options": "i"}
+    return query
+
+
+SORT_FIELDS: dict[str, str] = {
+    "id": "_id",
+    "question": "question",
+    "difficulty": "difficulty",
+}
+
+
+def build_sort(sort: str) -> list[tuple[str, int]]:
+    """Sort spec for a supported sort key, always tie-broken on ``_id``."""
+    field = SORT_FIELDS[sort]
+    if field == "_id":
+        return [("_id", ASCENDING)]
+    return [(field, ASCENDING), ("_id", ASCENDING)]
+
+
+def build_keyset_filter(sort: str, after: tuple[Any, str]) -> dict[str, Any]:
+    """Filter selecting documents strictly after ``after`` in ``build_sort`` order.
+
+    ``after`` is the (sort value, id) pair of the last document already seen.
+    """
+    from bson import ObjectId
+
+    value, last_id = after
+    last_oid = ObjectId(last_id)
+    field = SORT_FIELDS[sort]
+    if field == "_id":
+        return {"_id": {"$gt": last_oid}}
+    return {
+        "$or": [
+            {field: {"$gt": value}},
+            {field: value, "_id": {"$gt": last_oid}},
+        ]
+    }
+
+
+def build_find_spec(
+    difficulty: str | None = None,
+    search: str | None = None,
+    search_mode: SearchMode = "text",
+    sort: str | None = None,
+    after: tuple[Any, str] | None = None,
+) -> tuple[dict[str, Any], dict[str, Any] | None, list[tuple[str, Any]] | None]:
+    """Build the (filter, projection, sort) triple for a question query.
+
+    Text searches project and sort by relevance score unless a keyset position
+    is given, since the score cannot be used as a seek key.
+    """
+    query = build_question_filter(difficulty, search, search_mode)
+    if after is not None:
+        keyset = build_keyset_filter(sort or "id", after)
+        query = {"$and": [query, keyset]} if query else keyset
+
+    projection = None
+    sort_spec: list[tuple[str, Any]] | None = None
+    if search and search_mode == "text":
+        projection = {"score": TEXT_SCORE}
+        if after is None:
+            sort_spec = [("score", TEXT_SCORE), ("_id", ASCENDING)]
+    if sort_spec is None and (sort is not None or after is not None):
+        sort_spec = build_sort(sort or "id")
+
+    return query, projection, sort_spec
+
+
+FACET_FIELDS = frozenset({"difficulty", "correct_answer"})
+
+
+def build_facet_pipeline(field: str, query: dict[str, Any]) -> list[dict[str, Any]]:
+    """Aggregation pipeline counting documents per distinct value of ``field``."""
+    if field not in FACET_FIELDS:
+        supported = ", ".join(sorted(FACET_FIELDS))
+        raise ValueError(f"Unsupported facet field: {field}. Supported: {supported}")
+
+    pipeline: list[dict[str, Any]] = [{"$match": query}] if query else []
+    pipeline.append({"$group": {"_id": f"${field}", "count": {"$sum": 1}}})
+    return pipeline
+
+
+def difficulty_counts(counts: dict[str, int]) -> dict[str, int]:
+    """Fill in zero counts so every difficulty level is always present."""
+    return {level.value: counts.get(level.value, 0) for level in DifficultyLevel}
+
+
+def document_to_question(doc: dict) -> MultipleChoiceQuestion:
+    """Convert a raw questions-collection document into a model."""
+    doc["id"] = str(doc.pop("_id"))
+    return MultipleChoiceQuestion(**doc)
+
+
+def question_to_document(question: MultipleChoiceQuestion) -> dict[str, Any]:
+    """Convert a model into an insert-ready document keyed by its content hash."""
+    doc = question.model_dump(mode="json", exclude={"id"})
+    doc["content_hash"] = question.content_hash()
+    return doc
+
+
+# Partial so documents stored before content hashing cannot collide on null.
+CONTENT_HASH_INDEX = {
+    "keys": [("content_hash", ASCENDING)],
+    "unique": True,
+    "partialFilterExpression": {"content_hash": {"$exists": True}},
+}
+
+
+@dataclass
+class UpsertCounts:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
+def upsert_operations(documents: list[dict[str, Any]]) -> list[UpdateOne]:
+    return [
+        UpdateOne({"content_hash": doc["content_hash"]}, {"$set": doc}, upsert=True)
+        for doc in documents
+    ]
+
+
+def backfill_operations(documents: list[dict[str, Any]]) -> list[UpdateOne]:
+    """Set content_hash on stored documents that predate it.
+
+    Documents that no longer validate as questions are left without a hash.
+    """
+    operations = []
+    for doc in documents:
+        try:
+            content_hash = document_to_question(dict(doc)).content_hash()
+        except ValidationError:
+            continue
+        operations.append(
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"content_hash": content_hash}})
+        )
+    return operations
+
+
+def upsert_counts(result: dict[str, Any]) -> UpsertCounts:
+    """Build counts from a bulk_write result document (or BulkWriteError details)."""
+    return UpsertCounts(
+        inserted=result["nUpserted"],
+        updated=result["nModified"],
+        unchanged=result["nMatched"] - result["nModified"],
+    )
+
+
 class MongoDBClient:
     def __init__(
-        self, mongodb_uri: str | None = None, database_name: str | None = None
+        self,
+        mongodb_uri: str | None = None,
+        database_name: str | None = None,
+        max_pool_size: int | None = None,
+        min_pool_size: int | None = None,
+        max_idle_time_ms: int | None = None,
+        wait_queue_timeout_ms: int | None = None,
     ):
         self.mongodb_uri = mongodb_uri or os.environ["MONGODB_URI"]
         self.database_name = database_name or os.environ["MONGO_DATABASE"]
+        self.pool_options = pool_options(
+            max_pool_size=max_pool_size,
+            min_pool_size=min_pool_size,
+            max_idle_time_ms=max_idle_time_ms,
+            wait_queue_timeout_ms=wait_queue_timeout_ms,
+        )
 
         try:
             self.client: MongoClient = MongoClient(
-                self.mongodb_uri, serverSelectionTimeoutMS=5000
+                self.mongodb_uri, serverSelectionTimeoutMS=5000, **self.pool_options
             )
             # Test connection
             self.client.server_info()
-        except errors.ServerSelectionTimeoutError as e:
-            raise MongoDBConnectionError(
-                f"Failed to connect to MongoDB at {self.mongodb_uri}: {e}"
-            ) from e
-        except errors.ConfigurationError as e:
-            raise MongoDBConnectionError(f"Invalid MongoDB configuration: {e}") from e
-        except errors.OperationFailure as e:
-            raise MongoDBConnectionError(
-                f"Authentication failed for MongoDB at {self.mongodb_uri}: {e}"
-            ) from e
+        except CONNECTION_ERRORS as e:
+            raise connection_error(self.mongodb_uri, e) from e
 
         self.db: Database = self.client[self.database_name]
         self.questions: Collection = self.db["questions"]
+        self.ingested_files: Collection = self.db["ingested_files"]
 
     def close(self) -> None:
         if hasattr(self, "client"):
@@ -49,7 +292,7 @@ class MongoDBClient:
         self.close()
 
     def insert_question(self, question: MultipleChoiceQuestion) -> str:
-        question_dict = question.model_dump(exclude={"id"})
+        question_dict = question_to_document(question)
         result = self.questions.insert_one(question_dict)
         return str(result.inserted_id)
 
@@ -57,57 +300,156 @@ class MongoDBClient:
         if not questions:
             return []
 
-        question_dicts = [q.model_dump(exclude={"id"}) for q in questions]
+        question_dicts = [question_to_document(q) for q in questions]
         result = self.questions.insert_many(question_dicts)
         return [str(oid) for oid in result.inserted_ids]
 
+    def insert_documents(self, documents: list[dict[str, Any]]) -> int:
+        """Unordered bulk insert of prepared documents; returns how many landed.
+
+        A rejected document (e.g. a duplicate key) does not stop the rest of the
+        batch from being written.
+        """
+        if not documents:
+            return 0
+
+        try:
+            result = self.questions.insert_many(documents, ordered=False)
+        except errors.BulkWriteError as e:
+            return e.details["nInserted"]
+        return len(result.inserted_ids)
+
+    def upsert_documents(self, documents: list[dict[str, Any]]) -> UpsertCounts:
+        """Insert new documents and refresh changed ones, matched by content hash.
+
+        Documents identical to what is stored are matched but not modified, so a
+        reload of an unchanged directory produces no writes.
+        """
+        if not documents:
+            return UpsertCounts()
+
+        try:
+            result = self.questions.bulk_write(
+                upsert_operations(documents), ordered=False
+            )
+        except errors.BulkWriteError as e:
+            return upsert_counts(e.details)
+        return upsert_counts(result.bulk_api_result)
+
+    def backfill_content_hashes(self, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+        """Hash questions stored before content hashing; returns how many were set.
+
+        Upserts match on content_hash, so without this the first upsert into an
+        older collection would add a second copy of every question. A stored
+        duplicate of an already-hashed question is rejected by the unique index
+        and keeps no hash.
+        """
+        cursor = self.questions.find(
+            {"content_hash": {"$exists": False}},
+            {"question": 1, "options": 1, "correct_answer": 1, "difficulty": 1},
+            batch_size=batch_size,
+        )
+        backfilled = 0
+        batch: list[dict[str, Any]] = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                backfilled += self._backfill(batch)
+                batch = []
+        if batch:
+            backfilled += self._backfill(batch)
+        return backfilled
+
+    def _backfill(self, documents: list[dict[str, Any]]) -> int:
+        operations = backfill_operations(documents)
+        if not operations:
+            return 0
+
+        try:
+            result = self.questions.bulk_write(operations, ordered=False)
+        except errors.BulkWriteError as e:
+            return e.details["nModified"]
+        return result.modified_count
+
     def get_question(self, question_id: str) -> MultipleChoiceQuestion | None:
         from bson import ObjectId
 
         try:
             doc = self.questions.find_one({"_id": ObjectId(question_id)})
             if doc:
-                doc["id"] = str(doc.pop("_id"))
-                return MultipleChoiceQuestion(**doc)
+                return document_to_question(doc)
             return None
         except Exception:
             return None
 
+    def find_questions(
+        self,
+        difficulty: str | None = None,
+        search: str | None = None,
+        skip: int = 0,
+        limit: int | None = None,
+        sort: str | None = None,
+        after: tuple[Any, str] | None = None,
+        search_mode: SearchMode = "text",
+    ) -> list[MultipleChoiceQuestion]:
+        query, projection, sort_spec = build_find_spec(
+            difficulty, search, search_mode, sort, after
+        )
+        if projection:
+            cursor = self.questions.find(query, projection)
+        else:
+            cursor = self.questions.find(query)
+        if sort_spec:
+            cursor = cursor.sort(sort_spec)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+
+        return [document_to_question(doc) for doc in cursor]
+
     def get_questions_by_difficulty(
         self, difficulty: str
     ) -> list[MultipleChoiceQuestion]:
-        docs = self.questions.find({"difficulty": difficulty})
-        questions = []
-        for doc in docs:
-            doc["id"] = str(doc.pop("_id"))
-            questions.append(MultipleChoiceQuestion(**doc))
-        return questions
+        return self.find_questions(difficulty=difficulty)
 
     def get_all_questions(
         self, limit: int | None = None, skip: int = 0
     ) -> list[MultipleChoiceQuestion]:
-        cursor = self.questions.find().skip(skip)
-        if limit is not None:
-            cursor = cursor.limit(limit)
+        return self.find_questions(skip=skip, limit=limit)
 
-        questions = []
-        for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))
-            questions.append(MultipleChoiceQuestion(**doc))
-        return questions
+    def search_questions(
+        self, search_text: str, search_mode: SearchMode = "text"
+    ) -> list[MultipleChoiceQuestion]:
+        return self.find_questions(search=search_text, search_mode=search_mode)
 
-    def search_questions(self, search_text: str) -> list[MultipleChoiceQuestion]:
-        docs = self.questions.find(
-            {"question": {"$regex": search_text, "$options": "i"}}
+    def count_questions(
+        self,
+        difficulty: str | None = None,
+        search: str | None = None,
+        search_mode: SearchMode = "text",
+    ) -> int:
+        return self.questions.count_documents(
+            build_question_filter(difficulty, search, search_mode)
         )
-        questions = []
-        for doc in docs:
-            doc["id"] = str(doc.pop("_id"))
-            questions.append(MultipleChoiceQuestion(**doc))
-        return questions
 
-    def count_questions(self) -> int:
-        return self.questions.count_documents({})
+    def facet_counts(
+        self,
+        field: str,
+        difficulty: str | None = None,
+        search: str | None = None,
+        search_mode: SearchMode = "text",
+    ) -> dict[str, int]:
+        query = build_question_filter(difficulty, search, search_mode)
+        results = self.questions.aggregate(build_facet_pipeline(field, query))
+        return {str(doc["_id"]): doc["count"] for doc in results}
+
+    def count_by_difficulty(
+        self, search: str | None = None, search_mode: SearchMode = "text"
+    ) -> dict[str, int]:
+        return difficulty_counts(
+            self.facet_counts("difficulty", search=search, search_mode=search_mode)
+        )
 
     def delete_question(self, question_id: str) -> bool:
         from bson import ObjectId
@@ -122,6 +464,29 @@ class MongoDBClient:
         result = self.questions.delete_many({})
         return result.deleted_count
 
+    def get_ingested_files(self, paths: list[str]) -> dict[str, dict[str, Any]]:
+        """Manifest entries for ``paths`` that have already been loaded."""
+        cursor = self.ingested_files.find({"_id": {"$in": paths}})
+        return {doc["_id"]: doc for doc in cursor}
+
+    def record_ingested_files(self, entries: list[dict[str, Any]]) -> None:
+        if not entries:
+            return
+
+        self.ingested_files.bulk_write(
+            [ReplaceOne({"_id": e["_id"]}, e, upsert=True) for e in entries],
+            ordered=False,
+        )
+
+    def clear_ingested_files(self) -> int:
+        return self.ingested_files.delete_many({}).deleted_count
+
     def create_indexes(self) -> None:
-        self.questions.create_index("difficulty")
+        # Compound indexes serve both the equality filters and keyset pagination
+        self.questions.create_index([("difficulty", ASCENDING), ("_id", ASCENDING)])
+        self.questions.create_index([("question", ASCENDING), ("_id", ASCENDING)])
         self.questions.create_index([("question", "text")])
+        self.create_content_hash_index()
+
+    def create_content_hash_index(self) -> None:
+        self.questions.create_index(**CONTENT_HASH_INDEX)
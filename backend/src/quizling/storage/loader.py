@@ -1,8 +1,105 @@
+import hashlib
 import json
+import multiprocessing
+import os
 import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import batched
 from pathlib import Path
+from typing import Any, Literal, Protocol, TextIO
 
+from quizling.base.jsonl import is_jsonl, open_jsonl
 from quizling.base.models import MultipleChoiceQuestion
+from quizling.storage.db import UpsertCounts, question_to_document
+
+DEFAULT_BATCH_SIZE = 1000
+# JSON files, or lines of a JSON Lines file, handed to a worker per task; large
+# enough to amortise the IPC round trip.
+DEFAULT_CHUNK_SIZE = 256
+PROGRESS_INTERVAL = 0.5
+
+LoadMode = Literal["insert", "upsert"]
+
+
+class DocumentSink(Protocol):
+    def insert_documents(self, documents: list[dict[str, Any]]) -> int: ...
+
+    def upsert_documents(self, documents: list[dict[str, Any]]) -> UpsertCounts: ...
+
+    def get_ingested_files(self, paths: list[str]) -> dict[str, dict[str, Any]]: ...
+
+    def record_ingested_files(self, entries: list[dict[str, Any]]) -> None: ...
+
+
+@dataclass
+class ParseResult:
+    """One question read from ``path``.
+
+    A JSON Lines file produces one result per line, failures first; only the
+    last has ``final`` set, and it alone is recorded in the ingested-files
+    manifest once its batch is written.
+    """
+
+    path: str
+    document: dict[str, Any] | None = None
+    error: str | None = None
+    size: int = 0
+    mtime_ns: int = 0
+    sha256: str = ""
+    final: bool = True
+
+    def manifest_entry(self) -> dict[str, Any]:
+        return {
+            "_id": self.path,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "sha256": self.sha256,
+            "ingested_at": datetime.now(UTC),
+        }
+
+
+@dataclass
+class LoadStats:
+    files: int = 0
+    parsed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    rejected: int = 0
+    batches: int = 0
+    timings: dict[str, float] = field(
+        default_factory=lambda: {
+            "walk": 0.0,
+            "manifest": 0.0,
+            "parse": 0.0,
+            "write": 0.0,
+        }
+    )
+    elapsed: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    def summary_lines(self) -> list[str]:
+        lines = [
+            f"Files: {self.files} processed, {self.skipped} skipped as already loaded",
+            f"Questions: {self.parsed} parsed, {self.failed} failed",
+            f"Inserted: {self.inserted}, updated: {self.updated}, "
+            f"unchanged: {self.unchanged} in {self.batches} batches"
+            + (f" ({self.rejected} rejected by the server)" if self.rejected else ""),
+            f"Elapsed: {self.elapsed:.2f}s ({self.files_per_second:,.0f} files/s)",
+        ]
+        lines += [
+            f"  {stage}: {seconds:.2f}s" for stage, seconds in self.timings.items()
+        ]
+        return lines
 
 
 def load_question_from_file(file_path: Path) -> MultipleChoiceQuestion | None:
@@ -18,24 +115,455 @@ def load_question_from_file(file_path: Path) -> MultipleChoiceQuestion | None:
         return None
 
 
+def is_question_file(path: Path) -> bool:
+    return path.suffix == ".json" or is_jsonl(path)
+
+
+def iter_question_files(directory: Path, pattern: str | None = None) -> Iterator[Path]:
+    """Lazily yield question files without materialising the listing.
+
+    Without a ``pattern``, yields ``*.json`` files and JSON Lines files
+    (``*.jsonl``, ``*.jsonl.gz``, ``*.jsonl.zst``) in ``directory``.
+    """
+    paths = directory.glob(pattern) if pattern else directory.iterdir()
+    for path in paths:
+        if path.is_file() and (pattern or is_question_file(path)):
+            yield path
+
+
+def parse_question_file(path: str) -> ParseResult:
+    """Read and validate one file into an insert-ready document."""
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        question = MultipleChoiceQuestion.model_validate_json(data)
+    except (OSError, ValueError) as e:
+        return ParseResult(path, error=str(e))
+    return ParseResult(
+        path,
+        document=question_to_document(question),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+
+def parse_jsonl_lines(
+    path: str, first_line: int, lines: list[str]
+) -> list[ParseResult]:
+    """Validate a run of lines from a JSON Lines file, numbered from ``first_line``."""
+    results: list[ParseResult] = []
+    for lineno, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            question = MultipleChoiceQuestion.model_validate_json(line)
+        except ValueError as e:
+            results.append(ParseResult(path, error=f"line {lineno}: {e}", final=False))
+            continue
+        results.append(
+            ParseResult(path, document=question_to_document(question), final=False)
+        )
+    return results
+
+
+def parse_question_files(paths: list[str]) -> list[ParseResult]:
+    return [parse_question_file(path) for path in paths]
+
+
+def jsonl_sha256(path: Path) -> str:
+    """Hash of the decompressed lines, so a recompressed file counts as unchanged."""
+    digest = hashlib.sha256()
+    with open_jsonl(path) as f:
+        for line in f:
+            digest.update(line.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class JSONLFile:
+    """A JSON Lines file whose lines are being parsed across several tasks.
+
+    Results are passed through as tasks finish, except that the latest
+    question (or, failing that, the latest failure) is held back. Once the
+    whole file has been read and every task has finished, it is yielded last
+    with ``final`` set, so the manifest entry is recorded from a question that
+    gets written whenever the file has one, and only after all of them are.
+    """
+
+    path: str
+    size: int = 0
+    mtime_ns: int = 0
+    sha256: str = ""
+    pending: int = 0
+    read: bool = False
+    error: str | None = None
+    held: ParseResult | None = None
+
+    def collect(self, results: list[ParseResult]) -> Iterator[ParseResult]:
+        self.pending -= 1
+        for result in results:
+            if self.held is not None and (
+                result.document is not None or self.held.document is None
+            ):
+                yield self.held
+                self.held = result
+            elif self.held is None:
+                self.held = result
+            else:
+                yield result
+        if self.read and not self.pending:
+            yield from self._finish()
+
+    def _finish(self) -> Iterator[ParseResult]:
+        last = self.held
+        if self.error is not None or last is None:
+            if last is not None:
+                yield last
+            # A corrupt archive raises decoder-specific errors (e.g.
+            # zstandard.ZstdError); the file is reported as failed.
+            last = ParseResult(self.path, error=self.error or "no questions found")
+        last.size = self.size
+        last.mtime_ns = self.mtime_ns
+        last.sha256 = self.sha256
+        last.final = True
+        yield last
+
+
+Task = tuple[Callable[..., list[ParseResult]], tuple[Any, ...], JSONLFile | None]
+
+
+def _jsonl_tasks(path: str, lines_per_task: int) -> Iterator[Task]:
+    """Read a JSON Lines file here and hand its lines out in bounded tasks.
+
+    Decompressing in the main process keeps only one batch of lines per task
+    in memory, however large the file. The next batch is read before a batch
+    is handed out, so the file is marked as read before its last task can
+    finish.
+    """
+    file = JSONLFile(path)
+    digest = hashlib.sha256()
+    ready: tuple[int, list[str]] | None = None
+    lines: list[str] = []
+    first_line = 1
+
+    def task(batch: tuple[int, list[str]]) -> Task:
+        file.pending += 1
+        return parse_jsonl_lines, (path, *batch), file
+
+    try:
+        stat = os.stat(path)
+        file.size, file.mtime_ns = stat.st_size, stat.st_mtime_ns
+        with open_jsonl(Path(path)) as f:
+            for lineno, line in enumerate(f, start=1):
+                digest.update(line.encode("utf-8"))
+                lines.append(line)
+                if len(lines) == lines_per_task:
+                    if ready is not None:
+                        yield task(ready)
+                    ready, lines, first_line = (first_line, lines), [], lineno + 1
+        if lines:
+            if ready is not None:
+                yield task(ready)
+            ready = (first_line, lines)
+    except Exception as e:
+        file.error = str(e)
+
+    file.sha256 = digest.hexdigest()
+    file.read = True
+    yield task(ready or (first_line, []))
+
+
+def _iter_tasks(
+    paths: Iterable[Path], chunk_size: int, stats: LoadStats
+) -> Iterator[Task]:
+    """Group JSON files ``chunk_size`` to a task; split JSON Lines files by line."""
+    iterator = iter(paths)
+    files: list[str] = []
+    while True:
+        start = time.perf_counter()
+        # ``paths`` may be iter_changed_files, which times its manifest lookups
+        # itself; leave them out of the walk.
+        manifest = stats.timings["manifest"]
+        path = next(iterator, None)
+        stats.timings["walk"] += (
+            time.perf_counter() - start - (stats.timings["manifest"] - manifest)
+        )
+        if path is None:
+            break
+        if is_jsonl(path):
+            yield from _jsonl_tasks(str(path), chunk_size)
+            continue
+        files.append(str(path))
+        if len(files) == chunk_size:
+            yield parse_question_files, (files,), None
+            files = []
+    if files:
+        yield parse_question_files, (files,), None
+
+
+def _collect(
+    results: list[ParseResult], file: JSONLFile | None
+) -> Iterator[ParseResult]:
+    return file.collect(results) if file is not None else iter(results)
+
+
+def iter_parsed_questions(
+    paths: Iterable[Path],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stats: LoadStats | None = None,
+) -> Iterator[ParseResult]:
+    """Parse files across a process pool, yielding results as tasks complete.
+
+    A task is ``chunk_size`` JSON files or ``chunk_size`` lines of a JSON Lines
+    file. At most ``2 * workers`` tasks are in flight, so memory stays bounded
+    no matter how many files ``paths`` produces or how large they are.
+    ``workers=0`` parses in-process. Results are yielded in completion order,
+    not input order.
+    """
+    stats = stats or LoadStats()
+    tasks = _iter_tasks(paths, chunk_size, stats)
+
+    if workers == 0:
+        for function, args, file in tasks:
+            start = time.perf_counter()
+            results = function(*args)
+            stats.timings["parse"] += time.perf_counter() - start
+            yield from _collect(results, file)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+
+    # spawn rather than fork: the caller usually holds a live MongoClient, and
+    # its monitor threads do not survive a fork.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        pending: dict[Future[list[ParseResult]], JSONLFile | None] = {}
+
+        for function, args, file in tasks:
+            pending[pool.submit(function, *args)] = file
+            if len(pending) >= max_pending:
+                for future in _wait_first(pending, stats):
+                    yield from _collect(future.result(), pending.pop(future))
+
+        while pending:
+            for future in _wait_first(pending, stats):
+                yield from _collect(future.result(), pending.pop(future))
+
+
+def _wait_first(
+    pending: dict[Future[list[ParseResult]], JSONLFile | None], stats: LoadStats
+) -> set[Future[list[ParseResult]]]:
+    # Time the main process spends blocked on workers, not their CPU time.
+    start = time.perf_counter()
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    stats.timings["parse"] += time.perf_counter() - start
+    return done
+
+
+class ProgressLine:
+    """Rewrites a single status line at most every PROGRESS_INTERVAL seconds."""
+
+    def __init__(self, stats: LoadStats, stream: TextIO | None = None):
+        self.stats = stats
+        self.stream = stream or sys.stderr
+        self._start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = now
+        elapsed = now - self._start
+        rate = self.stats.files / elapsed if elapsed else 0.0
+        self.stream.write(
+            f"\r  {self.stats.files:,} files | {self.stats.inserted:,} inserted | "
+            f"{self.stats.failed:,} failed | {rate:,.0f} files/s"
+        )
+        self.stream.flush()
+
+    def finish(self) -> None:
+        self.update(force=True)
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+def iter_changed_files(
+    paths: Iterable[Path],
+    db_client: DocumentSink,
+    stats: LoadStats,
+    known_hashes: dict[str, str],
+    chunk_size: int = DEFAULT_BATCH_SIZE,
+    touched: list[dict[str, Any]] | None = None,
+) -> Iterator[Path]:
+    """Drop files whose size and mtime match the ingested-files manifest.
+
+    Manifest lookups are batched with one ``$in`` query per chunk. For JSON
+    files that were seen before but have changed on disk, the previous content
+    hash is left in ``known_hashes`` so a touched-but-identical file can be
+    skipped after it is read. JSON Lines files are parsed in pieces that are
+    written before the whole file has been hashed, so they are hashed here
+    instead; an identical one is skipped and its new manifest entry appended
+    to ``touched``.
+    """
+    for chunk in batched((path.absolute() for path in paths), chunk_size):
+        start = time.perf_counter()
+        manifest = db_client.get_ingested_files([str(path) for path in chunk])
+        changed = []
+        for path in chunk:
+            entry = manifest.get(str(path))
+            if entry is None:
+                changed.append(path)
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Deleted or rotated away since the directory was listed.
+                continue
+            if (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+                stats.skipped += 1
+            elif not is_jsonl(path):
+                known_hashes[str(path)] = entry["sha256"]
+                changed.append(path)
+            elif touched is not None and _jsonl_unchanged(path, entry["sha256"]):
+                stats.skipped += 1
+                touched.append(
+                    ParseResult(
+                        str(path),
+                        size=stat.st_size,
+                        mtime_ns=stat.st_mtime_ns,
+                        sha256=entry["sha256"],
+                    ).manifest_entry()
+                )
+            else:
+                changed.append(path)
+        stats.timings["manifest"] += time.perf_counter() - start
+        yield from changed
+
+
+def _jsonl_unchanged(path: Path, sha256: str) -> bool:
+    try:
+        return jsonl_sha256(path) == sha256
+    except Exception:
+        # Unreadable now; let the parse report it.
+        return False
+
+
+def stream_questions_to_db(
+    db_client: DocumentSink,
+    directory: Path,
+    pattern: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    progress: bool = True,
+    mode: LoadMode = "insert",
+    incremental: bool = False,
+) -> LoadStats:
+    """Walk, parse and write question files in bounded batches.
+
+    Memory use is independent of the number of files: only the in-flight parse
+    chunks and one write batch are held at a time. Invalid files are reported
+    on stderr and counted in ``LoadStats.failed``.
+
+    ``mode="upsert"`` matches existing questions by content hash, so reloading
+    a directory only writes questions that are new or have changed.
+
+    With ``incremental=True`` files already listed in the ingested-files
+    manifest with the same size and mtime are not opened at all. Manifest
+    entries are recorded only after their batch is written, so an interrupted
+    load resumes from the last completed batch.
+    """
+    stats = LoadStats()
+    reporter = ProgressLine(stats) if progress else None
+    start = time.perf_counter()
+    known_hashes: dict[str, str] = {}
+    touched: list[dict[str, Any]] = []
+
+    def record(entries: list[dict[str, Any]]) -> None:
+        record_start = time.perf_counter()
+        db_client.record_ingested_files(entries)
+        stats.timings["manifest"] += time.perf_counter() - record_start
+
+    def parsed() -> Iterator[ParseResult]:
+        paths: Iterable[Path] = iter_question_files(directory, pattern)
+        if incremental:
+            paths = iter_changed_files(
+                paths, db_client, stats, known_hashes, touched=touched
+            )
+
+        for result in iter_parsed_questions(paths, workers=workers, stats=stats):
+            unchanged = incremental and known_hashes.get(result.path) == result.sha256
+            if result.final:
+                stats.files += 1
+                known_hashes.pop(result.path, None)
+
+            if unchanged:
+                # Only the mtime moved; refresh the manifest without a write.
+                if result.final:
+                    stats.skipped += 1
+                    touched.append(result.manifest_entry())
+                if len(touched) >= batch_size:
+                    record(touched)
+                    touched.clear()
+            elif result.document is None:
+                stats.failed += 1
+                print(
+                    f"\nError parsing {Path(result.path).name}: {result.error}",
+                    file=sys.stderr,
+                )
+            else:
+                stats.parsed += 1
+                yield result
+
+    for batch in batched(parsed(), batch_size):
+        documents = [result.document for result in batch]
+        write_start = time.perf_counter()
+        if mode == "upsert":
+            counts = db_client.upsert_documents(documents)
+        else:
+            counts = UpsertCounts(inserted=db_client.insert_documents(documents))
+        stats.timings["write"] += time.perf_counter() - write_start
+        stats.batches += 1
+        stats.inserted += counts.inserted
+        stats.updated += counts.updated
+        stats.unchanged += counts.unchanged
+        stats.rejected += (
+            len(batch) - counts.inserted - counts.updated - counts.unchanged
+        )
+        if incremental:
+            record([r.manifest_entry() for r in batch if r.final] + touched)
+            touched.clear()
+        if reporter:
+            reporter.update()
+
+    if touched:
+        record(touched)
+
+    stats.elapsed = time.perf_counter() - start
+    if reporter:
+        reporter.finish()
+    return stats
+
+
 def load_questions_from_directory(
     directory: Path, pattern: str = "*.json"
 ) -> list[MultipleChoiceQuestion]:
+    """Load every question into memory; use stream_questions_to_db for bulk loads."""
     questions = []
-    json_files = list(directory.glob(pattern))
+    found = False
 
-    if not json_files:
-        print(f"No JSON files found in {directory}", file=sys.stderr)
-        return questions
-
-    print(f"Found {len(json_files)} JSON files in {directory}")
-
-    for file_path in json_files:
+    for file_path in iter_question_files(directory, pattern):
+        found = True
         question = load_question_from_file(file_path)
         if question:
             questions.append(question)
-            print(f"  ✓ Loaded: {file_path.name}")
-        else:
-            print(f"  ✗ Failed: {file_path.name}")
+
+    if not found:
+        print(f"No JSON files found in {directory}", file=sys.stderr)
 
     return questions
@@ -2,9 +2,10 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from quizling.api.app import app
+from quizling.api.router import get_db
 from quizling.base.models import (
     AnswerOption,
     DifficultyLevel,
@@ -63,11 +64,11 @@ def client() -> TestClient:
 
 @pytest.fixture
 def mock_db():
-    """Mock MongoDB client."""
-    with patch("quizling.api.router.MongoDBClient") as mock:
-        db_instance = MagicMock()
-        mock.return_value = db_instance
-        yield db_instance
+    """Mock the shared MongoDB client handed out by get_db."""
+    db_instance = AsyncMock()
+    app.dependency_overrides[get_db] = lambda: db_instance
+    yield db_instance
+    app.dependency_overrides.pop(get_db, None)
 
 
 class TestHealthEndpoints:
@@ -89,6 +90,88 @@ class TestHealthEndpoints:
         assert data["status"] == "healthy"
 
 
+class TestDatabaseLifecycle:
+    """Tests for the app-owned MongoDB client."""
+
+    def test_client_created_at_startup_and_closed_at_shutdown(self) -> None:
+        """Test the lifespan opens one client and closes it on shutdown."""
+        with patch("quizling.api.router.AsyncMongoDBClient") as mock_client_class:
+            db_instance = AsyncMock()
+            mock_client_class.return_value = db_instance
+
+            with TestClient(app):
+                assert app.state.db is db_instance
+                db_instance.connect.assert_awaited_once()
+
+            mock_client_class.assert_called_once_with()
+            db_instance.close.assert_awaited_once()
+            assert app.state.db is None
+
+    def test_client_shared_across_requests(
+        self, sample_questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test every request reuses the client created at startup."""
+        with patch("quizling.api.router.AsyncMongoDBClient") as mock_client_class:
+            db_instance = AsyncMock()
+            db_instance.get_question.return_value = sample_questions[0]
+            mock_client_class.return_value = db_instance
+
+            with TestClient(app) as client:
+                for _ in range(3):
+                    response = client.get("/questions/507f1f77bcf86cd799439011")
+                    assert response.status_code == 200
+
+            mock_client_class.assert_called_once()
+            assert db_instance.get_question.call_count == 3
+
+    def test_lazy_connect_when_startup_fails(
+        self, sample_questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test get_db connects on demand if the database was down at startup."""
+        from quizling.storage.db import MongoDBConnectionError
+
+        unavailable = AsyncMock()
+        unavailable.connect.side_effect = MongoDBConnectionError("down")
+        db_instance = AsyncMock()
+        db_instance.get_question.return_value = sample_questions[0]
+
+        with patch(
+            "quizling.api.router.AsyncMongoDBClient",
+            side_effect=[unavailable, db_instance],
+        ):
+            with TestClient(app) as client:
+                assert app.state.db is None
+                response = client.get("/questions/507f1f77bcf86cd799439011")
+                assert response.status_code == 200
+                assert app.state.db is db_instance
+
+            unavailable.close.assert_awaited_once()
+            db_instance.close.assert_awaited_once()
+
+    def test_indexes_created_at_startup(self) -> None:
+        """Test startup ensures the text index used by search exists."""
+        with patch("quizling.api.router.AsyncMongoDBClient") as mock_client_class:
+            db_instance = AsyncMock()
+            mock_client_class.return_value = db_instance
+
+            with TestClient(app):
+                db_instance.create_indexes.assert_awaited_once()
+
+    def test_database_unavailable_returns_503(self) -> None:
+        """Test requests get a 503 while the database cannot be reached."""
+        from quizling.storage.db import MongoDBConnectionError
+
+        unavailable = AsyncMock()
+        unavailable.connect.side_effect = MongoDBConnectionError("down")
+
+        with patch("quizling.api.router.AsyncMongoDBClient", return_value=unavailable):
+            with TestClient(app) as client:
+                response = client.get("/questions")
+
+        assert response.status_code == 503
+        assert response.json()["detail"] == "Database service unavailable"
+
+
 class TestGetQuestions:
     """Tests for GET /questions endpoint."""
 
@@ -99,7 +182,7 @@ class TestGetQuestions:
         sample_questions: list[MultipleChoiceQuestion],
     ) -> None:
         """Test getting all questions without filters."""
-        mock_db.get_all_questions.return_value = sample_questions
+        mock_db.find_questions.return_value = sample_questions
         mock_db.count_questions.return_value = 3
 
         response = client.get("/questions")
@@ -110,6 +193,15 @@ class TestGetQuestions:
         assert data["has_more"] is False
         assert data["next_cursor"] is None
         assert data["total"] == 3
+        mock_db.find_questions.assert_awaited_once_with(
+            difficulty=None,
+            search=None,
+            skip=0,
+            limit=21,
+            sort="id",
+            after=None,
+            search_mode="text",
+        )
 
     def test_get_questions_with_pagination(
         self,
@@ -119,7 +211,7 @@ class TestGetQuestions:
     ) -> None:
         """Test pagination with limit and cursor."""
         # Return 3 questions to test has_more
-        mock_db.get_all_questions.return_value = sample_questions
+        mock_db.find_questions.return_value = sample_questions
         mock_db.count_questions.return_value = 10
 
         response = client.get("/questions?limit=2&cursor=0")
@@ -130,6 +222,7 @@ class TestGetQuestions:
         assert data["has_more"] is True
         assert data["next_cursor"] == "2"
         assert data["total"] == 10
+        assert response.headers["Deprecation"] == "true"
 
     def test_get_questions_by_difficulty(
         self,
@@ -139,7 +232,8 @@ class TestGetQuestions:
     ) -> None:
         """Test filtering questions by difficulty."""
         easy_questions = [sample_questions[0]]
-        mock_db.get_questions_by_difficulty.return_value = easy_questions
+        mock_db.find_questions.return_value = easy_questions
+        mock_db.count_questions.return_value = 1
 
         response = client.get("/questions?difficulty=easy")
         assert response.status_code == 200
@@ -147,6 +241,10 @@ class TestGetQuestions:
         data = response.json()
         assert len(data["data"]) == 1
         assert data["data"][0]["difficulty"] == "easy"
+        assert data["total"] == 1
+        mock_db.count_questions.assert_awaited_once_with(
+            difficulty="easy", search=None, search_mode="text"
+        )
 
     def test_search_questions(
         self,
@@ -156,7 +254,8 @@ class TestGetQuestions:
     ) -> None:
         """Test searching questions."""
         search_results = [sample_questions[1]]
-        mock_db.search_questions.return_value = search_results
+        mock_db.find_questions.return_value = search_results
+        mock_db.count_questions.return_value = 1
 
         response = client.get("/questions?search=France")
         assert response.status_code == 200
@@ -172,15 +271,156 @@ class TestGetQuestions:
         sample_questions: list[MultipleChoiceQuestion],
     ) -> None:
         """Test searching with difficulty filter."""
-        # Search returns all matching questions
-        mock_db.search_questions.return_value = sample_questions
+        mock_db.find_questions.return_value = [sample_questions[0]]
+        mock_db.count_questions.return_value = 1
 
-        response = client.get("/questions?search=what&difficulty=easy")
+        response = client.get("/questions?search=what&difficulty=easy&cursor=5")
         assert response.status_code == 200
 
         data = response.json()
-        # Should only return easy questions
         assert all(q["difficulty"] == "easy" for q in data["data"])
+        # Both filters and the page window are pushed down into one query
+        mock_db.find_questions.assert_awaited_once_with(
+            difficulty="easy",
+            search="what",
+            skip=5,
+            limit=21,
+            sort="id",
+            after=None,
+            search_mode="text",
+        )
+        mock_db.count_questions.assert_awaited_once_with(
+            difficulty="easy", search="what", search_mode="text"
+        )
+
+    def test_keyset_cursor_round_trip(
+        self,
+        client: TestClient,
+        mock_db: MagicMock,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test next_cursor is an opaque token that resumes after the last id."""
+        page = [
+            q.model_copy(update={"id": f"507f1f77bcf86cd79943901{i}"})
+            for i, q in enumerate(sample_questions)
+        ]
+        mock_db.find_questions.return_value = page
+        mock_db.count_questions.return_value = 10
+
+        response = client.get("/questions?limit=2&difficulty=easy")
+        token = response.json()["next_cursor"]
+        assert token is not None
+        assert not token.isdigit()
+        assert "Deprecation" not in response.headers
+
+        mock_db.find_questions.reset_mock()
+        response = client.get(f"/questions?limit=2&difficulty=easy&cursor={token}")
+        assert response.status_code == 200
+        kwargs = mock_db.find_questions.await_args.kwargs
+        assert kwargs["skip"] == 0
+        assert kwargs["after"] == (None, "507f1f77bcf86cd799439011")
+
+    def test_keyset_cursor_for_sort_key(
+        self,
+        client: TestClient,
+        mock_db: MagicMock,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test the cursor records the last sort value for non-id sort keys."""
+        page = [
+            q.model_copy(update={"id": f"507f1f77bcf86cd79943901{i}"})
+            for i, q in enumerate(sample_questions)
+        ]
+        mock_db.find_questions.return_value = page
+        mock_db.count_questions.return_value = 10
+
+        token = client.get("/questions?limit=2&sort=question").json()["next_cursor"]
+        client.get(f"/questions?limit=2&sort=question&cursor={token}")
+
+        kwargs = mock_db.find_questions.await_args.kwargs
+        assert kwargs["sort"] == "question"
+        assert kwargs["after"] == (page[1].question, "507f1f77bcf86cd799439011")
+
+    def test_text_search_cursor_pages_by_relevance(
+        self,
+        client: TestClient,
+        mock_db: MagicMock,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test text search cursors advance by offset through relevance order."""
+        mock_db.find_questions.return_value = sample_questions
+        mock_db.count_questions.return_value = 10
+
+        token = client.get("/questions?limit=2&search=capital").json()["next_cursor"]
+
+        client.get(f"/questions?limit=2&search=capital&cursor={token}")
+        kwargs = mock_db.find_questions.await_args.kwargs
+        assert kwargs["skip"] == 2
+        assert kwargs["after"] is None
+
+        response = client.get(
+            f"/questions?limit=2&search=capital&search_mode=substring&cursor={token}"
+        )
+        assert response.status_code == 400
+
+    def test_substring_search_mode(
+        self,
+        client: TestClient,
+        mock_db: MagicMock,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test substring search is only used when explicitly requested."""
+        mock_db.find_questions.return_value = [sample_questions[1]]
+        mock_db.count_questions.return_value = 1
+
+        response = client.get("/questions?search=Fra&search_mode=substring")
+        assert response.status_code == 200
+        assert mock_db.find_questions.await_args.kwargs["search_mode"] == "substring"
+
+        response = client.get("/questions?search=Fra&search_mode=regex")
+        assert response.status_code == 422
+
+    def test_tampered_cursor_rejected(
+        self,
+        client: TestClient,
+        mock_db: MagicMock,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test a modified cursor token fails signature verification."""
+        page = [
+            q.model_copy(update={"id": f"507f1f77bcf86cd79943901{i}"})
+            for i, q in enumerate(sample_questions)
+        ]
+        mock_db.find_questions.return_value = page
+        mock_db.count_questions.return_value = 10
+
+        token = client.get("/questions?limit=2").json()["next_cursor"]
+        body, signature = token.split(".")
+        tampered = f"{body[:-2]}AA.{signature}"
+
+        response = client.get(f"/questions?limit=2&cursor={tampered}")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid pagination cursor"
+
+    def test_cursor_rejected_when_filters_change(
+        self,
+        client: TestClient,
+        mock_db: MagicMock,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test a cursor cannot be replayed against a different query."""
+        page = [
+            q.model_copy(update={"id": f"507f1f77bcf86cd79943901{i}"})
+            for i, q in enumerate(sample_questions)
+        ]
+        mock_db.find_questions.return_value = page
+        mock_db.count_questions.return_value = 10
+
+        token = client.get("/questions?limit=2&difficulty=easy").json()["next_cursor"]
+
+        response = client.get(f"/questions?limit=2&difficulty=hard&cursor={token}")
+        assert response.status_code == 400
+        assert "current query" in response.json()["reason"]
 
     def test_pagination_limits(self, client: TestClient, mock_db: MagicMock) -> None:
         """Test pagination limit constraints."""
@@ -198,7 +438,7 @@ class TestGetQuestions:
 
     def test_database_error(self, client: TestClient, mock_db: MagicMock) -> None:
         """Test handling of database errors."""
-        mock_db.get_all_questions.side_effect = Exception("Database connection failed")
+        mock_db.find_questions.side_effect = Exception("Database connection failed")
 
         response = client.get("/questions")
         assert response.status_code == 500
@@ -207,6 +447,55 @@ class TestGetQuestions:
         assert json_response.get("operation") == "get_questions"
 
 
+class TestGetQuestionFacets:
+    """Tests for GET /questions/facets endpoint."""
+
+    def test_difficulty_facets(self, client: TestClient, mock_db: MagicMock) -> None:
+        """Test difficulty counts include every level, even when empty."""
+        mock_db.facet_counts.return_value = {"easy": 4, "hard": 1}
+
+        response = client.get("/questions/facets")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["field"] == "difficulty"
+        assert data["counts"] == {"easy": 4, "medium": 0, "hard": 1}
+        assert data["total"] == 5
+        mock_db.facet_counts.assert_awaited_once_with(
+            "difficulty", difficulty=None, search=None, search_mode="text"
+        )
+
+    def test_facets_with_filters(self, client: TestClient, mock_db: MagicMock) -> None:
+        """Test facets apply the same filters as the question listing."""
+        mock_db.facet_counts.return_value = {"A": 2, "B": 3}
+
+        response = client.get(
+            "/questions/facets?field=correct_answer&difficulty=easy&search=python"
+        )
+        assert response.status_code == 200
+        assert response.json()["counts"] == {"A": 2, "B": 3}
+        mock_db.facet_counts.assert_awaited_once_with(
+            "correct_answer", difficulty="easy", search="python", search_mode="text"
+        )
+
+    def test_unsupported_facet_field(
+        self, client: TestClient, mock_db: MagicMock
+    ) -> None:
+        """Test only whitelisted fields can be faceted."""
+        response = client.get("/questions/facets?field=question")
+        assert response.status_code == 422
+
+    def test_facets_database_error(
+        self, client: TestClient, mock_db: MagicMock
+    ) -> None:
+        """Test aggregation failures surface as database errors."""
+        mock_db.facet_counts.side_effect = Exception("boom")
+
+        response = client.get("/questions/facets")
+        assert response.status_code == 500
+        assert response.json()["operation"] == "get_facets"
+
+
 class TestGetQuestionById:
     """Tests for GET /questions/{id} endpoint."""
 
@@ -0,0 +1,59 @@
+"""Pytest configuration for quiz generation tests."""
+
+from collections.abc import Callable
+
+import httpx
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+
+from quizling.base.models import QuizConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """A clock that only moves when a test sets ``now``."""
+    return FakeClock()
+
+
+def _http_error(
+    status_code: int, headers: dict[str, str] | None = None
+) -> ModelHTTPError:
+    cause = Exception("status error")
+    cause.response = httpx.Response(status_code, headers=headers or {})
+    try:
+        raise ModelHTTPError(status_code=status_code, model_name="test") from cause
+    except ModelHTTPError as e:
+        return e
+
+
+@pytest.fixture
+def http_error() -> Callable[..., ModelHTTPError]:
+    """Build a ModelHTTPError chained to an HTTP response, as pydantic-ai raises it."""
+    return _http_error
+
+
+@pytest.fixture
+def make_config() -> Callable[..., QuizConfig]:
+    """Build a QuizConfig for a test deployment, overriding any field."""
+
+    def make(**kwargs) -> QuizConfig:
+        return QuizConfig(
+            **{
+                "azure_endpoint": "https://test.openai.azure.com",
+                "azure_api_key": "test-key",
+                "azure_deployment_name": "gpt-4o-mini",
+                "api_version": "2024-12-01-preview",
+                "cache_directory": None,
+                **kwargs,
+            }
+        )
+
+    return make
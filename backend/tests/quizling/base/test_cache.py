@@ -0,0 +1,123 @@
+"""Tests for the on-disk response cache."""
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from quizling.base.cache import LRUStore, ResponseCache, cache_key
+from quizling.base.models import AnswerOption, MultipleChoiceQuestion
+
+
+@pytest.fixture
+def questions() -> list[MultipleChoiceQuestion]:
+    """Create a list of questions to cache."""
+    return [
+        MultipleChoiceQuestion(
+            question=f"Question {i}?",
+            options=[AnswerOption(label=label, text=label) for label in "ABCD"],
+            correct_answer="A",
+        )
+        for i in range(3)
+    ]
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_key_depends_on_every_part(self) -> None:
+        """Test that changing any input changes the key."""
+        base = cache_key("content", "prompt", "gpt-4o", {"num_questions": 3})
+
+        assert base == cache_key("content", "prompt", "gpt-4o", {"num_questions": 3})
+        assert base != cache_key("content!", "prompt", "gpt-4o", {"num_questions": 3})
+        assert base != cache_key("content", "prompt!", "gpt-4o", {"num_questions": 3})
+        assert base != cache_key("content", "prompt", "gpt-4", {"num_questions": 3})
+        assert base != cache_key("content", "prompt", "gpt-4o", {"num_questions": 4})
+
+    def test_parts_cannot_shift(self) -> None:
+        """Test that moving text between parts does not collide."""
+        assert cache_key("ab", "c", "d", {}) != cache_key("a", "bc", "d", {})
+
+
+class TestLRUStore:
+    """Tests for LRUStore."""
+
+    def test_size_is_kept_as_a_running_total(self, tmp_path: Path) -> None:
+        """Test that replacing an entry is not counted twice."""
+        store = LRUStore(tmp_path / "store.sqlite3", "entries", max_bytes=100)
+        store.put("a", b"x" * 30)
+        store.put("a", b"x" * 20)
+        store.put("b", b"x" * 10)
+
+        assert store.size == 30
+        assert LRUStore(tmp_path / "store.sqlite3", "entries", 100).size == 30
+
+    def test_eviction_sees_other_writers(self, tmp_path: Path) -> None:
+        """Test that entries written through another connection are counted."""
+        path = tmp_path / "store.sqlite3"
+        store = LRUStore(path, "entries", max_bytes=100)
+        other = LRUStore(path, "entries", max_bytes=100)
+        other.put("a", b"x" * 60)
+
+        store.put("b", b"x" * 60)
+
+        assert len(store) == 1
+        assert store.get("b") is not None
+        assert store.size == 60
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_round_trip_and_counters(
+        self, tmp_path: Path, questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test that stored questions come back and hits/misses are counted."""
+        cache = ResponseCache(tmp_path)
+
+        assert cache.get("key") is None
+        cache.put("key", questions)
+
+        assert cache.get("key") == questions
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+
+    def test_persists_across_instances(
+        self, tmp_path: Path, questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test that entries survive reopening the cache."""
+        ResponseCache(tmp_path).put("key", questions)
+
+        assert ResponseCache(tmp_path).get("key") == questions
+
+    def test_expired_entries_are_ignored(
+        self, tmp_path: Path, questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test that entries older than max_age_seconds are not returned."""
+        cache = ResponseCache(tmp_path, max_age_seconds=60)
+        with patch("quizling.base.cache.time.time", return_value=time.time() - 120):
+            cache.put("old", questions)
+        cache.put("new", questions)
+
+        assert cache.get("old") is None
+        assert cache.get("new") == questions
+        assert len(ResponseCache(tmp_path, max_age_seconds=60)) == 1
+
+    def test_evicts_least_recently_used(
+        self, tmp_path: Path, questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test that exceeding max_bytes evicts the least recently used entries."""
+        cache = ResponseCache(tmp_path)
+        cache.put("first", questions)
+        cache.put("second", questions)
+        cache.get("first")
+        entry_size = cache.store.size // 2
+
+        cache.store.max_bytes = entry_size * 5 // 2
+        cache.put("third", questions)
+
+        assert cache.get("second") is None
+        assert cache.get("first") == questions
+        assert cache.get("third") == questions
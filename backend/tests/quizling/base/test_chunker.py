@@ -0,0 +1,184 @@
+"""Tests for content chunking and question allocation."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from quizling.base.chunker import (
+    CHARS_PER_TOKEN,
+    MAX_BUFFERED_CHUNKS,
+    allocate_questions,
+    estimate_tokens,
+    iter_chunks,
+    split_into_chunks,
+)
+
+
+def paragraphs(count: int, size: int = 400) -> str:
+    return "\n\n".join(f"{i:03d} " + "x" * (size - 4) for i in range(count))
+
+
+class Pieces:
+    """Hands out ``text`` in small pieces, counting how much has been read."""
+
+    def __init__(self, text: str, size: int = 997):
+        self.text = text
+        self.size = size
+        self.consumed = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(0, len(self.text), self.size):
+            self.consumed = i + self.size
+            yield self.text[i : i + self.size]
+
+
+class TestSplitIntoChunks:
+    """Tests for split_into_chunks."""
+
+    def test_small_text_is_one_chunk(self) -> None:
+        """Test that content within budget is returned unchanged."""
+        chunks = split_into_chunks("Short content.", token_budget=100)
+
+        assert len(chunks) == 1
+        assert chunks[0].text == "Short content."
+
+    def test_chunks_respect_budget_and_paragraphs(self) -> None:
+        """Test that chunks stay within budget and end on paragraph boundaries."""
+        text = paragraphs(20)
+
+        chunks = split_into_chunks(text, token_budget=300)
+
+        assert len(chunks) > 1
+        assert all(chunk.tokens <= 300 for chunk in chunks)
+        assert all(text[chunk.start : chunk.end] == chunk.text for chunk in chunks)
+        assert all(chunk.text.endswith("x") for chunk in chunks)
+        assert chunks[-1].end == len(text)
+
+    def test_overlap_repeats_trailing_paragraphs(self) -> None:
+        """Test that consecutive chunks share trailing paragraphs."""
+        text = paragraphs(20)
+
+        chunks = split_into_chunks(text, token_budget=300, overlap_tokens=100)
+
+        for previous, current in zip(chunks, chunks[1:]):
+            assert previous.start < current.start < previous.end
+            assert previous.end - current.start <= 100 * CHARS_PER_TOKEN
+
+    def test_prefers_heading_boundaries(self) -> None:
+        """Test that a half-full chunk breaks before a heading."""
+        text = paragraphs(3) + "\n\n# Section two\n\n" + paragraphs(3)
+
+        chunks = split_into_chunks(text, token_budget=500)
+
+        assert chunks[1].text.startswith("# Section two")
+
+    def test_oversized_paragraph_is_split_on_sentences(self) -> None:
+        """Test that a paragraph larger than the budget is broken up."""
+        text = " ".join(f"Sentence number {i} is here." for i in range(200))
+
+        chunks = split_into_chunks(text, token_budget=100)
+
+        assert all(chunk.tokens <= 100 for chunk in chunks)
+        assert all(chunk.text.rstrip().endswith(".") for chunk in chunks)
+
+
+class TestIterChunks:
+    """Tests for iter_chunks."""
+
+    def test_matches_split_into_chunks(self) -> None:
+        """Test that chunking pieces gives the chunks of the joined text."""
+        text = (
+            paragraphs(30)
+            + "\n\n# Heading\n\n"
+            + " ".join(f"Sentence {i}." for i in range(400))
+            + "\n\n"
+            + "y" * 5000
+            + "\n\n"
+            + paragraphs(30)
+        )
+        pieces = [text[i : i + 997] for i in range(0, len(text), 997)]
+
+        chunks = list(iter_chunks(pieces, token_budget=300, overlap_tokens=100))
+
+        assert chunks == split_into_chunks(text, token_budget=300, overlap_tokens=100)
+
+    def test_yields_before_input_ends(self) -> None:
+        """Test that chunks are produced while pieces are still arriving."""
+        consumed = 0
+
+        def pieces():
+            nonlocal consumed
+            for i in range(100):
+                consumed += 1
+                yield paragraphs(1) + "\n\n"
+
+        first = next(iter_chunks(pieces(), token_budget=300))
+
+        assert first.start == 0
+        assert consumed < 100
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_text_without_paragraph_breaks(self, newline: str) -> None:
+        """Test that line-per-sentence text is chunked as it arrives."""
+        text = "".join(f"Request {i} handled in 12ms.{newline}" for i in range(20_000))
+        pieces = Pieces(text)
+
+        chunks = iter_chunks(pieces, token_budget=300, overlap_tokens=50)
+        first = next(chunks)
+
+        assert pieces.consumed < len(text) // 10
+        assert [first, *chunks] == split_into_chunks(
+            text, token_budget=300, overlap_tokens=50
+        )
+
+    def test_unpunctuated_text_is_chunked_as_it_arrives(self) -> None:
+        """Test that text with no sentence ends to cut at is not held in full."""
+        text = "".join(f"event {i} ok\n" for i in range(50_000))
+        pieces = Pieces(text)
+
+        chunks = iter_chunks(pieces, token_budget=100)
+        first = next(chunks)
+
+        assert pieces.consumed < 2 * MAX_BUFFERED_CHUNKS * 100 * CHARS_PER_TOKEN
+        assert "".join(chunk.text for chunk in [first, *chunks]) == text
+
+    def test_small_input_is_one_chunk(self) -> None:
+        chunks = list(iter_chunks(["Short ", "content."], token_budget=100))
+
+        assert [chunk.text for chunk in chunks] == ["Short content."]
+
+
+class TestAllocateQuestions:
+    """Tests for allocate_questions."""
+
+    def test_proportional_allocation(self) -> None:
+        """Test that questions follow chunk sizes and sum to the total."""
+        assert allocate_questions([100, 100, 200], 8) == [2, 2, 4]
+
+    def test_largest_remainder(self) -> None:
+        """Test that leftover questions go to the largest remainders."""
+        counts = allocate_questions([10, 10, 10], 5)
+
+        assert sum(counts) == 5
+        assert sorted(counts) == [1, 2, 2]
+
+    def test_more_chunks_than_questions(self) -> None:
+        """Test that some chunks may receive no questions."""
+        assert sum(allocate_questions([5, 50, 5], 1)) == 1
+        assert allocate_questions([5, 50, 5], 1) == [0, 1, 0]
+
+    def test_equal_chunks_are_covered_end_to_end(self) -> None:
+        """Test that tied chunks share the questions across the whole document."""
+        counts = allocate_questions([6000] * 100, 10)
+
+        assert counts.count(1) == 10
+        picked = [i for i, count in enumerate(counts) if count]
+        assert picked[0] < 10 and picked[-1] >= 90
+        # One question in each tenth of the document.
+        assert [i // 10 for i in picked] == list(range(10))
+
+
+def test_estimate_tokens() -> None:
+    """Test the character-based token estimate."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcde") == 2
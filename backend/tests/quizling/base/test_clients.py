@@ -0,0 +1,65 @@
+"""Tests for the shared client registry."""
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from quizling.base import clients
+from quizling.base.generator import QuizGenerator
+from quizling.base.models import AzureDeployment, DifficultyLevel, QuizConfig
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    yield
+    asyncio.run(clients.aclose())
+
+
+def test_client_is_shared_per_endpoint_and_credentials() -> None:
+    first = clients.shared_client("https://a", "key", "2024-12-01-preview")
+
+    assert clients.shared_client("https://a", "key", "2024-12-01-preview") is first
+    assert (
+        clients.shared_client("https://a", "other", "2024-12-01-preview") is not first
+    )
+    assert clients.shared_client("https://b", "key", "2024-12-01-preview") is not first
+
+
+def test_models_share_a_client_across_deployments() -> None:
+    gpt = clients.shared_model(
+        AzureDeployment(
+            endpoint="https://a", deployment_name="gpt", api_key="key", api_version="v1"
+        )
+    )
+    mini = clients.shared_model(
+        AzureDeployment(
+            endpoint="https://a",
+            deployment_name="mini",
+            api_key="key",
+            api_version="v1",
+        )
+    )
+
+    assert gpt is not mini
+    assert gpt.client is mini.client
+
+
+def test_generators_reuse_models_across_configurations(
+    make_config: Callable[..., QuizConfig],
+) -> None:
+    """Test that sweeping over options does not create new connections."""
+    easy = QuizGenerator(make_config(difficulty=DifficultyLevel.EASY))
+    hard = QuizGenerator(make_config(difficulty=DifficultyLevel.HARD, topic_focus="x"))
+
+    assert easy._pool.slots[0].model is hard._pool.slots[0].model
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_and_forgets_clients() -> None:
+    client = clients.shared_client("https://a", "key", "2024-12-01-preview")
+
+    await clients.aclose()
+
+    assert client.is_closed()
+    assert clients.shared_client("https://a", "key", "2024-12-01-preview") is not client
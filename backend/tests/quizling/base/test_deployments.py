@@ -0,0 +1,245 @@
+"""Tests for deployment load balancing and circuit breaking."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+
+from quizling.base.deployments import CircuitBreaker, DeploymentPool, DeploymentSlot
+from quizling.base.models import AzureDeployment, QuizConfig
+from quizling.base.rate_limiter import RateLimiter
+from tests.quizling.base.conftest import FakeClock
+
+
+def make_slot(name: str, weight: float = 1.0) -> DeploymentSlot[str]:
+    return DeploymentSlot(name=name, model=name, limiter=RateLimiter(), weight=weight)
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_consecutive_failures(self, clock: FakeClock) -> None:
+        """Test that the breaker only opens once the threshold is reached."""
+        breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.available()
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.available()
+
+    def test_success_resets_failures(self, clock: FakeClock) -> None:
+        breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_allows_a_single_probe(self, clock: FakeClock) -> None:
+        """Test that one probe is let through after the reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 30
+        assert breaker.available()
+        breaker.acquire()
+        assert breaker.state == "half_open"
+        assert not breaker.available()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.available()
+
+    def test_failed_probe_doubles_timeout(self, clock: FakeClock) -> None:
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=30, max_reset_timeout=45, clock=clock
+        )
+        breaker.record_failure()
+
+        clock.now = 30
+        breaker.available()
+        breaker.acquire()
+        breaker.record_failure()
+
+        assert breaker.opened_until == 75
+        clock.now = 75
+        breaker.available()
+        breaker.acquire()
+        breaker.record_failure()
+        assert breaker.opened_until == 120
+
+    def test_throttling_opens_for_cooldown(self, clock: FakeClock) -> None:
+        """Test that a 429 ejects the deployment for the server's Retry-After."""
+        breaker = CircuitBreaker(failure_threshold=3, clock=clock)
+
+        breaker.record_failure(cooldown=4.0)
+
+        assert breaker.state == "open"
+        assert breaker.opened_until == 4.0
+
+
+class TestDeploymentPool:
+    """Tests for DeploymentPool."""
+
+    @pytest.mark.asyncio
+    async def test_routes_by_least_outstanding_requests(self) -> None:
+        """Test that concurrent calls spread across deployments by weight."""
+        pool = DeploymentPool(
+            [make_slot("a", weight=2), make_slot("b", weight=1)], max_retries=0
+        )
+        used: list[str] = []
+
+        async def call(model: str) -> str:
+            used.append(model)
+            await asyncio.sleep(0.01)
+            return model
+
+        await asyncio.gather(*(pool.run(call) for _ in range(6)))
+
+        assert used.count("a") == 4
+        assert used.count("b") == 2
+        assert all(slot.outstanding == 0 for slot in pool.slots)
+
+    @pytest.mark.asyncio
+    async def test_throttled_call_fails_over(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        """Test that a 429 moves the call to another deployment without sleeping."""
+        pool = DeploymentPool([make_slot("a"), make_slot("b")], max_retries=2)
+        call = AsyncMock(side_effect=[http_error(429, {"retry-after": "30"}), "from b"])
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+            result = await pool.run(call)
+
+        assert result == "from b"
+        assert [c.args[0] for c in call.await_args_list] == ["a", "b"]
+        assert pool.slots[0].breaker.state == "open"
+        # Callers from other pools sharing the throttled limiter wait too.
+        assert pool.slots[0].limiter._paused_until > time.monotonic() + 29
+        sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_single_deployment_backs_off(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        """Test that with nowhere to fail over, the call waits and retries."""
+        pool = DeploymentPool([make_slot("a")], max_retries=2)
+        call = AsyncMock(side_effect=[http_error(503), "ok"])
+
+        with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+            result = await pool.run(call)
+
+        assert result == "ok"
+        assert call.await_count == 2
+        sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_backoff_grows_exponentially(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        """Test that transient errors back off with jitter up to a cap."""
+        pool = DeploymentPool(
+            [make_slot("a")], max_retries=2, base_delay=1, max_delay=1.5
+        )
+        call = AsyncMock(side_effect=[http_error(503)] * 2 + ["ok"])
+
+        with (
+            patch("asyncio.sleep", new_callable=AsyncMock) as sleep,
+            patch("quizling.base.deployments.random.uniform", side_effect=max),
+        ):
+            assert await pool.run(call) == "ok"
+
+        assert [c.args[0] for c in sleep.await_args_list] == [1, 1.5]
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_is_raised(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        pool = DeploymentPool([make_slot("a"), make_slot("b")], max_retries=5)
+        call = AsyncMock(side_effect=http_error(400))
+
+        with pytest.raises(ModelHTTPError):
+            await pool.run(call)
+
+        assert call.await_count == 1
+        assert pool.slots[0].breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        pool = DeploymentPool([make_slot("a"), make_slot("b")], max_retries=1)
+        call = AsyncMock(side_effect=http_error(500))
+
+        with pytest.raises(ModelHTTPError):
+            await pool.run(call)
+
+        assert call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_records_actual_token_usage(self) -> None:
+        """Test that the chosen deployment's token budget is corrected."""
+        slot = DeploymentSlot(
+            name="a", model="a", limiter=RateLimiter(tokens_per_minute=6000)
+        )
+        pool = DeploymentPool([slot])
+        before = slot.limiter.tokens.tokens
+
+        await pool.run(AsyncMock(return_value=100), 400, actual_tokens=lambda r: r)
+
+        assert slot.limiter.tokens.tokens == pytest.approx(before - 100, abs=1)
+
+    def test_requires_a_deployment(self) -> None:
+        with pytest.raises(ValueError):
+            DeploymentPool([])
+
+
+class TestDeploymentConfig:
+    """Tests for resolving deployments from QuizConfig."""
+
+    def test_defaults_to_single_azure_deployment(self) -> None:
+        config = QuizConfig(
+            azure_endpoint="https://test.openai.azure.com",
+            azure_api_key="key",
+            azure_deployment_name="gpt",
+            requests_per_minute=60,
+        )
+
+        (deployment,) = config.deployment_pool()
+
+        assert deployment.endpoint == "https://test.openai.azure.com"
+        assert deployment.deployment_name == "gpt"
+        assert deployment.api_key == "key"
+        assert deployment.requests_per_minute == 60
+
+    def test_pool_inherits_credentials_and_limits(self) -> None:
+        config = QuizConfig(
+            azure_api_key="shared-key",
+            api_version="2024-12-01-preview",
+            tokens_per_minute=1000,
+            deployments=[
+                AzureDeployment(endpoint="https://east", deployment_name="gpt"),
+                AzureDeployment(
+                    endpoint="https://west",
+                    deployment_name="gpt",
+                    api_key="west-key",
+                    weight=3,
+                    tokens_per_minute=5000,
+                ),
+            ],
+        )
+
+        east, west = config.deployment_pool()
+
+        assert east.api_key == "shared-key"
+        assert east.api_version == "2024-12-01-preview"
+        assert east.tokens_per_minute == 1000
+        assert west.api_key == "west-key"
+        assert west.tokens_per_minute == 5000
+        assert west.weight == 3
@@ -2,12 +2,20 @@ import pytest
 import tempfile
 
 
+from docx import Document
 from pathlib import Path
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from unittest.mock import patch
 from quizling.base.file_reader import (
     DOCXFileReader,
+    ExtractionCache,
     FileReaderFactory,
+    MappedText,
     PDFFileReader,
+    Segment,
     TextFileReader,
+    detect_encoding,
 )
 
 
@@ -42,6 +50,102 @@ class TestTextFileReader:
         finally:
             temp_path.unlink()
 
+    def test_segments_carry_byte_offsets(self, tmp_path: Path) -> None:
+        """Test that blocks split inside a character still decode it whole."""
+        path = tmp_path / "doc.txt"
+        path.write_text("ab\u00e9cd", encoding="utf-8")
+
+        with patch("quizling.base.file_reader.TEXT_BLOCK_SIZE", 3):
+            segments = list(TextFileReader().iter_segments(path))
+
+        assert "".join(segment.text for segment in segments) == "ab\u00e9cd"
+        assert segments[0] == Segment("ab", 0, 2)
+        assert segments[-1].end == 6
+
+    def test_invalid_utf8_falls_back_to_latin1(self, tmp_path: Path) -> None:
+        """Test that decoding switches to latin-1 at the first invalid byte."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes("caf\u00e9 ".encode("utf-8") + b"na\xefve")
+
+        # The invalid byte lies past the sample the encoding is guessed from.
+        with (
+            patch("quizling.base.file_reader.TEXT_BLOCK_SIZE", 4),
+            patch("quizling.base.file_reader.ENCODING_SAMPLE_SIZE", 4),
+        ):
+            content = TextFileReader().read(path)
+
+        assert content == "caf\u00e9 na\u00efve"
+
+    def test_invalid_utf8_sample_reads_as_latin1(self, tmp_path: Path) -> None:
+        """Test that text that is not UTF-8 at the start is read as latin-1."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes("na\u00efve caf\u00e9".encode("latin-1"))
+
+        assert TextFileReader().read(path) == "na\u00efve caf\u00e9"
+
+    def test_byte_order_marks(self, tmp_path: Path) -> None:
+        """Test that a BOM picks the encoding and is left out of the text."""
+        path = tmp_path / "doc.txt"
+        for encoding in ["utf-8-sig", "utf-16", "utf-32"]:
+            path.write_text("caf\u00e9 \U0001f600", encoding=encoding)
+
+            assert TextFileReader().read(path) == "caf\u00e9 \U0001f600"
+
+    def test_detects_utf16_without_bom(self) -> None:
+        """Test that UTF-16 is recognised by its zero bytes."""
+        text = "Photosynthesis converts light into chemical energy."
+
+        assert detect_encoding(text.encode("utf-16-le")) == ("utf-16-le", 0)
+        assert detect_encoding(text.encode("utf-16-be")) == ("utf-16-be", 0)
+        assert detect_encoding(text.encode("utf-8")) == ("utf-8", 0)
+
+    def test_text_round_trips_segment_offsets(self, tmp_path: Path) -> None:
+        """Test that a segment's offsets decode back to its text."""
+        path = tmp_path / "doc.txt"
+        path.write_text("\u00e9t\u00e9 \u2014 \U0001f600 " * 20, encoding="utf-16")
+
+        with MappedText(path) as mapped:
+            segments = list(mapped.segments(block_size=7))
+            for segment in segments:
+                assert mapped.text(segment.start, segment.end) == segment.text
+
+    def test_text_widens_to_whole_characters(self, tmp_path: Path) -> None:
+        """Test that offsets inside a character include all of it."""
+        path = tmp_path / "doc.txt"
+        path.write_text("ab\u00e9cd", encoding="utf-8")
+
+        with MappedText(path) as mapped:
+            assert mapped.text(3, 5) == "\u00e9c"
+            assert mapped.text(0, 3) == "ab"
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-16"])
+    def test_line_endings_read_as_in_text_mode(
+        self, tmp_path: Path, encoding: str
+    ) -> None:
+        """Test that CRLF and CR line endings read as LF, even split by a block."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes("caf\u00e9\r\nna\u00efve\rend\r\n\r\n".encode(encoding))
+
+        for block_size in [1, 2, 3, 5, 64]:
+            with MappedText(path) as mapped:
+                segments = list(mapped.segments(block_size=block_size))
+                for segment in segments:
+                    assert mapped.text(segment.start, segment.end) == segment.text
+
+            assert "".join(segment.text for segment in segments) == (
+                path.read_text(encoding=encoding)
+            )
+        assert TextFileReader().read(path) == "caf\u00e9\nna\u00efve\nend\n\n"
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test that an empty file reads as no text."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes(b"")
+
+        assert TextFileReader().read(path) == ""
+        with MappedText(path) as mapped:
+            assert mapped.text(0, 10) == ""
+
     def test_file_not_found(self) -> None:
         """Test error handling for non-existent file."""
         reader = TextFileReader()
@@ -49,6 +153,217 @@ class TestTextFileReader:
             reader.read(Path("/nonexistent/file.txt"))
 
 
+def write_pdf(path: Path, pages: list[str]) -> None:
+    """Write a PDF with one line of text on each page."""
+    writer = PdfWriter()
+    font = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/Type1"),
+                NameObject("/BaseFont"): NameObject("/Helvetica"),
+            }
+        )
+    )
+    for text in pages:
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    writer.write(path)
+
+
+class TestPDFFileReader:
+    """Tests for PDFFileReader."""
+
+    def test_read_pdf(self, tmp_path: Path) -> None:
+        pdf = tmp_path / "doc.pdf"
+        write_pdf(pdf, ["First page", "Second page"])
+
+        content = PDFFileReader(max_workers=1).read(pdf)
+
+        assert content == "First page\n\nSecond page"
+
+    def test_parallel_extraction_keeps_page_order(self, tmp_path: Path) -> None:
+        """Test that pages extracted across processes come back in order."""
+        pdf = tmp_path / "doc.pdf"
+        pages = [f"Page {i}" for i in range(10)]
+        write_pdf(pdf, pages)
+
+        reader = PDFFileReader(max_workers=2, min_parallel_pages=1)
+        content = reader.read(pdf)
+
+        assert content == "\n\n".join(pages)
+
+    def test_threads_share_one_pool(self) -> None:
+        """Test that concurrent reads never create two pools for one size."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from quizling.base import file_reader
+
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            pools = set(threads.map(lambda _: file_reader._shared_pool(7), range(32)))
+
+        assert len(pools) == 1
+        file_reader._discard_pool(7, pools.pop())
+        assert 7 not in file_reader._pools
+
+    def test_segments_are_numbered_pages(self, tmp_path: Path) -> None:
+        pdf = tmp_path / "doc.pdf"
+        write_pdf(pdf, ["First page", "", "Third page"])
+
+        segments = list(PDFFileReader(max_workers=1).iter_segments(pdf))
+
+        assert segments == [Segment("First page", 0, 1), Segment("Third page", 2, 3)]
+
+    def test_small_pdf_is_read_serially(self, tmp_path: Path) -> None:
+        pdf = tmp_path / "doc.pdf"
+        write_pdf(pdf, ["Only page"])
+
+        reader = PDFFileReader(max_workers=4, min_parallel_pages=2)
+        with patch.object(reader, "_extract_parallel") as extract_parallel:
+            content = reader.read(pdf)
+
+        assert content == "Only page"
+        extract_parallel.assert_not_called()
+
+
+def write_docx(path: Path, with_table: bool = False) -> None:
+    doc = Document()
+    doc.add_heading("Cell biology", 1)
+    paragraph = doc.add_paragraph("The nucleus ")
+    paragraph.add_run("stores DNA").bold = True
+    paragraph.add_run("\tand more.")
+    doc.add_paragraph("First line\nsecond line")
+    doc.add_paragraph("   ")
+    if with_table:
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "Organelle"
+        table.cell(1, 1).text = "Ribosome"
+    doc.add_paragraph("The end.")
+    doc.save(str(path))
+
+
+class TestDOCXFileReader:
+    """Tests for DOCXFileReader."""
+
+    def test_streaming_matches_python_docx(self, tmp_path: Path) -> None:
+        """Test that parsing document.xml directly gives python-docx's text."""
+        path = tmp_path / "doc.docx"
+        write_docx(path)
+
+        streamed = DOCXFileReader(streaming=True).read(path)
+
+        assert streamed == DOCXFileReader().read(path)
+        assert streamed == (
+            "Cell biology\n\nThe nucleus stores DNA\tand more.\n\n"
+            "First line\nsecond line\n\nThe end."
+        )
+
+    def test_streaming_includes_table_cells(self, tmp_path: Path) -> None:
+        path = tmp_path / "doc.docx"
+        write_docx(path, with_table=True)
+
+        segments = list(DOCXFileReader(streaming=True).iter_segments(path))
+
+        texts = [segment.text for segment in segments]
+        assert texts[-3:] == ["Organelle", "Ribosome", "The end."]
+        assert [segment.start for segment in segments] == sorted(
+            segment.start for segment in segments
+        )
+
+    def test_default_leaves_out_table_cells(self, tmp_path: Path) -> None:
+        """Test that the default reader keeps python-docx's output."""
+        path = tmp_path / "doc.docx"
+        write_docx(path, with_table=True)
+
+        text = FileReaderFactory.read_file(path)
+
+        assert "Organelle" not in text
+        assert text.endswith("second line\n\nThe end.")
+        assert "Organelle" in DOCXFileReader(streaming=True).read(path)
+
+
+class TestExtractionCache:
+    """Tests for ExtractionCache."""
+
+    def test_second_read_is_a_hit(self, tmp_path: Path) -> None:
+        """Test that a file is only parsed the first time it is read."""
+        cache = ExtractionCache(tmp_path / "cache")
+        pdf = tmp_path / "doc.pdf"
+        write_pdf(pdf, ["First page", "Second page"])
+
+        first = FileReaderFactory.read_file(pdf, max_workers=1, cache=cache)
+        with patch.object(PDFFileReader, "iter_segments") as iter_segments:
+            second = FileReaderFactory.read_file(pdf, max_workers=1, cache=cache)
+
+        assert first == second == "First page\n\nSecond page"
+        iter_segments.assert_not_called()
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.hit_rate == 0.5
+
+    def test_streamed_read_is_stored(self, tmp_path: Path) -> None:
+        cache = ExtractionCache(tmp_path / "cache")
+        path = tmp_path / "doc.txt"
+        path.write_text("Some text")
+
+        assert "".join(FileReaderFactory.iter_text(path, cache=cache)) == "Some text"
+        assert list(FileReaderFactory.iter_text(path, cache=cache)) == ["Some text"]
+
+    def test_changed_file_misses(self, tmp_path: Path) -> None:
+        cache = ExtractionCache(tmp_path / "cache")
+        path = tmp_path / "doc.txt"
+        path.write_text("Before")
+        FileReaderFactory.read_file(path, cache=cache)
+
+        path.write_text("After!")
+
+        assert FileReaderFactory.read_file(path, cache=cache) == "After!"
+        assert cache.hits == 0
+
+    def test_copied_file_hits(self, tmp_path: Path) -> None:
+        """Test that entries are keyed by content rather than by path."""
+        cache = ExtractionCache(tmp_path / "cache")
+        original = tmp_path / "a.txt"
+        original.write_text("Shared text")
+        copy = tmp_path / "b.txt"
+        copy.write_text("Shared text")
+
+        FileReaderFactory.read_file(original, cache=cache)
+        FileReaderFactory.read_file(copy, cache=cache)
+
+        assert cache.hits == 1
+
+    def test_docx_readers_are_cached_apart(self, tmp_path: Path) -> None:
+        """Test that the streaming reader's output is not served to python-docx."""
+        cache = ExtractionCache(tmp_path / "cache")
+        path = tmp_path / "doc.docx"
+        write_docx(path, with_table=True)
+
+        streamed = FileReaderFactory.read_file(path, cache=cache, docx_streaming=True)
+        default = FileReaderFactory.read_file(path, cache=cache)
+
+        assert "Organelle" in streamed
+        assert "Organelle" not in default
+        assert cache.hits == 0
+        assert FileReaderFactory.read_file(path, cache=cache) == default
+        assert cache.hits == 1
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = ExtractionCache(tmp_path / "cache", max_bytes=60)
+        for name in "abc":
+            # About 25 bytes with the timing, so only two entries fit.
+            cache.put(name, name * 1000, seconds=1.0)
+            cache.get("a")
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.seconds_saved > 0
+
+
 class TestFileReaderFactory:
     """Tests for FileReaderFactory."""
 
@@ -67,11 +382,21 @@ class TestFileReaderFactory:
         reader = FileReaderFactory.get_reader(Path("file.pdf"))
         assert isinstance(reader, PDFFileReader)
 
+    def test_get_pdf_reader_with_workers(self) -> None:
+        reader = FileReaderFactory.get_reader(Path("file.pdf"), max_workers=3)
+        assert isinstance(reader, PDFFileReader)
+        assert reader.max_workers == 3
+
     def test_get_docx_reader(self) -> None:
         """Test getting reader for DOCX files."""
         reader = FileReaderFactory.get_reader(Path("file.docx"))
         assert isinstance(reader, DOCXFileReader)
 
+    def test_get_streaming_docx_reader(self) -> None:
+        reader = FileReaderFactory.get_reader(Path("file.docx"), docx_streaming=True)
+        assert isinstance(reader, DOCXFileReader)
+        assert reader.streaming
+
     def test_unsupported_format(self) -> None:
         """Test error for unsupported file format."""
         with pytest.raises(ValueError, match="Unsupported file type"):
@@ -94,6 +419,18 @@ class TestFileReaderFactory:
         finally:
             temp_path.unlink()
 
+    def test_iter_text_joins_to_read_file(self, tmp_path: Path) -> None:
+        pdf = tmp_path / "doc.pdf"
+        write_pdf(pdf, ["First page", "Second page"])
+
+        pieces = list(FileReaderFactory.iter_text(pdf, max_workers=1))
+
+        assert "".join(pieces) == FileReaderFactory.read_file(pdf, max_workers=1)
+
+    def test_iter_text_checks_path(self) -> None:
+        with pytest.raises(FileNotFoundError):
+            FileReaderFactory.iter_text("/nonexistent/file.txt")
+
     def test_read_file_not_found(self) -> None:
         """Test error handling when file does not exist."""
         with pytest.raises(FileNotFoundError):
@@ -1,11 +1,23 @@
+import asyncio
+import json
 import tempfile
 import pytest
 
 
+from collections.abc import AsyncIterator
 from pathlib import Path
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.models.function import (
+    AgentInfo,
+    DeltaToolCall,
+    DeltaToolCalls,
+    FunctionModel,
+)
+from pydantic_ai.usage import RunUsage
 from quizling.base.generator import QuizGenerator
 from quizling.base.models import (
     AnswerOption,
+    AzureDeployment,
     DifficultyLevel,
     MultipleChoiceQuestion,
     QuizConfig,
@@ -173,6 +185,36 @@ class TestQuizGenerator:
         finally:
             temp_path.unlink()
 
+    @pytest.mark.asyncio
+    async def test_generate_from_file_passes_docx_streaming(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+        tmp_path: Path,
+    ) -> None:
+        """Test that the config chooses the DOCX reader the file is read with."""
+        mock_config.docx_streaming = True
+        generator = QuizGenerator(mock_config)
+        path = tmp_path / "doc.docx"
+        path.touch()
+        text = "This is test content that is long enough. " * 10
+
+        with (
+            patch(
+                "quizling.base.generator.FileReaderFactory.iter_text",
+                return_value=iter([text]),
+            ) as iter_text,
+            patch.object(
+                generator._agent,
+                "run",
+                new_callable=AsyncMock,
+                return_value=MagicMock(output=sample_questions),
+            ),
+        ):
+            await generator.generate_from_file(path)
+
+        assert iter_text.call_args.args[3] is True
+
     @pytest.mark.asyncio
     async def test_generate_from_file_not_found(self, mock_config: QuizConfig) -> None:
         """Test that non-existent file raises FileNotFoundError."""
@@ -227,3 +269,385 @@ class TestQuizGenerator:
 
             with pytest.raises(Exception, match="Error generating questions"):
                 await generator._generate_questions("Test content")
+
+    @pytest.mark.asyncio
+    async def test_generate_large_content_in_chunks(
+        self, mock_config: QuizConfig, sample_questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test that large content is split and questions are allocated per chunk."""
+        mock_config.num_questions = 6
+        mock_config.chunk_token_budget = 256
+        mock_config.chunk_overlap_tokens = 0
+        mock_config.max_concurrency = 2
+        generator = QuizGenerator(mock_config)
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_run(prompt: str, deps: QuizConfig, **kwargs) -> MagicMock:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(output=sample_questions[:1] * deps.num_questions)
+
+        text = "\n\n".join("Paragraph about Python. " * 20 for _ in range(8))
+
+        with patch.object(generator._agent, "run", side_effect=fake_run) as mock_run:
+            result = await generator.generate_from_text(text)
+
+        requested = [
+            call.kwargs["deps"].num_questions for call in mock_run.call_args_list
+        ]
+        assert mock_run.call_count > 1
+        assert sum(requested) == 6
+        assert len(result.questions) == 6
+        assert peak <= 2
+        assert result.config.num_questions == 6
+
+    @pytest.mark.asyncio
+    async def test_file_is_chunked_like_its_text(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+        tmp_path: Path,
+    ) -> None:
+        """Test that a file chunked as it is read gets the same runs as its text."""
+        mock_config.num_questions = 6
+        mock_config.chunk_token_budget = 256
+        generator = QuizGenerator(mock_config)
+        text = "\n\n".join(f"Paragraph {i} about Python. " * 20 for i in range(8))
+        path = tmp_path / "doc.txt"
+        path.write_text(text)
+
+        async def fake_run(prompt: str, deps: QuizConfig, **kwargs) -> MagicMock:
+            return MagicMock(output=sample_questions[:1] * deps.num_questions)
+
+        with patch.object(generator._agent, "run", side_effect=fake_run) as mock_run:
+            await generator.generate_from_text(text)
+            await generator.generate_from_file(path)
+
+        calls = [(c.args[0], c.kwargs["deps"]) for c in mock_run.call_args_list]
+        half = len(calls) // 2
+        assert half > 1
+        assert sorted(calls[:half], key=str) == sorted(calls[half:], key=str)
+
+    def test_system_prompt_uses_run_config(self, mock_config: QuizConfig) -> None:
+        """Test that the system prompt reflects the per-run config."""
+        generator = QuizGenerator(mock_config)
+        chunk_config = mock_config.model_copy(update={"num_questions": 1})
+
+        assert "exactly 1 multiple choice" in generator._build_system_prompt(
+            chunk_config
+        )
+
+    @pytest.mark.asyncio
+    async def test_generate_uses_response_cache(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+        tmp_path: Path,
+    ) -> None:
+        """Test that repeated generations are served from the cache."""
+        mock_config.cache_directory = str(tmp_path)
+        generator = QuizGenerator(mock_config)
+        text = "Content that is long enough to generate questions from. " * 5
+
+        with patch.object(generator._agent, "run", new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = MagicMock(output=sample_questions)
+
+            first = await generator.generate_from_text(text)
+            second = await generator.generate_from_text(text)
+            assert mock_run.await_count == 1
+
+            generator.config.cache_refresh = True
+            await generator.generate_from_text(text)
+            assert mock_run.await_count == 2
+
+        assert second.questions == first.questions
+        assert (generator.cache.hits, generator.cache.misses) == (1, 1)
+
+    def test_cache_key_covers_the_deployment_pool(
+        self, mock_config: QuizConfig, tmp_path: Path
+    ) -> None:
+        """Test that responses are keyed by the deployments that may serve them."""
+        mock_config.cache_directory = str(tmp_path)
+        single = QuizGenerator(mock_config)
+        pooled = QuizGenerator(
+            mock_config.model_copy(
+                update={
+                    "deployments": [
+                        AzureDeployment(endpoint="https://east", deployment_name="a"),
+                        AzureDeployment(endpoint="https://west", deployment_name="b"),
+                    ]
+                }
+            )
+        )
+
+        assert single._cache_key("text", mock_config) != pooled._cache_key(
+            "text", mock_config
+        )
+
+    @pytest.mark.asyncio
+    async def test_generate_balances_across_deployments(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test that calls are routed to each deployment in the pool."""
+        mock_config.deployments = [
+            AzureDeployment(endpoint="https://east", deployment_name="gpt-east"),
+            AzureDeployment(endpoint="https://west", deployment_name="gpt-west"),
+        ]
+        mock_config.num_questions = 2
+        generator = QuizGenerator(mock_config)
+
+        async def fake_run(prompt: str, deps: QuizConfig, model) -> MagicMock:
+            await asyncio.sleep(0.01)
+            return MagicMock(output=sample_questions[:1] * deps.num_questions)
+
+        text = "\n\n".join("Paragraph about Python. " * 20 for _ in range(8))
+        mock_config.chunk_token_budget = 256
+
+        with patch.object(generator._agent, "run", side_effect=fake_run) as mock_run:
+            await generator.generate_from_text(text)
+
+        used = {call.kwargs["model"].model_name for call in mock_run.call_args_list}
+        assert used == {"gpt-east", "gpt-west"}
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_questions_before_response_completes(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test that questions are yielded as soon as they validate."""
+        generator = QuizGenerator(mock_config)
+        finish = asyncio.Event()
+
+        async def stream_function(
+            messages: list, info: AgentInfo
+        ) -> AsyncIterator[DeltaToolCalls]:
+            name = info.output_tools[0].name
+            questions = [q.model_dump(mode="json") for q in sample_questions]
+            yield {0: DeltaToolCall(name=name, json_args='{"response": [')}
+            for i, question in enumerate(questions):
+                if i == 2:
+                    await finish.wait()
+                separator = ", " if i else ""
+                yield {0: DeltaToolCall(json_args=separator + json.dumps(question))}
+            yield {0: DeltaToolCall(json_args="]}")}
+
+        generator._pool.slots[0].model = FunctionModel(stream_function=stream_function)
+        text = "Content that is long enough to generate questions from. " * 5
+
+        stream = generator.stream_from_text(text)
+        first = await anext(stream)
+        # The model is still blocked before its third question.
+        assert not finish.is_set()
+        assert first == sample_questions[0]
+
+        finish.set()
+        rest = [question async for question in stream]
+        assert rest == sample_questions[1:]
+
+    @pytest.mark.asyncio
+    async def test_stream_retry_tops_up_without_repeating(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test that a retried stream yields only new questions, up to the count."""
+        generator = QuizGenerator(mock_config)
+        first, second, third = sample_questions[:3]
+        fresh = second.model_copy(update={"question": "When was Python released?"})
+        attempts = 0
+
+        async def stream_function(
+            messages: list, info: AgentInfo
+        ) -> AsyncIterator[DeltaToolCalls]:
+            nonlocal attempts
+            attempts += 1
+            name = info.output_tools[0].name
+            if attempts == 1:
+                questions = [first, second, third]
+            else:
+                # The retry generates again, in a different order.
+                questions = [second, fresh, third, first]
+            yield {0: DeltaToolCall(name=name, json_args='{"response": [')}
+            for i, question in enumerate(questions):
+                separator = ", " if i else ""
+                data = json.dumps(question.model_dump(mode="json"))
+                yield {0: DeltaToolCall(json_args=separator + data)}
+            if attempts == 1:
+                # Let the streamed questions be yielded before the call fails.
+                await asyncio.sleep(0.2)
+                raise ModelHTTPError(status_code=503, model_name="test")
+            yield {0: DeltaToolCall(json_args="]}")}
+
+        generator._pool.slots[0].model = FunctionModel(stream_function=stream_function)
+        text = "Content that is long enough to generate questions from. " * 5
+
+        with patch("quizling.base.deployments.random.uniform", return_value=0):
+            questions = [q async for q in generator.stream_from_text(text)]
+
+        assert attempts == 2
+        assert questions == [first, second, fresh]
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_response_cache(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+        tmp_path: Path,
+    ) -> None:
+        """Test that streamed questions are cached and replayed."""
+        mock_config.cache_directory = str(tmp_path)
+        generator = QuizGenerator(mock_config)
+        calls = 0
+
+        async def stream_function(
+            messages: list, info: AgentInfo
+        ) -> AsyncIterator[DeltaToolCalls]:
+            nonlocal calls
+            calls += 1
+            questions = [q.model_dump(mode="json") for q in sample_questions]
+            yield {
+                0: DeltaToolCall(
+                    name=info.output_tools[0].name,
+                    json_args=json.dumps({"response": questions}),
+                )
+            }
+
+        generator._pool.slots[0].model = FunctionModel(stream_function=stream_function)
+        text = "Content that is long enough to generate questions from. " * 5
+
+        first = [q async for q in generator.stream_from_text(text)]
+        second = [q async for q in generator.stream_from_text(text)]
+
+        assert first == second == sample_questions
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_short_content_raises(self, mock_config: QuizConfig) -> None:
+        generator = QuizGenerator(mock_config)
+
+        with pytest.raises(ValueError, match="too short"):
+            await anext(generator.stream_from_text("short"))
+
+    def test_cacheable_layout_shares_prompt_prefix(
+        self, mock_config: QuizConfig
+    ) -> None:
+        """Test that variants differ only after the content."""
+        generator = QuizGenerator(mock_config)
+        content = "Some document content about Python. " * 10
+        easy = mock_config.model_copy(
+            update={"prompt_layout": "cacheable", "difficulty": DifficultyLevel.EASY}
+        )
+        hard = mock_config.model_copy(
+            update={
+                "prompt_layout": "cacheable",
+                "difficulty": DifficultyLevel.HARD,
+                "num_questions": 7,
+                "topic_focus": "typing",
+            }
+        )
+
+        assert generator._build_system_prompt(easy) == generator._build_system_prompt(
+            hard
+        )
+        easy_prompt = generator._build_agent_prompt(content, easy)
+        hard_prompt = generator._build_agent_prompt(content, hard)
+        prefix = f"Content:\n{content}\n\n"
+        assert easy_prompt.startswith(prefix) and hard_prompt.startswith(prefix)
+        assert "exactly 7 multiple choice" in hard_prompt
+        assert "typing" in hard_prompt
+
+    @pytest.mark.asyncio
+    async def test_generate_variants_warms_cache_first(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test that the first variant completes before the others start."""
+        generator = QuizGenerator(mock_config)
+        events: list[str] = []
+
+        async def fake_run(prompt: str, deps: QuizConfig, **kwargs) -> MagicMock:
+            events.append(f"start {deps.difficulty.value}")
+            await asyncio.sleep(0.01)
+            events.append(f"end {deps.difficulty.value}")
+            return MagicMock(
+                output=sample_questions[: deps.num_questions],
+                usage=MagicMock(
+                    return_value=RunUsage(input_tokens=1000, cache_read_tokens=900)
+                ),
+            )
+
+        configs = [
+            mock_config.model_copy(
+                update={"difficulty": difficulty, "num_questions": n}
+            )
+            for difficulty, n in [
+                (DifficultyLevel.EASY, 1),
+                (DifficultyLevel.MEDIUM, 2),
+                (DifficultyLevel.HARD, 3),
+            ]
+        ]
+        text = "Content that is long enough to generate questions from. " * 5
+
+        with patch.object(generator._agent, "run", side_effect=fake_run):
+            results = await generator.generate_variants(text, configs)
+
+        assert events[:2] == ["start easy", "end easy"]
+        assert set(events[2:4]) == {"start medium", "start hard"}
+        assert [r.num_questions for r in results] == [1, 2, 3]
+        assert all(r.config.prompt_layout == "cacheable" for r in results)
+        assert generator.usage.input_tokens == 3000
+        assert generator.usage.cache_read_tokens == 2700
+
+    @pytest.mark.asyncio
+    async def test_generate_records_metrics(
+        self,
+        mock_config: QuizConfig,
+        sample_questions: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test that retries, latency and usage end up on the result and hook."""
+        hook = MagicMock()
+        generator = QuizGenerator(mock_config, metrics_hook=hook)
+        throttled = ModelHTTPError(status_code=503, model_name="gpt-4o-mini")
+        response = MagicMock(
+            output=sample_questions,
+            usage=MagicMock(
+                return_value=RunUsage(
+                    input_tokens=1200,
+                    cache_read_tokens=1024,
+                    output_tokens=300,
+                    requests=2,
+                )
+            ),
+        )
+        text = "Content that is long enough to generate questions from. " * 5
+
+        with (
+            patch.object(generator._agent, "run", side_effect=[throttled, response]),
+            patch("quizling.base.deployments.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            result = await generator.generate_from_text(text)
+
+        metrics = result.metrics
+        assert metrics.questions == 3
+        assert (metrics.requests, metrics.retries) == (2, 1)
+        assert len(metrics.request_seconds) == 2
+        assert metrics.input_tokens == 1200
+        assert metrics.cached_input_tokens == 1024
+        assert metrics.output_tokens == 300
+        assert metrics.validation_failures == 1
+        assert metrics.prompt_chars > len(text)
+        assert metrics.total_seconds > 0
+
+        events = [call.args[0] for call in hook.on_request.call_args_list]
+        assert [event.error is not None for event in events] == [True, False]
+        assert events[0].model == "gpt-4o-mini"
+        hook.on_complete.assert_called_once_with("<text input>", metrics)
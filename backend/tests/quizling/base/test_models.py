@@ -5,6 +5,7 @@ from pydantic import ValidationError
 from quizling.base.models import (
     AnswerOption,
     DifficultyLevel,
+    GenerationMetrics,
     MultipleChoiceQuestion,
     QuizConfig,
     QuizResult,
@@ -57,6 +58,30 @@ class TestMultipleChoiceQuestion:
         assert question.explanation == "2+2 equals 4"
         assert question.difficulty == DifficultyLevel.EASY
 
+    def test_content_hash_normalizes_text(self) -> None:
+        """Test that whitespace and case do not change the content hash."""
+
+        def build(text: str, **kwargs) -> MultipleChoiceQuestion:
+            return MultipleChoiceQuestion(
+                question=text,
+                options=[
+                    AnswerOption(label=label, text=f"Option {label}")
+                    for label in "ABCD"
+                ],
+                correct_answer=kwargs.pop("correct_answer", "A"),
+                **kwargs,
+            )
+
+        original = build("What is 2+2?")
+
+        assert build("  what IS\n2+2? ").content_hash() == original.content_hash()
+        assert build("What is 2+2?", explanation="New").content_hash() == (
+            original.content_hash()
+        )
+        assert build("What is 2+2?", correct_answer="B").content_hash() != (
+            original.content_hash()
+        )
+
     def test_options_are_sorted_by_label(self) -> None:
         """Test that options are automatically sorted by label."""
         options = [
@@ -199,3 +224,41 @@ class TestQuizResult:
         assert result.num_questions == 1
         assert result.source_file == "/path/to/file.txt"
         assert result.config == config
+
+
+class TestGenerationMetrics:
+    """Tests for GenerationMetrics."""
+
+    def test_combine_sums_runs(self) -> None:
+        first = GenerationMetrics(
+            questions=3, requests=2, retries=1, request_seconds=[1.0, 2.0]
+        )
+        second = GenerationMetrics(
+            questions=2, requests=1, input_tokens=500, request_seconds=[4.0]
+        )
+
+        total = GenerationMetrics.combine([first, second])
+
+        assert total.questions == 5
+        assert (total.requests, total.retries) == (3, 1)
+        assert total.input_tokens == 500
+        assert total.request_seconds == [1.0, 2.0, 4.0]
+        assert first.request_seconds == [1.0, 2.0]
+
+    def test_latency_percentiles(self) -> None:
+        metrics = GenerationMetrics(request_seconds=[float(i) for i in range(1, 101)])
+
+        assert metrics.latency(0.5) == 51.0
+        assert metrics.latency(0.95) == 96.0
+        assert metrics.latency(1.0) == 100.0
+        assert GenerationMetrics().latency(0.5) == 0.0
+
+    def test_summary_lines(self) -> None:
+        metrics = GenerationMetrics(
+            questions=5, input_tokens=1000, cached_input_tokens=250, output_tokens=10
+        )
+
+        summary = "\n".join(metrics.summary_lines())
+
+        assert "Questions: 5" in summary
+        assert "1,000 input (25% cached)" in summary
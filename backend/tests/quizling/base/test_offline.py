@@ -0,0 +1,103 @@
+"""Tests for the offline stand-in model."""
+
+from collections.abc import Callable
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+
+from quizling.base.generator import QuizGenerator
+from quizling.base.models import (
+    AzureDeployment,
+    DifficultyLevel,
+    MultipleChoiceQuestion,
+    QuizConfig,
+)
+from quizling.base.offline import OfflineBackend, make_questions
+from quizling.base.rate_limiter import retry_after
+
+CONTENT = "The mitochondria is the powerhouse of the cell. " * 10
+
+
+def test_make_questions_follows_prompt() -> None:
+    """Test that the count and difficulty asked for are the ones returned."""
+    questions = make_questions(
+        "Generate exactly 7 multiple choice questions at easy difficulty level."
+    )
+
+    assert len(questions) == 7
+    for question in questions:
+        parsed = MultipleChoiceQuestion.model_validate(question)
+        assert parsed.difficulty == DifficultyLevel.EASY
+
+
+@pytest.mark.asyncio
+async def test_generates_valid_questions(
+    make_config: Callable[..., QuizConfig],
+) -> None:
+    backend = OfflineBackend(latency=0, jitter=0, seconds_per_question=0)
+    generator = QuizGenerator(
+        make_config(num_questions=3, difficulty=DifficultyLevel.HARD),
+        model_factory=backend,
+    )
+
+    result = await generator.generate_from_text(CONTENT)
+
+    assert result.num_questions == 3
+    assert all(q.difficulty == DifficultyLevel.HARD for q in result.questions)
+    assert result.metrics.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_streams_questions(make_config: Callable[..., QuizConfig]) -> None:
+    backend = OfflineBackend(latency=0, jitter=0, seconds_per_question=0)
+    generator = QuizGenerator(
+        make_config(num_questions=3, difficulty=DifficultyLevel.HARD),
+        model_factory=backend,
+    )
+
+    questions = [q async for q in generator.stream_from_text(CONTENT)]
+
+    assert len(questions) == 3
+
+
+@pytest.mark.asyncio
+async def test_throttling_reports_retry_after(
+    make_config: Callable[..., QuizConfig],
+) -> None:
+    """Test that a 429 carries the Retry-After the deployment pool backs off by."""
+    backend = OfflineBackend(latency=0, jitter=0, throttle_rate=1.0, retry_after=9)
+    config = make_config(
+        max_retries=0,
+        deployments=[AzureDeployment(endpoint="offline", deployment_name="a")],
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        await QuizGenerator(config, model_factory=backend).generate_from_text(CONTENT)
+
+    error = exc_info.value.__cause__
+    assert isinstance(error, ModelHTTPError)
+    assert error.status_code == 429
+    assert retry_after(error) == 9
+
+
+@pytest.mark.asyncio
+async def test_errors_are_reproducible(make_config: Callable[..., QuizConfig]) -> None:
+    """Test that the same seed fails the same requests."""
+
+    async def outcomes(seed: int) -> list[bool]:
+        backend = OfflineBackend(latency=0, jitter=0, error_rate=0.5, seed=seed)
+        results = []
+        for _ in range(10):
+            # A new generator each time, so failures never trip a breaker.
+            generator = QuizGenerator(make_config(max_retries=0), model_factory=backend)
+            try:
+                await generator.generate_from_text(CONTENT)
+                results.append(True)
+            except Exception:
+                results.append(False)
+        return results
+
+    first = await outcomes(seed=3)
+
+    assert first == await outcomes(seed=3)
+    assert True in first and False in first
@@ -261,3 +261,128 @@ class TestQuizWriter:
 
             assert "  " in content
             assert "\n" in content
+
+    def test_jsonl_appends_to_one_file(
+        self, quiz_result: QuizResult, temp_dir: Path
+    ) -> None:
+        quiz_result.config.output_directory = str(temp_dir)
+        quiz_result.config.output_format = "jsonl"
+        writer = QuizWriter(quiz_result)
+
+        first_write = writer.write()
+        second_write = writer.write()
+
+        assert first_write == second_write == [temp_dir / "questions-000001.jsonl"]
+        lines = first_write[0].read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2 * len(quiz_result.questions)
+        assert json.loads(lines[0])["question"] == quiz_result.questions[0].question
+
+    def test_jsonl_rotates_by_size(
+        self, quiz_result: QuizResult, temp_dir: Path
+    ) -> None:
+        quiz_result.config.output_directory = str(temp_dir)
+        quiz_result.config.output_format = "jsonl"
+        quiz_result.config.output_batch_size = 1
+        quiz_result.config.output_rotate_bytes = 1
+        writer = QuizWriter(quiz_result)
+
+        written_files = writer.write()
+
+        assert [f.name for f in written_files] == [
+            "questions-000001.jsonl",
+            "questions-000002.jsonl",
+            "questions-000003.jsonl",
+        ]
+        assert [f.name for f in writer.write()][0] == "questions-000004.jsonl"
+
+    def test_jsonl_concurrent_writers_append_whole_batches(
+        self, quiz_result: QuizResult, temp_dir: Path
+    ) -> None:
+        """Test that writers on several threads never interleave lines."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        quiz_result.config.output_directory = str(temp_dir)
+        quiz_result.config.output_format = "jsonl"
+        quiz_result.config.output_rotate_bytes = 4096
+        questions = quiz_result.questions * 50
+
+        def write(_: int) -> None:
+            QuizWriter(quiz_result.model_copy(update={"questions": questions})).write()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(write, range(8)))
+
+        parts = sorted(temp_dir.glob("questions-*.jsonl"))
+        lines = [line for part in parts for line in part.read_text().splitlines()]
+        assert len(lines) == 8 * len(questions)
+        assert all(json.loads(line)["question"] for line in lines)
+        assert len(parts) > 1
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_jsonl_compressed_batches_stream_back(
+        self, quiz_result: QuizResult, temp_dir: Path, compression: str
+    ) -> None:
+        if compression == "zstd":
+            pytest.importorskip("zstandard")
+        from quizling.base.jsonl import open_jsonl
+
+        quiz_result.config.output_directory = str(temp_dir)
+        quiz_result.config.output_format = "jsonl"
+        quiz_result.config.output_compression = compression
+        quiz_result.config.output_batch_size = 2
+        writer = QuizWriter(quiz_result)
+
+        (written_file,) = writer.write()
+        writer.write()
+
+        with open_jsonl(written_file) as f:
+            questions = [json.loads(line)["question"] for line in f]
+        assert questions == [q.question for q in quiz_result.questions] * 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("output_format", ["json", "jsonl"])
+    async def test_write_stream_collects_questions(
+        self,
+        sample_questions: list[MultipleChoiceQuestion],
+        quiz_config: QuizConfig,
+        temp_dir: Path,
+        output_format: str,
+    ) -> None:
+        quiz_config.output_directory = str(temp_dir / "out")
+        quiz_config.output_format = output_format
+        quiz_config.output_batch_size = 2
+        quiz_result = QuizResult(questions=[], source_file="x", config=quiz_config)
+        writer = QuizWriter(quiz_result)
+        seen_on_disk = []
+
+        async def stream():
+            for question in sample_questions:
+                yield question
+                seen_on_disk.append(len(list((temp_dir / "out").glob("*.json*"))))
+
+        written_files = await writer.write_stream(stream())
+
+        assert quiz_result.questions == sample_questions
+        if output_format == "json":
+            assert len(written_files) == 3
+            # Each question is on disk before the next one arrives.
+            assert seen_on_disk == [1, 2, 3]
+        else:
+            (written_file,) = written_files
+            assert len(written_file.read_text(encoding="utf-8").splitlines()) == 3
+
+    @pytest.mark.asyncio
+    async def test_write_stream_empty(
+        self, quiz_config: QuizConfig, temp_dir: Path
+    ) -> None:
+        quiz_config.output_directory = str(temp_dir / "out")
+        writer = QuizWriter(
+            QuizResult(questions=[], source_file="x", config=quiz_config)
+        )
+
+        async def stream():
+            return
+            yield
+
+        assert await writer.write_stream(stream()) == []
+        assert not (temp_dir / "out").exists()
@@ -0,0 +1,122 @@
+"""Tests for the client-side rate limiter."""
+
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+
+from quizling.base.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    retry_after,
+    shared_rate_limiter,
+)
+from tests.quizling.base.conftest import FakeClock
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_wait(self, clock: FakeClock) -> None:
+        """Test that a burst is admitted and then callers queue at the rate."""
+        bucket = TokenBucket(per_minute=60, burst_seconds=2, clock=clock)
+
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+        assert bucket.reserve(1) == pytest.approx(2.0)
+
+        clock.now = 10
+        assert bucket.reserve(1) == 0
+
+    def test_oversized_request_is_clamped(self, clock: FakeClock) -> None:
+        """Test that a request larger than capacity can still be admitted."""
+        bucket = TokenBucket(per_minute=600, clock=clock)
+
+        assert bucket.reserve(10_000) == 0
+
+    def test_refund_returns_unused_budget(self, clock: FakeClock) -> None:
+        """Test that over-estimated usage is credited back."""
+        bucket = TokenBucket(per_minute=60, burst_seconds=1, clock=clock)
+        bucket.reserve(1)
+
+        bucket.refund(1)
+
+        assert bucket.reserve(1) == 0
+
+
+class TestRetryAfter:
+    """Tests for Retry-After header parsing."""
+
+    def test_seconds(self, http_error: Callable[..., ModelHTTPError]) -> None:
+        assert retry_after(http_error(429, {"retry-after": "7"})) == 7
+
+    def test_milliseconds_take_precedence(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        error = http_error(429, {"retry-after": "7", "retry-after-ms": "1500"})
+        assert retry_after(error) == 1.5
+
+    def test_http_date(self, http_error: Callable[..., ModelHTTPError]) -> None:
+        when = datetime.now(UTC) + timedelta(seconds=30)
+        error = http_error(503, {"retry-after": format_datetime(when, usegmt=True)})
+        assert 25 < retry_after(error) <= 30
+
+    def test_missing(self, http_error: Callable[..., ModelHTTPError]) -> None:
+        assert retry_after(http_error(429)) is None
+        assert retry_after(ValueError("no response")) is None
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter.run."""
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_retried(
+        self, http_error: Callable[..., ModelHTTPError]
+    ) -> None:
+        """Test that failures propagate; retrying is the deployment pool's job."""
+        limiter = RateLimiter()
+        call = AsyncMock(side_effect=http_error(429))
+
+        with pytest.raises(ModelHTTPError):
+            await limiter.run(call)
+
+        assert call.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_back_every_caller(self) -> None:
+        """Test that calls wait out a pause before they start."""
+        limiter = RateLimiter()
+        limiter.pause(3)
+
+        with patch("quizling.base.rate_limiter.asyncio.sleep") as sleep:
+            await limiter.run(AsyncMock(return_value="ok"))
+            await limiter.run(AsyncMock(return_value="ok"))
+
+        assert sleep.await_count == 2
+        assert all(2 < c.args[0] <= 3 for c in sleep.await_args_list)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_token_budget(self, clock: FakeClock) -> None:
+        """Test that calls wait for their estimated tokens."""
+        limiter = RateLimiter(tokens_per_minute=600)
+        limiter.tokens = TokenBucket(600, burst_seconds=1, clock=clock)
+
+        with patch("quizling.base.rate_limiter.asyncio.sleep") as sleep:
+            await limiter.run(AsyncMock(return_value="ok"), estimated_tokens=10)
+            await limiter.run(AsyncMock(return_value="ok"), estimated_tokens=10)
+
+        sleep.assert_awaited_once_with(pytest.approx(1.0))
+
+
+def test_shared_rate_limiter_is_keyed_by_deployment() -> None:
+    """Test that generators for the same deployment share one limiter."""
+    first = shared_rate_limiter(("https://a", "gpt"), requests_per_minute=10)
+
+    assert shared_rate_limiter(("https://a", "gpt"), requests_per_minute=10) is first
+    assert (
+        shared_rate_limiter(("https://b", "gpt"), requests_per_minute=10) is not first
+    )
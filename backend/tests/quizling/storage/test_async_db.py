@@ -0,0 +1,144 @@
+"""Tests for the asyncio MongoDB client."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from quizling.base.models import AnswerOption, DifficultyLevel, MultipleChoiceQuestion
+from quizling.storage import AsyncMongoDBClient
+from quizling.storage.db import MongoDBConnectionError
+
+
+@pytest.fixture
+def sample_question() -> MultipleChoiceQuestion:
+    """Create a sample question for testing."""
+    return MultipleChoiceQuestion(
+        question="What is 2+2?",
+        options=[
+            AnswerOption(label="A", text="3"),
+            AnswerOption(label="B", text="4"),
+            AnswerOption(label="C", text="5"),
+            AnswerOption(label="D", text="6"),
+        ],
+        correct_answer="B",
+        explanation="2+2=4",
+        difficulty=DifficultyLevel.EASY,
+    )
+
+
+@pytest.fixture
+def mock_collection():
+    """Patch AsyncMongoClient and return the questions collection mock."""
+    with patch("quizling.storage.async_db.AsyncMongoClient") as mock_client_class:
+        mock_client = MagicMock()
+        mock_client.server_info = AsyncMock()
+        mock_client.close = AsyncMock()
+        mock_collection = MagicMock()
+
+        mock_client_class.return_value = mock_client
+        mock_client.__getitem__.return_value.__getitem__.return_value = mock_collection
+        yield mock_collection
+
+
+def cursor_returning(docs: list[dict]) -> MagicMock:
+    """Build a chainable async cursor mock whose to_list() yields ``docs``."""
+    cursor = MagicMock()
+    cursor.skip.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=docs)
+    return cursor
+
+
+class TestAsyncMongoDBClient:
+    """Tests for AsyncMongoDBClient class."""
+
+    def test_init_does_not_connect(self) -> None:
+        """Test that construction does not perform any I/O."""
+        with patch("quizling.storage.async_db.AsyncMongoClient") as mock_client_class:
+            client = AsyncMongoDBClient()
+
+            assert client.database_name == "quizling"
+            mock_client_class.return_value.server_info.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_error(self) -> None:
+        """Test that connect() translates pymongo errors."""
+        from pymongo import errors
+
+        with patch("quizling.storage.async_db.AsyncMongoClient") as mock_client_class:
+            mock_client_class.return_value.server_info = AsyncMock(
+                side_effect=errors.ServerSelectionTimeoutError("Connection failed")
+            )
+
+            client = AsyncMongoDBClient()
+            with pytest.raises(MongoDBConnectionError, match="Failed to connect"):
+                await client.connect()
+
+    @pytest.mark.asyncio
+    async def test_context_manager(self, mock_collection: MagicMock) -> None:
+        """Test that async with connects and closes the client."""
+        async with AsyncMongoDBClient() as client:
+            client.client.server_info.assert_awaited_once()
+
+        client.client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_question(
+        self, mock_collection: MagicMock, sample_question: MultipleChoiceQuestion
+    ) -> None:
+        """Test retrieving a single question."""
+        doc = {**sample_question.model_dump(), "_id": "507f1f77bcf86cd799439011"}
+        mock_collection.find_one = AsyncMock(return_value=doc)
+
+        client = AsyncMongoDBClient()
+        result = await client.get_question("507f1f77bcf86cd799439011")
+
+        assert result is not None
+        assert result.id == "507f1f77bcf86cd799439011"
+        assert result.question == sample_question.question
+
+    @pytest.mark.asyncio
+    async def test_get_question_invalid_id(self, mock_collection: MagicMock) -> None:
+        """Test that an invalid ObjectId returns None."""
+        client = AsyncMongoDBClient()
+        assert await client.get_question("not-an-id") is None
+
+    @pytest.mark.asyncio
+    async def test_get_all_questions(
+        self, mock_collection: MagicMock, sample_question: MultipleChoiceQuestion
+    ) -> None:
+        """Test retrieving a page of questions."""
+        cursor = cursor_returning([{**sample_question.model_dump(), "_id": "id_1"}])
+        mock_collection.find.return_value = cursor
+
+        client = AsyncMongoDBClient()
+        results = await client.get_all_questions(limit=5, skip=10)
+
+        assert [q.id for q in results] == ["id_1"]
+        cursor.skip.assert_called_once_with(10)
+        cursor.limit.assert_called_once_with(5)
+
+    @pytest.mark.asyncio
+    async def test_get_questions_by_difficulty(
+        self, mock_collection: MagicMock, sample_question: MultipleChoiceQuestion
+    ) -> None:
+        """Test retrieving questions by difficulty level."""
+        mock_collection.find.return_value = cursor_returning(
+            [{**sample_question.model_dump(), "_id": "id_1"}]
+        )
+
+        client = AsyncMongoDBClient()
+        results = await client.get_questions_by_difficulty("easy")
+
+        assert len(results) == 1
+        mock_collection.find.assert_called_once_with({"difficulty": "easy"})
+
+    @pytest.mark.asyncio
+    async def test_count_questions(self, mock_collection: MagicMock) -> None:
+        """Test counting questions in database."""
+        mock_collection.count_documents = AsyncMock(return_value=42)
+
+        client = AsyncMongoDBClient()
+
+        assert await client.count_questions() == 42
+        mock_collection.count_documents.assert_awaited_once_with({})
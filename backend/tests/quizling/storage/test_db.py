@@ -1,11 +1,17 @@
 """Tests for MongoDB storage functionality."""
 
+import os
+
 import pytest
 from unittest.mock import MagicMock, patch
 
 from quizling.base.models import AnswerOption, DifficultyLevel, MultipleChoiceQuestion
 from quizling.storage import MongoDBClient
-from quizling.storage.db import MongoDBConnectionError
+from quizling.storage.db import (
+    MongoDBConnectionError,
+    build_find_spec,
+    question_to_document,
+)
 
 
 @pytest.fixture
@@ -68,6 +74,105 @@ def sample_questions() -> list[MultipleChoiceQuestion]:
     ]
 
 
+@pytest.fixture(scope="module")
+def sample_questions_module() -> list[MultipleChoiceQuestion]:
+    """Module-scoped copy of the sample questions for the live database."""
+    return [
+        MultipleChoiceQuestion(
+            question=f"What is the capital of country number {i}?",
+            options=[
+                AnswerOption(label="A", text="London"),
+                AnswerOption(label="B", text="Paris"),
+                AnswerOption(label="C", text="Berlin"),
+                AnswerOption(label="D", text="Madrid"),
+            ],
+            correct_answer="B",
+            difficulty=[DifficultyLevel.EASY, DifficultyLevel.HARD][i % 2],
+        )
+        for i in range(20)
+    ]
+
+
+@pytest.fixture(scope="module")
+def live_db(sample_questions_module: list[MultipleChoiceQuestion]):
+    """A real MongoDB test database, skipped when no server is reachable."""
+    from pymongo import MongoClient, errors
+
+    uri = os.environ["MONGODB_URI"]
+    probe = MongoClient(uri, serverSelectionTimeoutMS=500)
+    try:
+        probe.admin.command("ping")
+    except errors.PyMongoError:
+        pytest.skip("MongoDB is not available")
+    finally:
+        probe.close()
+
+    client = MongoDBClient(mongodb_uri=uri, database_name="quizling_test")
+    client.questions.drop()
+    client.insert_questions(sample_questions_module)
+    client.create_indexes()
+    yield client
+    client.db.drop_collection("questions")
+    client.close()
+
+
+def winning_plan_stages(explain: dict) -> list[dict]:
+    """Flatten the winning plan of an explain() result into its stages."""
+    stages = []
+    pending = [explain["queryPlanner"]["winningPlan"]]
+    while pending:
+        stage = pending.pop()
+        stage = stage.get("queryPlan", stage)
+        stages.append(stage)
+        pending.extend(stage.get("inputStages", []))
+        if "inputStage" in stage:
+            pending.append(stage["inputStage"])
+    return stages
+
+
+class TestMongoDBIndexUsage:
+    """Integration tests asserting queries are served by indexes."""
+
+    def test_text_search_uses_text_index(self, live_db: MongoDBClient) -> None:
+        """Test that text search is answered by the question text index."""
+        query, projection, sort_spec = build_find_spec(search="capital")
+        explain = live_db.questions.find(query, projection).sort(sort_spec).explain()
+
+        stages = winning_plan_stages(explain)
+        assert "COLLSCAN" not in {stage.get("stage") for stage in stages}
+        assert any(stage.get("indexName") == "question_text" for stage in stages)
+
+    def test_text_search_returns_ranked_matches(self, live_db: MongoDBClient) -> None:
+        """Test that text search returns matches and honours difficulty."""
+        results = live_db.find_questions(search="capital", difficulty="easy")
+
+        assert len(results) == 10
+        assert all(q.difficulty == DifficultyLevel.EASY for q in results)
+        assert live_db.count_questions(search="capital", difficulty="easy") == 10
+
+    def test_substring_search_is_literal(self, live_db: MongoDBClient) -> None:
+        """Test that substring mode does not interpret regex metacharacters."""
+        assert live_db.search_questions("number 1?", search_mode="substring")
+        assert not live_db.search_questions(".*", search_mode="substring")
+
+
+class TestMongoDBUpserts:
+    """Integration tests for content-hash upserts."""
+
+    def test_reloading_is_idempotent(
+        self,
+        live_db: MongoDBClient,
+        sample_questions_module: list[MultipleChoiceQuestion],
+    ) -> None:
+        """Test that upserting already-loaded questions writes nothing."""
+        documents = [question_to_document(q) for q in sample_questions_module]
+
+        counts = live_db.upsert_documents(documents)
+
+        assert (counts.inserted, counts.updated, counts.unchanged) == (0, 0, 20)
+        assert live_db.count_questions() == 20
+
+
 class TestMongoDBClient:
     """Tests for MongoDBClient class."""
 
@@ -98,6 +203,35 @@ class TestMongoDBClient:
             assert client.mongodb_uri == custom_uri
             assert client.database_name == custom_db
 
+    def test_pool_options_passed_to_client(self) -> None:
+        """Test that explicit pool settings reach the underlying MongoClient."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            MongoDBClient(
+                max_pool_size=50,
+                min_pool_size=5,
+                max_idle_time_ms=1000,
+                wait_queue_timeout_ms=200,
+            )
+
+            kwargs = mock_client_class.call_args.kwargs
+            assert kwargs["maxPoolSize"] == 50
+            assert kwargs["minPoolSize"] == 5
+            assert kwargs["maxIdleTimeMS"] == 1000
+            assert kwargs["waitQueueTimeoutMS"] == 200
+
+    def test_pool_options_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that pool settings fall back to MONGO_* environment variables."""
+        monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "25")
+        monkeypatch.setenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "500")
+
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            client = MongoDBClient()
+
+            kwargs = mock_client_class.call_args.kwargs
+            assert kwargs["maxPoolSize"] == 25
+            assert kwargs["waitQueueTimeoutMS"] == 500
+            assert client.pool_options["minPoolSize"] == 0
+
     def test_connection_error(self) -> None:
         """Test that connection errors are handled properly."""
         with patch("quizling.storage.db.MongoClient") as mock_client_class:
@@ -175,6 +309,105 @@ class TestMongoDBClient:
 
             assert results == []
 
+    def test_insert_documents_unordered(self) -> None:
+        """Test that bulk inserts are unordered and report the inserted count."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_collection = MagicMock()
+            mock_client_class.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+            mock_collection.insert_many.return_value.inserted_ids = ["a", "b"]
+
+            client = MongoDBClient()
+
+            assert client.insert_documents([{"q": 1}, {"q": 2}]) == 2
+            mock_collection.insert_many.assert_called_once_with(
+                [{"q": 1}, {"q": 2}], ordered=False
+            )
+
+    def test_insert_documents_partial_failure(self) -> None:
+        """Test that a bulk write error returns the number that were written."""
+        from pymongo import errors
+
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_collection = MagicMock()
+            mock_client_class.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+            mock_collection.insert_many.side_effect = errors.BulkWriteError(
+                {"nInserted": 1, "writeErrors": [{"code": 11000}]}
+            )
+
+            client = MongoDBClient()
+
+            assert client.insert_documents([{"q": 1}, {"q": 2}]) == 1
+
+    def test_upsert_documents(self, sample_question: MultipleChoiceQuestion) -> None:
+        """Test that upserts match on content hash and report counts."""
+        from pymongo import UpdateOne
+
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_collection = MagicMock()
+            mock_client_class.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+            mock_collection.bulk_write.return_value.bulk_api_result = {
+                "nUpserted": 1,
+                "nMatched": 3,
+                "nModified": 1,
+            }
+            doc = question_to_document(sample_question)
+
+            client = MongoDBClient()
+            counts = client.upsert_documents([doc])
+
+            assert (counts.inserted, counts.updated, counts.unchanged) == (1, 1, 2)
+            mock_collection.bulk_write.assert_called_once_with(
+                [
+                    UpdateOne(
+                        {"content_hash": sample_question.content_hash()},
+                        {"$set": doc},
+                        upsert=True,
+                    )
+                ],
+                ordered=False,
+            )
+
+    def test_backfill_content_hashes(
+        self, sample_question: MultipleChoiceQuestion
+    ) -> None:
+        """Test that questions stored without a hash get the one upserts match on."""
+        from pymongo import UpdateOne
+
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_collection = MagicMock()
+            mock_client_class.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+            stored = sample_question.model_dump(mode="json", exclude={"id"})
+            mock_collection.find.return_value = [
+                {"_id": "a", **stored},
+                {"_id": "b", "question": "Malformed"},
+            ]
+            mock_collection.bulk_write.return_value.modified_count = 1
+
+            assert MongoDBClient().backfill_content_hashes() == 1
+            mock_collection.bulk_write.assert_called_once_with(
+                [
+                    UpdateOne(
+                        {"_id": "a"},
+                        {"$set": {"content_hash": sample_question.content_hash()}},
+                    )
+                ],
+                ordered=False,
+            )
+
+    def test_create_indexes_adds_unique_content_hash(self) -> None:
+        """Test that the content hash index is unique and partial."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_collection = MagicMock()
+            mock_client_class.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+            MongoDBClient().create_indexes()
+
+            mock_collection.create_index.assert_any_call(
+                keys=[("content_hash", 1)],
+                unique=True,
+                partialFilterExpression={"content_hash": {"$exists": True}},
+            )
+
     def test_get_question(self, sample_question: MultipleChoiceQuestion) -> None:
         """Test retrieving a single question."""
         with (
@@ -267,6 +500,56 @@ class TestMongoDBClient:
             assert count == 42
             mock_collection.count_documents.assert_called_once_with({})
 
+    def test_count_by_difficulty(self) -> None:
+        """Test per-difficulty counts come from a single $group aggregation."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_collection = MagicMock()
+            mock_collection.aggregate.return_value = [
+                {"_id": "easy", "count": 3},
+                {"_id": "hard", "count": 2},
+            ]
+
+            mock_client_class.return_value = mock_client
+            mock_client.__getitem__.return_value.__getitem__.return_value = (
+                mock_collection
+            )
+
+            client = MongoDBClient()
+            counts = client.count_by_difficulty()
+
+            assert counts == {"easy": 3, "medium": 0, "hard": 2}
+            mock_collection.aggregate.assert_called_once_with(
+                [{"$group": {"_id": "$difficulty", "count": {"$sum": 1}}}]
+            )
+            mock_collection.find.assert_not_called()
+
+    def test_facet_counts_with_filter(self) -> None:
+        """Test facet counts match on the shared question filter first."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_collection = MagicMock()
+            mock_collection.aggregate.return_value = [{"_id": "B", "count": 1}]
+
+            mock_client_class.return_value = mock_client
+            mock_client.__getitem__.return_value.__getitem__.return_value = (
+                mock_collection
+            )
+
+            client = MongoDBClient()
+            counts = client.facet_counts("correct_answer", difficulty="easy")
+
+            assert counts == {"B": 1}
+            pipeline = mock_collection.aggregate.call_args[0][0]
+            assert pipeline[0] == {"$match": {"difficulty": "easy"}}
+
+    def test_facet_counts_rejects_unknown_field(self) -> None:
+        """Test that arbitrary fields cannot be grouped on."""
+        with patch("quizling.storage.db.MongoClient"):
+            client = MongoDBClient()
+            with pytest.raises(ValueError, match="Unsupported facet field"):
+                client.facet_counts("explanation")
+
     def test_delete_question(self) -> None:
         """Test deleting a question."""
         with (
@@ -313,26 +596,137 @@ class TestMongoDBClient:
             assert count == 10
             mock_collection.delete_many.assert_called_once_with({})
 
-    def test_search_questions(self) -> None:
-        """Test searching questions by text."""
+    def test_find_questions_combines_filters(
+        self, sample_questions: list[MultipleChoiceQuestion]
+    ) -> None:
+        """Test that difficulty, search and paging go into a single query."""
         with patch("quizling.storage.db.MongoClient") as mock_client_class:
             mock_client = MagicMock()
             mock_collection = MagicMock()
+            cursor = MagicMock()
+            cursor.sort.return_value = cursor
+            cursor.skip.return_value = cursor
+            cursor.limit.return_value = cursor
+            cursor.__iter__.return_value = iter(
+                [{**sample_questions[0].model_dump(), "_id": "id_0", "score": 1.5}]
+            )
 
             mock_client_class.return_value = mock_client
             mock_client.__getitem__.return_value.__getitem__.return_value = (
                 mock_collection
             )
+            mock_collection.find.return_value = cursor
 
-            # Mock find() with regex search
-            mock_collection.find.return_value = []
+            client = MongoDBClient()
+            results = client.find_questions(
+                difficulty="easy", search="2+2", skip=40, limit=21
+            )
+
+            assert [q.id for q in results] == ["id_0"]
+            query = mock_collection.find.call_args[0][0]
+            assert query == {"difficulty": "easy", "$text": {"$search": "2+2"}}
+            cursor.skip.assert_called_once_with(40)
+            cursor.limit.assert_called_once_with(21)
+
+    def test_find_questions_keyset(self) -> None:
+        """Test that ``after`` seeks past the last seen key in sort order."""
+        from bson import ObjectId
+
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_collection = MagicMock()
+            cursor = MagicMock()
+            cursor.sort.return_value = cursor
+            cursor.limit.return_value = cursor
+            cursor.__iter__.return_value = iter([])
+
+            mock_client_class.return_value = mock_client
+            mock_client.__getitem__.return_value.__getitem__.return_value = (
+                mock_collection
+            )
+            mock_collection.find.return_value = cursor
+
+            last_id = "507f1f77bcf86cd799439011"
+            client = MongoDBClient()
+            client.find_questions(
+                difficulty="easy",
+                limit=21,
+                sort="question",
+                after=("What is 2+2?", last_id),
+            )
+
+            query = mock_collection.find.call_args[0][0]
+            assert query["$and"][0] == {"difficulty": "easy"}
+            assert query["$and"][1] == {
+                "$or": [
+                    {"question": {"$gt": "What is 2+2?"}},
+                    {"question": "What is 2+2?", "_id": {"$gt": ObjectId(last_id)}},
+                ]
+            }
+            cursor.sort.assert_called_once_with([("question", 1), ("_id", 1)])
+            cursor.skip.assert_not_called()
+
+    def test_count_questions_with_filters(self) -> None:
+        """Test that counts use the same filter as find_questions."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_collection = MagicMock()
+            mock_collection.count_documents.return_value = 7
+
+            mock_client_class.return_value = mock_client
+            mock_client.__getitem__.return_value.__getitem__.return_value = (
+                mock_collection
+            )
+
+            client = MongoDBClient()
+            count = client.count_questions(difficulty="hard")
+
+            assert count == 7
+            mock_collection.count_documents.assert_called_once_with(
+                {"difficulty": "hard"}
+            )
+
+    def test_search_questions(self) -> None:
+        """Test that search uses the text index, ranked by relevance."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_collection = MagicMock()
+            cursor = MagicMock()
+            cursor.sort.return_value = cursor
+            cursor.__iter__.return_value = iter([])
+
+            mock_client_class.return_value = mock_client
+            mock_client.__getitem__.return_value.__getitem__.return_value = (
+                mock_collection
+            )
+            mock_collection.find.return_value = cursor
 
             client = MongoDBClient()
             client.search_questions("capital")
 
             mock_collection.find.assert_called_once()
-            # Check that regex was used in the query
-            call_args = mock_collection.find.call_args[0][0]
-            assert "question" in call_args
-            assert "$regex" in call_args["question"]
-            assert call_args["question"]["$regex"] == "capital"
+            query, projection = mock_collection.find.call_args[0]
+            assert query == {"$text": {"$search": "capital"}}
+            assert projection == {"score": {"$meta": "textScore"}}
+            cursor.sort.assert_called_once_with(
+                [("score", {"$meta": "textScore"}), ("_id", 1)]
+            )
+
+    def test_search_questions_substring_escapes_input(self) -> None:
+        """Test that substring mode treats the input literally, not as a regex."""
+        with patch("quizling.storage.db.MongoClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_collection = MagicMock()
+
+            mock_client_class.return_value = mock_client
+            mock_client.__getitem__.return_value.__getitem__.return_value = (
+                mock_collection
+            )
+            mock_collection.find.return_value = []
+
+            client = MongoDBClient()
+            client.search_questions("(a+)+$", search_mode="substring")
+
+            query = mock_collection.find.call_args[0][0]
+            assert query["question"]["$regex"] == r"\(a\+\)\+\$"
+            assert query["question"]["$options"] == "i"
@@ -1,17 +1,46 @@
 """Tests for question loader functionality."""
 
 import json
+import os
 from pathlib import Path
 
 import pytest
 
 from quizling.base.models import AnswerOption, DifficultyLevel, MultipleChoiceQuestion
+from quizling.storage.db import UpsertCounts
 from quizling.storage.loader import (
+    LoadStats,
+    iter_changed_files,
+    iter_parsed_questions,
+    iter_question_files,
     load_question_from_file,
     load_questions_from_directory,
+    stream_questions_to_db,
 )
 
 
+class RecordingSink:
+    """In-memory stand-in for MongoDBClient.insert_documents."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[dict]] = []
+        self.manifest: dict[str, dict] = {}
+
+    def insert_documents(self, documents: list[dict]) -> int:
+        self.batches.append(documents)
+        return len(documents)
+
+    def upsert_documents(self, documents: list[dict]) -> UpsertCounts:
+        self.batches.append(documents)
+        return UpsertCounts(inserted=1, unchanged=len(documents) - 1)
+
+    def get_ingested_files(self, paths: list[str]) -> dict[str, dict]:
+        return {p: self.manifest[p] for p in paths if p in self.manifest}
+
+    def record_ingested_files(self, entries: list[dict]) -> None:
+        self.manifest.update((entry["_id"], entry) for entry in entries)
+
+
 @pytest.fixture
 def sample_question() -> MultipleChoiceQuestion:
     """Create a sample question for testing."""
@@ -191,3 +220,261 @@ class TestLoadQuestionsFromDirectory:
         # Should load only the valid question
         assert len(questions) == 1
         assert questions[0].question == "Valid?"
+
+
+class TestStreamQuestionsToDb:
+    """Tests for the streaming bulk loader."""
+
+    def test_iter_question_files_skips_directories(self, tmp_path: Path) -> None:
+        """Test that the walk yields only matching files."""
+        (tmp_path / "a.json").write_text("{}")
+        (tmp_path / "nested.json").mkdir()
+
+        assert [p.name for p in iter_question_files(tmp_path)] == ["a.json"]
+
+    def test_streams_in_batches(self, tmp_path: Path) -> None:
+        """Test that documents are inserted in bounded batches."""
+        for i in range(5):
+            (tmp_path / f"q{i}.json").write_text(
+                json.dumps(
+                    {
+                        "question": f"Question {i}?",
+                        "options": [
+                            {"label": label, "text": label} for label in "ABCD"
+                        ],
+                        "correct_answer": "A",
+                        "explanation": "Because",
+                        "difficulty": "easy",
+                    }
+                )
+            )
+        sink = RecordingSink()
+
+        stats = stream_questions_to_db(
+            sink, tmp_path, batch_size=2, workers=0, progress=False
+        )
+
+        assert [len(batch) for batch in sink.batches] == [2, 2, 1]
+        assert stats.files == 5
+        assert stats.inserted == 5
+        assert stats.batches == 3
+        assert "id" not in sink.batches[0][0]
+        assert len(sink.batches[0][0]["content_hash"]) == 64
+        assert set(stats.timings) == {"walk", "manifest", "parse", "write"}
+
+    def test_counts_invalid_files(
+        self, temp_directory_with_questions: Path, capsys: pytest.CaptureFixture
+    ) -> None:
+        """Test that invalid files are counted and reported, not inserted."""
+        (temp_directory_with_questions / "broken.json").write_text("{ invalid }")
+        sink = RecordingSink()
+
+        stats = stream_questions_to_db(
+            sink, temp_directory_with_questions, workers=0, progress=False
+        )
+
+        assert stats.parsed == 2
+        assert stats.failed == 1
+        assert sum(len(batch) for batch in sink.batches) == 2
+        assert "broken.json" in capsys.readouterr().err
+
+    def test_rejected_documents_are_counted(
+        self, temp_directory_with_questions: Path
+    ) -> None:
+        """Test that documents the server refuses are reported as rejected."""
+
+        class RejectingSink:
+            def insert_documents(self, documents: list[dict]) -> int:
+                return len(documents) - 1
+
+        stats = stream_questions_to_db(
+            RejectingSink(), temp_directory_with_questions, workers=0, progress=False
+        )
+
+        assert stats.inserted == 1
+        assert stats.rejected == 1
+
+    def test_upsert_mode_reports_unchanged(
+        self, temp_directory_with_questions: Path
+    ) -> None:
+        """Test that upsert mode reports inserted and unchanged questions."""
+        stats = stream_questions_to_db(
+            RecordingSink(),
+            temp_directory_with_questions,
+            workers=0,
+            progress=False,
+            mode="upsert",
+        )
+
+        assert (stats.inserted, stats.updated, stats.unchanged) == (1, 0, 1)
+        assert stats.rejected == 0
+
+    def test_incremental_skips_loaded_files(
+        self, temp_directory_with_questions: Path
+    ) -> None:
+        """Test that a rerun only opens new or changed files."""
+        sink = RecordingSink()
+
+        def load():
+            return stream_questions_to_db(
+                sink,
+                temp_directory_with_questions,
+                workers=0,
+                progress=False,
+                incremental=True,
+            )
+
+        first = load()
+        assert first.parsed == 2
+        assert len(sink.manifest) == 2
+
+        second = load()
+        assert (second.files, second.skipped) == (0, 2)
+        assert second.summary_lines()[0] == (
+            "Files: 0 processed, 2 skipped as already loaded"
+        )
+        assert len(sink.batches) == 1
+
+        changed = temp_directory_with_questions / "question_0.json"
+        data = json.loads(changed.read_text())
+        data["explanation"] = "Updated"
+        changed.write_text(json.dumps(data))
+        untouched = temp_directory_with_questions / "question_1.json"
+        os.utime(untouched, ns=(0, 0))
+
+        third = load()
+        assert (third.parsed, third.skipped) == (1, 1)
+        assert sink.batches[-1][0]["explanation"] == "Updated"
+        assert sink.manifest[str(untouched.absolute())]["mtime_ns"] == 0
+
+    def test_incremental_skips_files_deleted_during_walk(
+        self, temp_directory_with_questions: Path
+    ) -> None:
+        """Test that a file removed after listing does not abort the load."""
+        paths = list(iter_question_files(temp_directory_with_questions))
+        sink = RecordingSink()
+        sink.record_ingested_files(
+            [
+                {"_id": str(p.absolute()), "size": 0, "mtime_ns": 0, "sha256": ""}
+                for p in paths
+            ]
+        )
+        paths[0].unlink()
+
+        changed = list(iter_changed_files(paths, sink, LoadStats(), {}))
+
+        assert changed == [paths[1].absolute()]
+
+    def test_incremental_resumes_after_interruption(
+        self, temp_directory_with_questions: Path
+    ) -> None:
+        """Test that files from a failed batch are not marked as ingested."""
+
+        class FailingSink(RecordingSink):
+            def insert_documents(self, documents: list[dict]) -> int:
+                if self.batches:
+                    raise RuntimeError("connection lost")
+                return super().insert_documents(documents)
+
+        sink = FailingSink()
+        with pytest.raises(RuntimeError):
+            stream_questions_to_db(
+                sink,
+                temp_directory_with_questions,
+                batch_size=1,
+                workers=0,
+                progress=False,
+                incremental=True,
+            )
+        assert len(sink.manifest) == 1
+
+        sink.batches.clear()
+        stats = stream_questions_to_db(
+            sink,
+            temp_directory_with_questions,
+            batch_size=1,
+            workers=0,
+            progress=False,
+            incremental=True,
+        )
+
+        assert (stats.parsed, stats.skipped) == (1, 1)
+        assert len(sink.manifest) == 2
+
+    def test_streams_compressed_jsonl(
+        self, tmp_path: Path, sample_question: MultipleChoiceQuestion
+    ) -> None:
+        """Test that gzip JSON Lines files are decoded line by line."""
+        import gzip
+
+        line = json.dumps(sample_question.model_dump(mode="json"))
+        jsonl = tmp_path / "questions-000001.jsonl.gz"
+        # Two gzip members, as the writer appends one per batch.
+        jsonl.write_bytes(
+            gzip.compress(f"{line}\n{line}\n".encode()) + gzip.compress(b"not json\n")
+        )
+        (tmp_path / "single.json").write_text(line)
+        sink = RecordingSink()
+
+        stats = stream_questions_to_db(
+            sink, tmp_path, workers=0, progress=False, incremental=True
+        )
+
+        assert (stats.files, stats.parsed, stats.failed) == (2, 3, 1)
+        assert len(sink.manifest) == 2
+
+        rerun = stream_questions_to_db(
+            sink, tmp_path, workers=0, progress=False, incremental=True
+        )
+        assert (rerun.files, rerun.skipped) == (0, 2)
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_jsonl_lines_are_split_across_tasks(
+        self, tmp_path: Path, sample_question: MultipleChoiceQuestion, workers: int
+    ) -> None:
+        """Test that a JSON Lines file is parsed in bounded tasks, final last."""
+        line = json.dumps(sample_question.model_dump(mode="json"))
+        jsonl = tmp_path / "questions-000001.jsonl"
+        jsonl.write_text("\n".join([line] * 5 + ["not json", line]) + "\n")
+
+        results = list(iter_parsed_questions([jsonl], workers=workers, chunk_size=2))
+
+        assert len(results) == 7
+        assert sum(r.document is None for r in results) == 1
+        assert [r.final for r in results] == [False] * 6 + [True]
+        assert results[-1].document is not None
+        assert results[-1].size == jsonl.stat().st_size
+        assert len(results[-1].sha256) == 64
+
+    def test_incremental_skips_touched_identical_jsonl(
+        self, tmp_path: Path, sample_question: MultipleChoiceQuestion
+    ) -> None:
+        """Test that a JSON Lines file whose mtime alone moved is not reloaded."""
+        line = json.dumps(sample_question.model_dump(mode="json"))
+        jsonl = tmp_path / "questions-000001.jsonl"
+        jsonl.write_text(f"{line}\n{line}\n")
+        sink = RecordingSink()
+
+        def load():
+            return stream_questions_to_db(
+                sink, tmp_path, workers=0, progress=False, incremental=True
+            )
+
+        load()
+        os.utime(jsonl, ns=(0, 0))
+        rerun = load()
+
+        assert (rerun.files, rerun.skipped) == (0, 1)
+        assert len(sink.batches) == 1
+        assert sink.manifest[str(jsonl.absolute())]["mtime_ns"] == 0
+
+    def test_process_pool_parses_all_files(
+        self, temp_directory_with_questions: Path
+    ) -> None:
+        """Test that the process pool path yields every file exactly once."""
+        paths = list(iter_question_files(temp_directory_with_questions))
+
+        results = list(iter_parsed_questions(paths, workers=2, chunk_size=1))
+
+        assert sorted(r.path for r in results) == sorted(str(p) for p in paths)
+        assert all(r.document is not None for r in results)
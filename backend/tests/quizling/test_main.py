@@ -1,20 +1,40 @@
+import asyncio
 import pytest
 import tempfile
 
+from collections.abc import AsyncIterator
 from io import StringIO
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
-from quizling.__main__ import main, parse_args
+from quizling.__main__ import main, parse_args, resolve_input_files
 from quizling.base.models import (
     AnswerOption,
     DifficultyLevel,
+    GenerationMetrics,
     MultipleChoiceQuestion,
     QuizConfig,
     QuizResult,
 )
 
 
+def stream_questions(
+    questions: list[MultipleChoiceQuestion] | None = None,
+    error: Exception | None = None,
+) -> MagicMock:
+    """Stand-in for QuizGenerator.stream_from_file."""
+
+    async def stream(
+        file_path: Path, **kwargs
+    ) -> AsyncIterator[MultipleChoiceQuestion]:
+        for question in questions or []:
+            yield question
+        if error is not None:
+            raise error
+
+    return MagicMock(side_effect=stream)
+
+
 class TestParseArgs:
     """Tests for command-line argument parsing."""
 
@@ -23,13 +43,14 @@ class TestParseArgs:
         with patch("sys.argv", ["quizling", "test.txt"]):
             args = parse_args()
 
-            assert args.file == "test.txt"
+            assert args.files == ["test.txt"]
             assert args.num_questions == 5
             assert args.difficulty == "medium"
             assert args.topic is None
             assert args.no_explanations is False
             assert args.output == "out"
             assert args.api_version == "2024-12-01-preview"
+            assert args.jobs == 4
 
     def test_parse_args_all_options(self) -> None:
         """Test parsing with all options specified."""
@@ -53,7 +74,7 @@ class TestParseArgs:
         ):
             args = parse_args()
 
-            assert args.file == "test.txt"
+            assert args.files == ["test.txt"]
             assert args.num_questions == 10
             assert args.difficulty == "hard"
             assert args.topic == "Python"
@@ -82,13 +103,42 @@ class TestParseArgs:
         ):
             args = parse_args()
 
-            assert args.file == "test.txt"
+            assert args.files == ["test.txt"]
             assert args.num_questions == 3
             assert args.difficulty == "easy"
             assert args.topic == "Testing"
             assert args.output == "results"
             assert args.api_version == "2024-01-01"
 
+    def test_parse_args_output_format(self) -> None:
+        """Test the JSON Lines output options."""
+        with patch(
+            "sys.argv",
+            ["quizling", "test.txt", "--format", "jsonl", "--compress", "gzip"],
+        ):
+            args = parse_args()
+
+            assert args.format == "jsonl"
+            assert args.compress == "gzip"
+
+        with patch("sys.argv", ["quizling", "test.txt"]):
+            args = parse_args()
+
+            assert args.format == "json"
+            assert args.compress == "none"
+
+    def test_parse_args_cache_options(self) -> None:
+        """Test the response cache switches."""
+        with patch(
+            "sys.argv",
+            ["quizling", "test.txt", "--cache-dir", ".cache", "--refresh"],
+        ):
+            args = parse_args()
+
+            assert args.cache_dir == ".cache"
+            assert args.refresh is True
+            assert args.no_cache is False
+
     def test_parse_args_invalid_difficulty(self) -> None:
         """Test that invalid difficulty values are rejected."""
         with patch("sys.argv", ["quizling", "test.txt", "-d", "invalid"]):
@@ -96,6 +146,32 @@ class TestParseArgs:
                 parse_args()
 
 
+class TestResolveInputFiles:
+    """Tests for expanding CLI inputs into document paths."""
+
+    def test_expands_directories_and_globs(self, tmp_path: Path) -> None:
+        """Test that directories and globs yield supported files once each."""
+        (tmp_path / "notes").mkdir()
+        (tmp_path / "notes" / "a.md").write_text("a")
+        (tmp_path / "notes" / "image.png").write_bytes(b"")
+        (tmp_path / "b.txt").write_text("b")
+
+        files = resolve_input_files(
+            [str(tmp_path / "notes"), str(tmp_path / "*.txt"), str(tmp_path / "b.txt")]
+        )
+
+        assert files == [tmp_path / "notes" / "a.md", tmp_path / "b.txt"]
+
+    def test_missing_file_raises(self, tmp_path: Path) -> None:
+        """Test that an explicitly named missing file is an error."""
+        with pytest.raises(FileNotFoundError, match="missing.txt"):
+            resolve_input_files([str(tmp_path / "missing.txt")])
+
+    def test_unmatched_glob_is_empty(self, tmp_path: Path) -> None:
+        """Test that a glob matching nothing is not an error."""
+        assert resolve_input_files([str(tmp_path / "*.pdf")]) == []
+
+
 class TestMain:
     """Tests for the main function."""
 
@@ -154,9 +230,9 @@ class TestMain:
             sample_quiz_result.config.output_directory = str(output_dir)
 
             with patch("sys.argv", ["quizling", str(test_file), "-o", str(output_dir)]):
-                mock_generator = MagicMock()
-                mock_generator.generate_from_file = AsyncMock(
-                    return_value=sample_quiz_result
+                mock_generator = MagicMock(extraction_cache=None)
+                mock_generator.stream_from_file = stream_questions(
+                    sample_quiz_result.questions
                 )
 
                 with patch(
@@ -197,9 +273,9 @@ class TestMain:
             test_file.write_text("Test content")
 
             with patch("sys.argv", ["quizling", str(test_file)]):
-                mock_generator = MagicMock()
-                mock_generator.generate_from_file = AsyncMock(
-                    side_effect=Exception("Generation failed")
+                mock_generator = MagicMock(extraction_cache=None)
+                mock_generator.stream_from_file = stream_questions(
+                    error=Exception("Generation failed")
                 )
 
                 with patch(
@@ -241,11 +317,12 @@ class TestMain:
                     str(output_dir),
                     "-a",
                     "2024-06-01",
+                    "--docx-streaming",
                 ],
             ):
-                mock_generator = MagicMock()
-                mock_generator.generate_from_file = AsyncMock(
-                    return_value=sample_quiz_result
+                mock_generator = MagicMock(extraction_cache=None)
+                mock_generator.stream_from_file = stream_questions(
+                    sample_quiz_result.questions
                 )
 
                 with patch(
@@ -263,6 +340,7 @@ class TestMain:
                     assert call_args.include_explanations is False
                     assert call_args.output_directory == str(output_dir)
                     assert call_args.api_version == "2024-06-01"
+                    assert call_args.docx_streaming is True
 
                     output = captured_output.getvalue()
                     assert "Generating 3 hard questions" in output
@@ -279,9 +357,9 @@ class TestMain:
             sample_quiz_result.config.output_directory = str(output_dir)
 
             with patch("sys.argv", ["quizling", str(test_file), "-o", str(output_dir)]):
-                mock_generator = MagicMock()
-                mock_generator.generate_from_file = AsyncMock(
-                    return_value=sample_quiz_result
+                mock_generator = MagicMock(extraction_cache=None)
+                mock_generator.stream_from_file = stream_questions(
+                    sample_quiz_result.questions
                 )
 
                 with patch(
@@ -326,9 +404,9 @@ class TestMain:
                         str(output_dir),
                     ],
                 ):
-                    mock_generator = MagicMock()
-                    mock_generator.generate_from_file = AsyncMock(
-                        return_value=sample_quiz_result
+                    mock_generator = MagicMock(extraction_cache=None)
+                    mock_generator.stream_from_file = stream_questions(
+                        sample_quiz_result.questions
                     )
 
                     with patch(
@@ -341,3 +419,72 @@ class TestMain:
                         # Verify correct difficulty was used
                         call_args = mock_gen_class.call_args[0][0]
                         assert call_args.difficulty == difficulty_enum
+
+    @pytest.mark.asyncio
+    async def test_main_multiple_files_concurrently(
+        self, sample_quiz_result: QuizResult
+    ) -> None:
+        """Test that documents share one generator and run up to --jobs at once."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_dir = Path(tmp_dir) / "out"
+            sample_quiz_result.config.output_directory = str(output_dir)
+            for i in range(4):
+                (Path(tmp_dir) / f"doc{i}.txt").write_text("Test content")
+
+            in_flight = 0
+            peak = 0
+
+            async def generate(
+                file_path: Path, metrics: GenerationMetrics
+            ) -> AsyncIterator[MultipleChoiceQuestion]:
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                if file_path.name == "doc3.txt":
+                    raise Exception("Generation failed")
+                metrics.requests += 1
+                metrics.request_seconds.append(0.01)
+                metrics.input_tokens += 1000
+                for question in sample_quiz_result.questions:
+                    metrics.questions += 1
+                    yield question
+
+            mock_generator = MagicMock(extraction_cache=None)
+            mock_generator.stream_from_file = MagicMock(side_effect=generate)
+
+            with (
+                patch(
+                    "sys.argv",
+                    [
+                        "quizling",
+                        tmp_dir,
+                        "-j",
+                        "2",
+                        "-o",
+                        str(output_dir),
+                        "--metrics",
+                    ],
+                ),
+                patch(
+                    "quizling.__main__.QuizGenerator", return_value=mock_generator
+                ) as mock_gen_class,
+                patch("sys.stdout", StringIO()) as captured_output,
+                patch("sys.stderr", StringIO()) as captured_error,
+                pytest.raises(SystemExit) as exc_info,
+            ):
+                await main()
+
+            assert exc_info.value.code == 1
+            assert mock_gen_class.call_count == 1
+            assert mock_generator.stream_from_file.call_count == 4
+            assert peak == 2
+            assert len(list(output_dir.glob("*.json"))) == 6
+            assert "Processed 3/4 documents, 6 questions" in captured_output.getvalue()
+            assert "doc3.txt: Generation failed" in captured_error.getvalue()
+            output = captured_output.getvalue()
+            assert output.count("Requests: 1 (0 retries") == 3
+            assert "Batch metrics:" in output
+            assert "Questions: 6 in" in output
+            assert "Tokens: 3,000 input" in output